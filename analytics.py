@@ -0,0 +1,172 @@
+from datetime import date, timedelta
+from typing import Collection, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; everything below has a pure Python path
+    np = None
+
+try:
+    from .time_utils import DAYS
+    from .validation import session_minutes
+except Exception:
+    from time_utils import DAYS
+    from validation import session_minutes
+
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class AnalyticsEngine:
+    """Columnar view of a schedule for fast aggregate queries.
+
+    Sessions are held as four parallel columns (day index, start minute,
+    end minute, subject code). With NumPy installed every query is a
+    vectorized reduction over those arrays; without it the same queries
+    run as plain Python loops and return identical results.
+    """
+
+    def __init__(self, day_index: Sequence[int], start: Sequence[int], end: Sequence[int],
+                 subject_code: Sequence[int], subjects: Sequence[str], use_numpy: Optional[bool] = None):
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy and np is None:
+            raise RuntimeError("NumPy is not installed.")
+
+        self.use_numpy = use_numpy
+        self.subjects = list(subjects)
+        if use_numpy:
+            self.day_index = np.asarray(day_index, dtype=np.int64)
+            self.start = np.asarray(start, dtype=np.int32)
+            self.end = np.asarray(end, dtype=np.int32)
+            self.subject_code = np.asarray(subject_code, dtype=np.int32)
+        else:
+            self.day_index = list(day_index)
+            self.start = list(start)
+            self.end = list(end)
+            self.subject_code = list(subject_code)
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[Dict], use_numpy: Optional[bool] = None) -> "AnalyticsEngine":
+        codes: Dict[str, int] = {}
+        day_index: List[int] = []
+        start: List[int] = []
+        end: List[int] = []
+        subject_code: List[int] = []
+
+        for session in sessions:
+            try:
+                day = DAYS.index(session.get("day"))
+                start_minutes, end_minutes = session_minutes(session)
+            except ValueError:
+                continue
+            if end_minutes <= start_minutes:
+                continue
+            day_index.append(day)
+            start.append(start_minutes)
+            end.append(end_minutes)
+            subject_code.append(codes.setdefault(session.get("subject", "Unknown"), len(codes)))
+
+        return cls(day_index, start, end, subject_code, list(codes), use_numpy=use_numpy)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def durations(self):
+        if self.use_numpy:
+            return self.end - self.start
+        return [e - s for s, e in zip(self.start, self.end)]
+
+    def _day_presence(self):
+        # Day indexes are small dense integers, so a bincount over the
+        # observed range replaces a sort-based np.unique.
+        first_day = int(self.day_index.min())
+        return first_day, np.bincount(self.day_index - first_day) > 0
+
+    def subject_totals(self) -> Dict[str, int]:
+        """Total minutes per subject."""
+        if self.use_numpy:
+            totals = np.bincount(self.subject_code, weights=self.durations(), minlength=len(self.subjects))
+            return {subject: int(totals[code]) for code, subject in enumerate(self.subjects)}
+
+        totals = [0] * len(self.subjects)
+        for code, duration in zip(self.subject_code, self.durations()):
+            totals[code] += duration
+        return dict(zip(self.subjects, totals))
+
+    def day_totals(self) -> Dict[int, int]:
+        """Total minutes per day index, for days that have any sessions."""
+        if self.use_numpy:
+            if not len(self):
+                return {}
+            first_day, present = self._day_presence()
+            totals = np.bincount(self.day_index - first_day, weights=self.durations())
+            return {int(offset) + first_day: int(totals[offset]) for offset in np.flatnonzero(present)}
+
+        totals: Dict[int, int] = {}
+        for day, duration in zip(self.day_index, self.durations()):
+            totals[day] = totals.get(day, 0) + duration
+        return dict(sorted(totals.items()))
+
+    def heatmap(self) -> List[List[int]]:
+        """Minutes studied in each weekday x hour cell (7 rows, 24 columns).
+
+        Built from a difference array: +1 at each start minute and -1 at
+        each end minute per weekday, so the cost is linear in the number
+        of sessions plus a fixed 7 x 1440 prefix sum.
+        """
+        width = MINUTES_PER_DAY + 1
+        if self.use_numpy:
+            weekday = self.day_index % 7
+            size = 7 * width
+            delta = np.bincount(weekday * width + self.start, minlength=size)
+            delta -= np.bincount(weekday * width + self.end, minlength=size)
+            coverage = np.cumsum(delta.reshape(7, width)[:, :MINUTES_PER_DAY], axis=1)
+            return coverage.reshape(7, 24, 60).sum(axis=2).tolist()
+
+        delta = [[0] * width for _ in range(7)]
+        for day, start, end in zip(self.day_index, self.start, self.end):
+            row = delta[day % 7]
+            row[start] += 1
+            row[end] -= 1
+
+        heat = []
+        for row in delta:
+            hours = [0] * 24
+            running = 0
+            for minute in range(MINUTES_PER_DAY):
+                running += row[minute]
+                hours[minute // 60] += running
+            heat.append(hours)
+        return heat
+
+    def percentiles(self, qs: Sequence[float] = (50, 90)) -> Dict[float, float]:
+        """Session length percentiles in minutes, using linear interpolation."""
+        if not len(self):
+            return {q: 0.0 for q in qs}
+        if self.use_numpy:
+            values = np.percentile(self.durations(), qs)
+            return {q: float(value) for q, value in zip(qs, values)}
+
+        ordered = sorted(self.durations())
+        result = {}
+        for q in qs:
+            position = (len(ordered) - 1) * q / 100
+            lower = int(position)
+            upper = min(lower + 1, len(ordered) - 1)
+            result[q] = float(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower))
+        return result
+
+
+def longest_streak(dates: Collection[date]) -> int:
+    """Longest run of consecutive calendar dates in ``dates``."""
+    best = 0
+    for day in dates:
+        # Only count from the first date of each run
+        if day - timedelta(days=1) in dates:
+            continue
+        length = 1
+        while day + timedelta(days=length) in dates:
+            length += 1
+        best = max(best, length)
+    return best
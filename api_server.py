@@ -0,0 +1,518 @@
+"""Local HTTP/JSON API over the saved schedule.
+
+Run ``python -m study_planner.cli serve`` and point other local tools at
+``http://127.0.0.1:8765``. There is no authentication, so the server only
+listens on localhost unless told otherwise. To keep web pages from
+reaching it through a cross-site form or DNS rebinding, requests must
+name the server in their Host header, and POST and PUT bodies must be
+sent as ``application/json``.
+
+Endpoints::
+
+    GET    /health
+    GET    /sessions?day=&subject=
+    GET    /sessions/<id>
+    POST   /sessions?force=1        one session or a list; 409 on overlaps unless forced
+    PUT    /sessions/<id>           fields to change
+    DELETE /sessions/<id>
+    GET    /stats
+    GET    /free-slots?length=60&days=Monday,Tuesday&earliest=08:00&latest=22:00&limit=5&week=2026-09-07
+    GET    /conflicts?day=Monday&start=09:00&end=10:00&exclude=<id>   (no query: every overlapping pair)
+"""
+
+import asyncio
+import hashlib
+import ipaddress
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+from datetime import date
+from http import HTTPStatus
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+try:
+    from . import storage
+    from .conflicts import ConflictIndex
+    from .free_slots import FreeSlotFinder
+    from .history import AddSessions, History, RemoveSessions, UpdateSession
+    from .recurrence import parse_date, week_start
+    from .session_stats import StatsAggregator
+    from .session_store import SessionStore
+    from .time_utils import DAYS, format_min, parse_time
+    from .validation import edit_session, normalize_session, sanitize_sessions
+except Exception:
+    import storage
+    from conflicts import ConflictIndex
+    from free_slots import FreeSlotFinder
+    from history import AddSessions, History, RemoveSessions, UpdateSession
+    from recurrence import parse_date, week_start
+    from session_stats import StatsAggregator
+    from session_store import SessionStore
+    from time_utils import DAYS, format_min, parse_time
+    from validation import edit_session, normalize_session, sanitize_sessions
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY = 1 << 20
+MAX_FREE_SLOTS = 100
+
+LOOPBACK_NAMES = ("localhost", "127.0.0.1", "::1")
+WILDCARD_HOSTS = ("", "0.0.0.0", "::")
+
+logger = logging.getLogger(__name__)
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _query_time(query: Dict[str, List[str]], name: str, default: Optional[int] = None) -> int:
+    if name not in query:
+        if default is None:
+            raise ApiError(400, f"Query parameter '{name}' is required.")
+        return default
+    try:
+        return parse_time(query[name][0])
+    except ValueError as exc:
+        raise ApiError(400, f"{name}: {exc}") from exc
+
+
+def _query_int(query: Dict[str, List[str]], name: str, default: Optional[int] = None) -> int:
+    if name not in query:
+        if default is None:
+            raise ApiError(400, f"Query parameter '{name}' is required.")
+        return default
+    try:
+        value = int(query[name][0])
+    except ValueError as exc:
+        raise ApiError(400, f"{name} must be a whole number.") from exc
+    if value < 1:
+        raise ApiError(400, f"{name} must be positive.")
+    return value
+
+
+def _query_days(query: Dict[str, List[str]], name: str = "days") -> Tuple[str, ...]:
+    if name not in query:
+        return DAYS
+    days = tuple(day.strip().capitalize() for day in query[name][0].split(",") if day.strip())
+    invalid = [day for day in days if day not in DAYS]
+    if invalid:
+        raise ApiError(400, f"Unknown day(s): {', '.join(invalid)}.")
+    return days
+
+
+def _query_week(query: Dict[str, List[str]]) -> Optional[date]:
+    # Any date in the week; without one the current week is used
+    if "week" not in query:
+        return None
+    try:
+        return week_start(parse_date(query["week"][0]))
+    except ValueError as exc:
+        raise ApiError(400, f"week: {exc}") from exc
+
+
+class ApiServer:
+    """Serves one in-memory, indexed SessionStore over HTTP/JSON.
+
+    All requests run on the event loop thread, so reads always see a
+    consistent store. Writes are queued to a single writer task that
+    applies them as history commands and saves the file before the next
+    write starts; if saving fails the change is reverted. GET responses
+    are cached per URL and reused until the store's version changes.
+    If another program (such as the GUI) rewrites the file, the store is
+    reloaded before the next request, and a write that races such a save
+    is rebuilt on top of the newer file instead of overwriting it.
+    """
+
+    def __init__(self, path=None, cache_size: int = 256):
+        self.path = Path(path) if path is not None else storage.default_path()
+        self.store = SessionStore()
+        self.conflicts = ConflictIndex()
+        self.free_slots = FreeSlotFinder()
+        self.stats = StatsAggregator()
+        for listener in (self.conflicts, self.free_slots, self.stats):
+            self.store.subscribe(listener)
+        self.history = History(self.store, limit=1)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[Tuple[int, date], int, bytes]]" = OrderedDict()
+        self._writes: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._host = DEFAULT_HOST
+        self._port: Optional[int] = None
+        self._mtime: Optional[int] = None
+        self._version = 0
+        self._saving = False
+        self.skipped = 0
+        self.requests = 0
+        self.cache_hits = 0
+        # Part of every ETag, so tags from before a restart (when versions start over) never match
+        self._etag_salt = os.urandom(8).hex()
+        self._routes: List[Tuple[str, "re.Pattern", Callable]] = [
+            ("GET", re.compile(r"/health"), self._health),
+            ("GET", re.compile(r"/sessions"), self._list_sessions),
+            ("POST", re.compile(r"/sessions"), self._add_sessions),
+            ("GET", re.compile(r"/sessions/([^/]+)"), self._get_session),
+            ("PUT", re.compile(r"/sessions/([^/]+)"), self._update_session),
+            ("DELETE", re.compile(r"/sessions/([^/]+)"), self._delete_session),
+            ("GET", re.compile(r"/stats"), self._get_stats),
+            ("GET", re.compile(r"/free-slots"), self._get_free_slots),
+            ("GET", re.compile(r"/conflicts"), self._get_conflicts),
+        ]
+        self.reload()
+
+    # -- Loading and saving --------------------------------------------------
+
+    def _file_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def reload(self) -> None:
+        mtime = self._file_mtime()
+        sessions, self._version = storage.read_schedule(self.path)
+        sessions, errors = sanitize_sessions(sessions)
+        self.skipped = len(errors)
+        self.store.reset(sessions)
+        self.history.clear()
+        self._mtime = mtime
+
+    def _reload_if_changed(self) -> None:
+        if not self._saving and self._file_mtime() != self._mtime:
+            self.reload()
+
+    async def _save(self) -> None:
+        sessions = self.store.sessions()
+        self._saving = True
+        try:
+            self._version = await asyncio.get_running_loop().run_in_executor(
+                None, storage.save_sessions, sessions, self.path, self._version
+            )
+        finally:
+            self._saving = False
+        self._mtime = self._file_mtime()
+
+    async def _run_writer(self) -> None:
+        while True:
+            build_command, future = await self._writes.get()
+            try:
+                self._reload_if_changed()
+                for attempt in range(3):
+                    command = build_command()
+                    self.history.execute(command)
+                    try:
+                        await self._save()
+                        break
+                    except storage.VersionConflictError:
+                        # Saved by someone else after our last check: build the change again on their version
+                        self.history.discard()
+                        if attempt == 2:
+                            raise
+                        self.reload()
+                    except Exception:
+                        self.history.discard()
+                        raise
+            except Exception as exc:
+                if not future.cancelled():
+                    future.set_exception(exc)
+            else:
+                if not future.cancelled():
+                    future.set_result(command)
+
+    async def write(self, build_command: Callable):
+        """Queue a write; ``build_command`` runs on the writer and returns the command to apply."""
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((build_command, future))
+        return await future
+
+    # -- HTTP ------------------------------------------------------------------
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> int:
+        """Start listening and return the port (useful with ``port=0``)."""
+        self._writes = asyncio.Queue()
+        self._writer = asyncio.create_task(self._run_writer())
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        self._host, self._port = host, self._server.sockets[0].getsockname()[1]
+        return self._port
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                try:
+                    self._check_headers(method, headers)
+                except ApiError as exc:
+                    status, payload, extra = exc.status, json.dumps({"error": str(exc)}).encode(), {}
+                else:
+                    status, payload, extra = await self.handle(method, target, body, headers.get("if-none-match"))
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(self._format_response(status, payload, extra, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ApiError as exc:
+            writer.write(self._format_response(exc.status, json.dumps({"error": str(exc)}).encode(), {}, False))
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, target, _version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise ApiError(400, "Malformed request line.")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            raise ApiError(400, "Invalid Content-Length.")
+        if length > MAX_BODY:
+            raise ApiError(413, "Request body is too large.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    @staticmethod
+    def _format_response(status: int, body: bytes, extra: Dict[str, str], keep_alive: bool) -> bytes:
+        headers = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        if status != 304:
+            headers += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+        headers += [f"{name}: {value}" for name, value in extra.items()]
+        headers.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        head = ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1")
+        return head if status == 304 else head + body
+
+    def _host_allowed(self, value: str) -> bool:
+        # Only names DNS cannot point somewhere else: the bound host, loopback
+        # names and, when listening on every interface, plain IP addresses
+        name, _, port = value.rpartition(":")
+        if port != str(self._port):
+            return False
+        name = name.strip("[]").lower()
+        if name == self._host.lower() or name in LOOPBACK_NAMES:
+            return True
+        if self._host in WILDCARD_HOSTS:
+            try:
+                ipaddress.ip_address(name)
+            except ValueError:
+                return False
+            return True
+        return False
+
+    def _check_headers(self, method: str, headers: Dict[str, str]) -> None:
+        # Applied to every request read from a connection, before it is handled
+        if not self._host_allowed(headers.get("host", "")):
+            raise ApiError(403, "Requests must be addressed to this server's host and port.")
+        if method in ("POST", "PUT"):
+            content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+            if content_type != "application/json":
+                raise ApiError(415, "Send the request body as application/json.")
+
+    async def handle(self, method: str, target: str, body: bytes = b"",
+                     if_none_match: Optional[str] = None) -> Tuple[int, bytes, Dict[str, str]]:
+        """Answer one request and return (status, JSON body, extra headers)."""
+        self.requests += 1
+        try:
+            self._reload_if_changed()
+            if method == "GET":
+                return self._cached_get(target, if_none_match)
+            status, payload = await self._dispatch(method, target, body)
+            return status, json.dumps(payload).encode(), {}
+        except ApiError as exc:
+            return exc.status, json.dumps({"error": str(exc)}).encode(), {}
+        except TimeoutError as exc:
+            return 503, json.dumps({"error": str(exc)}).encode(), {}
+        except storage.VersionConflictError as exc:
+            return 409, json.dumps({"error": str(exc)}).encode(), {}
+        except ValueError as exc:
+            return 400, json.dumps({"error": str(exc)}).encode(), {}
+        except Exception:
+            logger.exception("Unexpected error answering an API request")
+            return 500, json.dumps({"error": "Internal server error."}).encode(), {}
+
+    def _etag(self, target: str, version: Tuple[int, date]) -> str:
+        digest = hashlib.blake2b(f"{self._etag_salt} {version} {target}".encode(), digest_size=12)
+        return f'"{digest.hexdigest()}"'
+
+    def _cached_get(self, target: str, if_none_match: Optional[str]) -> Tuple[int, bytes, Dict[str, str]]:
+        # Free slots default to the current week, so answers also go stale when a new week starts
+        version = (self.store.version, week_start())
+        split = urlsplit(target)
+        handler, args = self._route("GET", split.path)
+        etag = self._etag(target, version)
+
+        cached = self._cache.get(target)
+        if cached is not None and cached[0] == version:
+            self._cache.move_to_end(target)
+            self.cache_hits += 1
+            status, body = cached[1], cached[2]
+        else:
+            status, payload = handler(parse_qs(split.query), *args)
+            body = json.dumps(payload).encode()
+            if status != 200:
+                return status, body, {}
+            self._cache[target] = (version, status, body)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        if if_none_match == etag:
+            return 304, b"", {"ETag": etag}
+        return status, body, {"ETag": etag}
+
+    async def _dispatch(self, method: str, target: str, body: bytes):
+        split = urlsplit(target)
+        handler, args = self._route(method, split.path)
+        try:
+            data = json.loads(body) if body else None
+        except json.JSONDecodeError as exc:
+            raise ApiError(400, f"Request body is not valid JSON: {exc}") from exc
+        return await handler(parse_qs(split.query), data, *args)
+
+    def _route(self, method: str, path: str):
+        path_matched = False
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path.rstrip("/") or "/")
+            if match:
+                path_matched = True
+                if route_method == method:
+                    return handler, [unquote(group) for group in match.groups()]
+        if path_matched:
+            raise ApiError(405, f"{method} is not allowed on {path}.")
+        raise ApiError(404, f"No such endpoint: {path}.")
+
+    # -- Handlers ----------------------------------------------------------------
+
+    def _session_or_404(self, session_id: str) -> Dict:
+        session = self.store.get(session_id)
+        if session is None:
+            raise ApiError(404, f"No session with id {session_id}.")
+        return session
+
+    def _health(self, query):
+        return 200, {"version": self.store.version, "sessions": len(self.store), "skipped": self.skipped}
+
+    def _list_sessions(self, query):
+        sessions = self.store.sessions()
+        if "day" in query:
+            day = query["day"][0].capitalize()
+            sessions = [session for session in sessions if session["day"] == day]
+        if "subject" in query:
+            subject = query["subject"][0].casefold()
+            sessions = [session for session in sessions if session["subject"].casefold() == subject]
+        sessions.sort(key=lambda session: (DAYS.index(session["day"]), session.start_min))
+        return 200, {"version": self.store.version, "sessions": sessions}
+
+    def _get_session(self, query, session_id):
+        return 200, self._session_or_404(session_id)
+
+    def _get_stats(self, query):
+        return 200, self.stats.snapshot()
+
+    def _get_free_slots(self, query):
+        windows = self.free_slots.free_windows(
+            _query_int(query, "length"),
+            _query_days(query),
+            earliest=_query_time(query, "earliest", 0),
+            latest=_query_time(query, "latest", 24 * 60 - 1),
+            limit=min(_query_int(query, "limit", 5), MAX_FREE_SLOTS),
+            step=_query_int(query, "step", 15),
+            monday=_query_week(query),
+        )
+        return 200, [{"day": day, "start": format_min(start), "end": format_min(end)} for day, start, end in windows]
+
+    def _get_conflicts(self, query):
+        if "start" not in query and "end" not in query:
+            pairs = []
+            for session in self.store:
+                for other in self.conflicts.find((session["day"],), session.start_min, session.end_min, session["id"],
+                                                 session.get("repeat")):
+                    if other["id"] > session["id"]:
+                        pairs.append([session, other])
+            return 200, pairs
+        start, end = _query_time(query, "start"), _query_time(query, "end")
+        exclude = query.get("exclude", [None])[0]
+        return 200, self.conflicts.find(_query_days(query, "day"), start, end, exclude)
+
+    async def _add_sessions(self, query, data):
+        if data is None:
+            raise ApiError(400, "Send a session or a list of sessions.")
+        records = data if isinstance(data, list) else [data]
+        force = query.get("force", ["0"])[0] not in ("", "0", "false")
+
+        def build():
+            sessions = [normalize_session(record) for record in records]
+            if not force:
+                for session in sessions:
+                    clashes = self.conflicts.find((session["day"],), session.start_min, session.end_min,
+                                                  repeat=session.get("repeat"))
+                    if clashes:
+                        raise ApiError(409, f"{session['subject']} on {session['day']} overlaps "
+                                            f"{clashes[0]['subject']} ({clashes[0]['start']}-{clashes[0]['end']}).")
+            return AddSessions(sessions)
+
+        command = await self.write(build)
+        return 201, {"version": self.store.version, "sessions": command.sessions}
+
+    async def _update_session(self, query, data, session_id):
+        if not isinstance(data, dict):
+            raise ApiError(400, "Send an object with the fields to change.")
+
+        def build():
+            old = self._session_or_404(session_id)
+            return UpdateSession(old, edit_session(old, {**data, "id": session_id}))
+
+        await self.write(build)
+        return 200, self.store.get(session_id)
+
+    async def _delete_session(self, query, data, session_id):
+        def build():
+            self._session_or_404(session_id)
+            return RemoveSessions([session_id])
+
+        command = await self.write(build)
+        return 200, {"version": self.store.version, "deleted": command.removed}
+
+
+async def serve(path=None, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                ready: Optional[Callable[[int], None]] = None) -> None:
+    server = ApiServer(path)
+    bound_port = await server.start(host, port)
+    if ready:
+        ready(bound_port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
@@ -3,16 +3,60 @@ from tkinter import ttk, filedialog, simpledialog, messagebox
 import uuid
 from datetime import datetime, timedelta
 import json
-import traceback
 from pathlib import Path
-from collections import defaultdict
 
 try:
     from . import storage
-    from .time_utils import format_min, generate_time_slots
+    from .analytics import AnalyticsEngine, longest_streak
+    from .conflicts import ConflictIndex
+    from .csv_io import iter_csv_records, write_csv
+    from .error_log import ErrorLog
+    from .filter_engine import FilterEngine, SessionFilter
+    from .free_slots import FreeSlotFinder
+    from .history import AddSessions, CompositeCommand, History, RemoveSessions, SplitSession, UpdateSession
+    from .ics_export import write_ics
+    from .importer import ImportJob
+    from .layout import layout_week
+    from .merge import merge_sessions
+    from .prefetch import WeekPrefetcher
+    from .recurrence import OccurrenceCache, is_one_off, occupied_dates, one_off_rule, session_date, week_start
+    from .reminders import ReminderTracker
+    from .scheduler import plan_week
+    from .search_index import SearchIndex
+    from .session_stats import StatsAggregator
+    from .session_store import SessionStore
+    from .startup import BackgroundLoad, PhaseTimer
+    from .subject_trie import SubjectTrie
+    from .template_store import TemplateStore
+    from .time_utils import DAYS, format_min, generate_time_slots, parse_time
+    from .tracing import traced, tracer
+    from .validation import copy_to_days, edit_session, is_valid_color, normalize_session, sanitize_sessions
 except Exception: 
     import storage
-    from time_utils import format_min, generate_time_slots
+    from analytics import AnalyticsEngine, longest_streak
+    from conflicts import ConflictIndex
+    from csv_io import iter_csv_records, write_csv
+    from error_log import ErrorLog
+    from filter_engine import FilterEngine, SessionFilter
+    from free_slots import FreeSlotFinder
+    from history import AddSessions, CompositeCommand, History, RemoveSessions, SplitSession, UpdateSession
+    from ics_export import write_ics
+    from importer import ImportJob
+    from layout import layout_week
+    from merge import merge_sessions
+    from prefetch import WeekPrefetcher
+    from recurrence import OccurrenceCache, is_one_off, occupied_dates, one_off_rule, session_date, week_start
+    from reminders import ReminderTracker
+    from scheduler import plan_week
+    from search_index import SearchIndex
+    from session_stats import StatsAggregator
+    from session_store import SessionStore
+    from startup import BackgroundLoad, PhaseTimer
+    from subject_trie import SubjectTrie
+    from template_store import TemplateStore
+    from time_utils import DAYS, format_min, generate_time_slots, parse_time
+    from tracing import traced, tracer
+    from validation import copy_to_days, edit_session, is_valid_color, normalize_session, sanitize_sessions
 
 
 class StudyPlannerApp:
@@ -22,17 +66,43 @@ class StudyPlannerApp:
         self.root.title("Study Planner")
         self.root.configure(bg="#f5f5f5")
         self.root.geometry("1400x900")
+        self.startup_timer = PhaseTimer()
+        self._loading = True
+        # Version of the schedule file we last read or wrote; None saves unconditionally
+        self._file_version = None
         app_data_dir = Path.home() / ".study_planner"
         app_data_dir.mkdir(parents=True, exist_ok=True)
         self.error_log_path = app_data_dir / "study_planner_errors.log"
+        self.error_log = ErrorLog(self.error_log_path)
         self.root.report_callback_exception = self._handle_tk_exception
-        self.sessions = []
-        self.sent_reminders = {}
+        self.store = SessionStore()
+        self.stats = StatsAggregator()
+        self.store.subscribe(self.stats)
+        self.history = History(self.store)
+        self.search_index = SearchIndex()
+        self.store.subscribe(self.search_index)
+        self.filter_engine = FilterEngine()
+        self.store.subscribe(self.filter_engine)
+        self.subject_trie = SubjectTrie()
+        self.store.subscribe(self.subject_trie)
+        self.free_slots = FreeSlotFinder()
+        self.store.subscribe(self.free_slots)
+        self.conflict_index = ConflictIndex()
+        self.store.subscribe(self.conflict_index)
+        self.search_matches = set()
+        self._search_job = None
+        self._analytics_cache = None
+        self._streak_cache = None
+        self.occurrence_cache = OccurrenceCache()
+        self.prefetcher = WeekPrefetcher()
+        self.prefetch_radius = 1
+        self.reminders = ReminderTracker()
         
         self.dark_mode = False
         self.current_filter = None
-        self.session_templates = self._load_templates()
-        self.study_goals = {"weekly_hours": 20.0}
+        # Read on first use; older versions kept templates next to the code
+        self.template_store = TemplateStore(legacy_path=Path(__file__).parent / "session_templates.json")
+        self.study_goals = {"weekly_hours": 20.0, "subject_hours": {}}
         self.current_week_offset = 0
         self.drag_enabled = False
         self.drag_source = None
@@ -50,40 +120,69 @@ class StudyPlannerApp:
             "time_label_fg": "#7f8c8d"
         }
 
-        self.days = [
-            "Monday", "Tuesday", "Wednesday", "Thursday",
-            "Friday", "Saturday", "Sunday"
-        ]
+        self.days = list(DAYS)
 
         self._create_menu_bar()
         self._create_header()
         self._create_toolbar()
         self._create_calendar_grid()
         self._setup_keyboard_shortcuts()
+        self.startup_timer.mark("window")
+
+        # Let mainloop draw the empty window while the schedule loads on a worker thread
+        self.status_label.config(text="Loading schedule...")
+        self._schedule_loader = BackgroundLoad(self._read_saved_schedule).start()
+        self.root.after(10, self._poll_startup_load)
+
+    def _read_saved_schedule(self):
+        # Runs on the loader thread. Saves pass the version back so a newer file is never overwritten.
+        sessions, self._file_version = storage.read_schedule()
+        return sessions
+
+    def _poll_startup_load(self):
+        result = self._schedule_loader.poll()
+        if result is None:
+            self.root.after(20, self._poll_startup_load)
+            return
+        self._finish_startup(result)
 
-        try:
-            self.sessions = storage.load_sessions()
-        except Exception as exc:
+    @traced("finish_startup")
+    def _finish_startup(self, result):
+        self.startup_timer.mark("load")
+        if result.load_error is not None:
             self._show_user_error(
                 "Load Error",
                 "Your schedule file could not be loaded. A blank schedule was opened instead.",
-                exc,
+                result.load_error,
             )
-            self.sessions = []
+        elif not result.valid_format:
+            messagebox.showwarning("Schedule Reset", "Some saved schedule was invalid and could not be used.")
+        self._report_skipped_sessions(result.errors, show_warning=True, source="saved schedule")
 
-        self.sessions = self._sanitize_sessions(self.sessions, show_warning=True, source="saved schedule")
+        self.store.reset(result.sessions)
+        self.history.clear()
+        self._loading = False
+        self.startup_timer.mark("index")
 
         self.render_sessions()
+        self.startup_timer.mark("render")
+
+        # Timers start last so they never hold up the first paint
         self._check_reminders()
-        
         self._update_time_indicator()
+        self.startup_timer.mark("timers")
+
+        self.status_label.config(text=f"Loaded {len(self.store)} session(s) in {self.startup_timer.total * 1000:.0f} ms")
+        self.root.after(5000, lambda: self.status_label.config(text=""))
+
+    @property
+    def sessions(self):
+        return self.store.sessions()
 
     def _log_exception(self, context: str, exc: Exception) -> None:
+        # Written by a background thread; repeats of the same error are rate limited
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            details = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
-            with open(self.error_log_path, "a", encoding="utf-8") as log_file:
-                log_file.write(f"[{timestamp}] {context}\n{details}\n")
+            self.error_log.exception(context, exc)
         except Exception:
             pass
 
@@ -107,112 +206,31 @@ class StudyPlannerApp:
             pass
 
     def _parse_time_to_minutes(self, time_value: str) -> int:
-        if not isinstance(time_value, str):
-            raise ValueError("Time must be text in HH:MM format.")
-
-        parts = time_value.strip().split(":")
-        if len(parts) != 2:
-            raise ValueError("Time must be in HH:MM format.")
-
-        try:
-            hours = int(parts[0])
-            minutes = int(parts[1])
-        except ValueError as exc:
-            raise ValueError("Time must contain only numbers.") from exc
-
-        if not (0 <= hours <= 23 and 0 <= minutes <= 59):
-            raise ValueError("Time must be between 00:00 and 23:59.")
-
-        return hours * 60 + minutes
+        return parse_time(time_value)
 
     def _is_valid_color(self, color_value: str) -> bool:
-        if not isinstance(color_value, str):
-            return False
-        cleaned = color_value.strip()
-        return len(cleaned) == 7 and cleaned.startswith("#") and all(c in "0123456789abcdefABCDEF" for c in cleaned[1:])
+        return is_valid_color(color_value)
 
     def _normalize_session(self, session: dict) -> dict:
-        if not isinstance(session, dict):
-            raise ValueError("Session must be an object.")
-
-        subject = str(session.get("subject", "")).strip()
-        day = str(session.get("day", "")).strip()
-        start = str(session.get("start", "")).strip()
-        end = str(session.get("end", "")).strip()
-
-        if not subject:
-            raise ValueError("Session subject is required.")
-        if day not in self.days:
-            raise ValueError("Session day is invalid.")
-
-        start_minutes = self._parse_time_to_minutes(start)
-        end_minutes = self._parse_time_to_minutes(end)
-        if end_minutes <= start_minutes:
-            raise ValueError("End time must be after start time.")
-
-        color = str(session.get("color", "")).strip()
-        if not self._is_valid_color(color):
-            color = "#AED6F1"
-
-        normalized: dict[str, object] = {
-            "id": str(session.get("id") or uuid.uuid4()),
-            "subject": subject,
-            "day": day,
-            "start": f"{start_minutes // 60:02d}:{start_minutes % 60:02d}",
-            "end": f"{end_minutes // 60:02d}:{end_minutes % 60:02d}",
-            "color": color,
-            "notes": str(session.get("notes", "")).strip(),
-        }
+        return normalize_session(session, self.days)
 
-        tasks = session.get("tasks", [])
-        if isinstance(tasks, list):
-            normalized_tasks = []
-            for task in tasks:
-                if not isinstance(task, dict):
-                    continue
-                task_text = str(task.get("text", "")).strip()
-                if not task_text:
-                    continue
-                normalized_tasks.append({
-                    "text": task_text,
-                    "completed": bool(task.get("completed", False)),
-                })
-            if normalized_tasks:
-                normalized["tasks"] = normalized_tasks
-
-        return normalized
+    def _report_skipped_sessions(self, errors, show_warning: bool = False, source: str = "data"):
+        for _, exc in errors:
+            self._log_exception(f"Invalid session skipped from {source}", exc)
 
-    def _sanitize_sessions(self, sessions, show_warning: bool = False, source: str = "data"):
-        if not isinstance(sessions, list):
-            if show_warning:
-                messagebox.showwarning(
-                    "Schedule Reset",
-                    f"Some {source} was invalid and could not be used."
-                )
-            return []
-
-        cleaned = []
-        dropped_count = 0
-
-        for session in sessions:
-            try:
-                cleaned.append(self._normalize_session(session))
-            except Exception as exc:
-                dropped_count += 1
-                self._log_exception(f"Invalid session skipped from {source}", exc)
-
-        if show_warning and dropped_count:
+        if show_warning and errors:
             messagebox.showwarning(
                 "Some Sessions Skipped",
-                f"{dropped_count} invalid session(s) in your {source} were skipped to keep the app stable."
+                f"{len(errors)} invalid session(s) in your {source} were skipped to keep the app stable."
             )
 
-        return cleaned
-
     def _safe_save_sessions(self, show_error: bool = True) -> bool:
+        # Raises storage.VersionConflictError if another program saved the file since we last read or wrote it
         try:
-            storage.save_sessions(self.sessions)
+            self._file_version = storage.save_sessions(self.sessions, expected_version=self._file_version)
             return True
+        except storage.VersionConflictError:
+            raise
         except Exception as exc:
             if show_error:
                 self._show_user_error(
@@ -230,10 +248,19 @@ class StudyPlannerApp:
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Export as JSON", command=self._export_json, accelerator="Ctrl+E")
+        file_menu.add_command(label="Export as iCalendar (.ics)", command=self._export_ics)
+        file_menu.add_command(label="Export as CSV", command=self._export_csv)
         file_menu.add_command(label="Import from JSON", command=self._import_json)
+        file_menu.add_command(label="Import from CSV", command=self._import_csv)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         
+        # Edit menu
+        self.edit_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Edit", menu=self.edit_menu)
+        self.edit_menu.add_command(label="Undo", command=self._undo, accelerator="Ctrl+Z", state="disabled")
+        self.edit_menu.add_command(label="Redo", command=self._redo, accelerator="Ctrl+Y", state="disabled")
+        
         # View menu
         view_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="View", menu=view_menu)
@@ -249,6 +276,7 @@ class StudyPlannerApp:
         menubar.add_cascade(label="Tools", menu=tools_menu)
         tools_menu.add_command(label="Session Templates", command=self._manage_templates)
         tools_menu.add_command(label="Study Goals", command=self._manage_goals)
+        tools_menu.add_command(label="Auto-Schedule Week", command=self._auto_schedule)
         tools_menu.add_command(label="Break Reminder Settings", command=self._break_reminder_settings)
         tools_menu.add_separator()
         tools_menu.add_command(label="Archive/History", command=self._show_archive)
@@ -258,6 +286,11 @@ class StudyPlannerApp:
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Help", menu=help_menu)
         help_menu.add_command(label="Keyboard Shortcuts", command=self._show_shortcuts)
+        help_menu.add_separator()
+        self.tracing_var = tk.BooleanVar(value=tracer.enabled)
+        help_menu.add_checkbutton(label="Record Performance Trace", variable=self.tracing_var, command=self._toggle_tracing)
+        help_menu.add_command(label="Export Performance Trace...", command=self._export_trace)
+        help_menu.add_separator()
         help_menu.add_command(label="About", command=self._show_about)
     
     def _setup_keyboard_shortcuts(self):
@@ -266,9 +299,13 @@ class StudyPlannerApp:
         self.root.bind('<Control-s>', lambda e: self._show_statistics())
         self.root.bind('<Control-d>', lambda e: self._toggle_dark_mode())
         self.root.bind('<Control-f>', lambda e: self._show_filter_dialog())
+        self.root.bind('<Control-k>', lambda e: self.search_entry.focus_set())
         self.root.bind('<Control-Left>', lambda e: self._change_week(-1))
         self.root.bind('<Control-Right>', lambda e: self._change_week(1))
         self.root.bind('<Delete>', lambda e: self._delete_selected_session())
+        self.root.bind('<Control-z>', lambda e: self._undo())
+        self.root.bind('<Control-y>', lambda e: self._redo())
+        self.root.bind('<Control-Shift-Z>', lambda e: self._redo())
 
     def _create_header(self):
         header_frame = tk.Frame(self.root, bg=self.colors["header_bg"], height=80)
@@ -330,7 +367,7 @@ class StudyPlannerApp:
         tk.Label(toolbar, text="Filter:", bg="#ecf0f1", font=("Segoe UI", 10)).pack(side="left", padx=(15, 5))
         
         self.filter_var = tk.StringVar(value="All")
-        filter_btn = ttk.Button(toolbar, text="📋 By Subject", command=self._show_filter_dialog)
+        filter_btn = ttk.Button(toolbar, text="📋 Filter...", command=self._show_filter_dialog)
         filter_btn.pack(side="left", padx=5)
         
         self.filter_label = tk.Label(toolbar, text="(All subjects)", bg="#ecf0f1", fg="#7f8c8d", font=("Segoe UI", 9))
@@ -355,6 +392,9 @@ class StudyPlannerApp:
         next_btn = ttk.Button(toolbar, text="Next ►", command=lambda: self._change_week(1))
         next_btn.pack(side="left", padx=2)
         
+        self.status_label = tk.Label(toolbar, text="", bg="#ecf0f1", fg="#7f8c8d", font=("Segoe UI", 9))
+        self.status_label.pack(side="left", padx=10)
+        
         # Right side - stats button
         stats_btn = tk.Button(
             toolbar,
@@ -369,6 +409,17 @@ class StudyPlannerApp:
             cursor="hand2"
         )
         stats_btn.pack(side="right", padx=15)
+
+        # Search across subjects, notes and tasks; matches are outlined in the calendar
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(toolbar, textvariable=self.search_var, width=24)
+        self.search_entry.pack(side="right", padx=5)
+        self.search_entry.bind("<KeyRelease>", lambda e: self._schedule_search())
+        self.search_entry.bind("<Escape>", lambda e: self._clear_search())
+        tk.Label(toolbar, text="🔍", bg="#ecf0f1", font=("Segoe UI", 10)).pack(side="right")
+
+        self.search_label = tk.Label(toolbar, text="", bg="#ecf0f1", fg="#7f8c8d", font=("Segoe UI", 9))
+        self.search_label.pack(side="right", padx=5)
     
     def _create_calendar_grid(self):
         # Wrapper for padding and background
@@ -476,10 +527,11 @@ class StudyPlannerApp:
         finally:
             self.root.after(60000, self._update_time_indicator)
   
+    @traced("dialog.add_session_popup")
     def add_session_popup(self, template=None):
         popup = tk.Toplevel(self.root)
         popup.title("Add Study Session")
-        popup.geometry("450x800")  # Increased height for new fields
+        popup.geometry("450x920")  # Increased height for new fields
         popup.configure(bg="#f5f5f5")
         popup.resizable(False, False)
         
@@ -532,6 +584,56 @@ class StudyPlannerApp:
         )
         subject_entry.pack(fill="x", padx=10, pady=8)
 
+        # Known subjects drop down under the entry as you type
+        suggestion_list = tk.Listbox(form_frame, font=("Segoe UI", 10), height=5, activestyle="none")
+        suggestions = []
+
+        def show_suggestions(event=None):
+            if event is not None and event.keysym in ("Down", "Return", "Escape", "Tab"):
+                return
+            suggestions[:] = self.subject_trie.suggest(subject_entry.get())
+            typed = subject_entry.get().strip()
+            if not suggestions or (len(suggestions) == 1 and suggestions[0][0] == typed):
+                suggestion_list.place_forget()
+                return
+            suggestion_list.delete(0, tk.END)
+            for index, (name, color) in enumerate(suggestions):
+                suggestion_list.insert(tk.END, f"  {name}")
+                try:
+                    suggestion_list.itemconfig(index, background=color, foreground=self._get_contrast_color(color))
+                except (tk.TclError, TypeError):
+                    pass
+            suggestion_list.config(height=len(suggestions))
+            suggestion_list.place(in_=subject_frame, relx=0, rely=1, relwidth=1)
+            suggestion_list.lift()
+
+        def choose_suggestion(event=None):
+            selection = suggestion_list.curselection()
+            if not selection:
+                return
+            name, color = suggestions[selection[0]]
+            subject_entry.delete(0, tk.END)
+            subject_entry.insert(0, name)
+            # Reuse the subject's colour so its sessions stay consistent
+            if color:
+                colour_entry.delete(0, tk.END)
+                colour_entry.insert(0, color)
+                update_preview()
+            suggestion_list.place_forget()
+            subject_entry.focus_set()
+
+        def focus_suggestions(event=None):
+            if suggestions and suggestion_list.winfo_ismapped():
+                suggestion_list.focus_set()
+                suggestion_list.selection_set(0)
+
+        subject_entry.bind("<KeyRelease>", show_suggestions)
+        subject_entry.bind("<Down>", focus_suggestions)
+        subject_entry.bind("<Escape>", lambda e: suggestion_list.place_forget())
+        suggestion_list.bind("<ButtonRelease-1>", choose_suggestion)
+        suggestion_list.bind("<Return>", choose_suggestion)
+        suggestion_list.bind("<Escape>", lambda e: (suggestion_list.place_forget(), subject_entry.focus_set()))
+
         # --- Day ---
         day_label = tk.Label(
             form_frame,
@@ -603,6 +705,43 @@ class StudyPlannerApp:
         end_entry.pack(fill="x", padx=10, pady=8)
         end_entry.insert(0, "17:00")
 
+        # Offer free windows of the entered length within the calendar's hours
+        def suggest_times():
+            try:
+                length = self._parse_time_to_minutes(end_entry.get()) - self._parse_time_to_minutes(start_entry.get())
+            except ValueError:
+                length = 0
+            if length <= 0:
+                messagebox.showerror("Invalid Time", "Enter a start and end time first so the length is known.", parent=popup)
+                return
+            days = [selected_day.get()] if selected_day.get() else self.days
+            # Free in the week on screen, where the new session's repeat rule starts
+            windows = self.free_slots.free_windows(
+                length, days, earliest=self.time_slots[0][0], latest=self.time_slots[-1][1], limit=8,
+                monday=self._displayed_monday(),
+            )
+            if not windows:
+                messagebox.showinfo("No Free Time", f"There is no free {length}-minute window on {', '.join(days)}.", parent=popup)
+                return
+
+            def use_window(day, start, end):
+                selected_day.set(day)
+                start_entry.delete(0, tk.END)
+                start_entry.insert(0, format_min(start))
+                end_entry.delete(0, tk.END)
+                end_entry.insert(0, format_min(end))
+
+            menu = tk.Menu(popup, tearoff=0)
+            for day, start, end in windows:
+                menu.add_command(
+                    label=f"{day}  {format_min(start)} - {format_min(end)}",
+                    command=lambda d=day, a=start, b=end: use_window(d, a, b)
+                )
+            menu.tk_popup(suggest_btn.winfo_rootx(), suggest_btn.winfo_rooty() + suggest_btn.winfo_height())
+
+        suggest_btn = ttk.Button(form_frame, text="💡 Suggest free times", command=suggest_times)
+        suggest_btn.pack(anchor="w", pady=(0, 10))
+
         # --- Colour Selection ---
         color_label = tk.Label(
             form_frame,
@@ -711,6 +850,64 @@ class StudyPlannerApp:
         )
         notes_text.pack(fill="both", padx=10, pady=8)
         
+        # --- Repeat Rule ---
+        repeat_label = tk.Label(
+            form_frame,
+            text="Repeats",
+            font=("Segoe UI", 11, "bold"),
+            bg="#f5f5f5",
+            fg="#2c3e50"
+        )
+        repeat_label.pack(anchor="w", pady=(10, 5))
+
+        repeat_container = tk.Frame(form_frame, bg="#f5f5f5")
+        repeat_container.pack(fill="x", pady=(0, 10))
+
+        repeat_options = {
+            "Every week": 1,
+            "Every 2 weeks": 2,
+            "Every 3 weeks": 3,
+            "Every 4 weeks": 4,
+            "This week only": 0,
+        }
+        repeat_var = tk.StringVar(value="Every week")
+        repeat_dropdown = ttk.Combobox(
+            repeat_container,
+            textvariable=repeat_var,
+            values=list(repeat_options),
+            state="readonly",
+            font=("Segoe UI", 10),
+            width=14
+        )
+        repeat_dropdown.pack(side="left")
+
+        tk.Label(
+            repeat_container,
+            text="until",
+            font=("Segoe UI", 9),
+            bg="#f5f5f5",
+            fg="#7f8c8d"
+        ).pack(side="left", padx=8)
+
+        until_entry = tk.Entry(
+            repeat_container,
+            font=("Segoe UI", 10),
+            bg="#ffffff",
+            fg="#2c3e50",
+            bd=1,
+            relief="solid",
+            width=12
+        )
+        until_entry.pack(side="left")
+
+        tk.Label(
+            repeat_container,
+            text="(YYYY-MM-DD, optional)",
+            font=("Segoe UI", 8),
+            bg="#f5f5f5",
+            fg="#7f8c8d"
+        ).pack(side="left", padx=5)
+
         # --- Recurring Option ---
         recurring_var = tk.BooleanVar(value=False)
         recurring_check = tk.Checkbutton(
@@ -759,6 +956,31 @@ class StudyPlannerApp:
             )
             cb.pack(side="left")
 
+        # Fill the form in from a template
+        template_tasks = []
+        if template:
+            def set_entry(entry, value):
+                entry.delete(0, tk.END)
+                entry.insert(0, value)
+
+            set_entry(subject_entry, template.get("subject", ""))
+            if template.get("day"):
+                selected_day.set(template["day"])
+            if template.get("start"):
+                set_entry(start_entry, template["start"])
+                set_entry(end_entry, template["end"])
+            elif template.get("duration"):
+                set_entry(end_entry, format_min(self._parse_time_to_minutes(start_entry.get()) + self._parse_time_to_minutes(template["duration"])))
+            if template.get("color"):
+                set_entry(colour_entry, template["color"])
+                update_preview()
+            if template.get("notes"):
+                notes_text.insert("1.0", template["notes"])
+            for label, interval in repeat_options.items():
+                if interval == template.get("interval", 1):
+                    repeat_var.set(label)
+            template_tasks = template.get("tasks", [])
+
         # --- Internal function for saving ---
         def save_session():
             subject = subject_entry.get().strip()
@@ -772,21 +994,6 @@ class StudyPlannerApp:
                 messagebox.showerror("Missing Subject", "Please enter a subject name.")
                 return
 
-            try:
-                self._parse_time_to_minutes(start)
-                self._parse_time_to_minutes(end)
-                self._normalize_session({
-                    "subject": subject,
-                    "day": self.days[0],
-                    "start": start,
-                    "end": end,
-                    "color": colour,
-                    "notes": notes,
-                })
-            except ValueError as exc:
-                messagebox.showerror("Invalid Time", str(exc))
-                return
-
             # Determine which days to create sessions for
             days_to_create = []
             if recurring_var.get():
@@ -800,42 +1007,60 @@ class StudyPlannerApp:
                     messagebox.showerror("Error", "Please complete all fields.")
                     return
                 days_to_create = [day]
+
+            # Validate the shared fields once; the per-day copies only differ in day, id and repeat rule
+            try:
+                base = self._normalize_session({
+                    "subject": subject,
+                    "day": days_to_create[0],
+                    "start": start,
+                    "end": end,
+                    "color": colour,
+                    "notes": notes,
+                    "tasks": template_tasks,
+                })
+            except ValueError as exc:
+                messagebox.showerror("Invalid Time", str(exc))
+                return
+
+            # Repeat rules are anchored on the week currently on screen
+            monday = self._displayed_monday()
+            interval = repeat_options.get(repeat_var.get(), 1)
+            until = until_entry.get().strip()
+
+            def repeat_rule(target_day):
+                first_date = session_date({"day": target_day}, monday)
+                if interval == 0:
+                    return one_off_rule(first_date)
+                rule = {"start": first_date.isoformat(), "interval": interval}
+                if until:
+                    rule["until"] = until
+                return rule
+
+            try:
+                new_sessions = copy_to_days(base, days_to_create, repeat_rule)
+            except ValueError as exc:
+                messagebox.showerror("Invalid Session", str(exc))
+                return
             
-            # Time conflict detection
-            conflicts = self._check_time_conflicts(days_to_create, start, end)
+            # Time conflict detection for each new session, in the weeks its repeat rule covers
+            with tracer.span("check_time_conflicts", days=len(days_to_create)):
+                conflicts = self._describe_conflicts([
+                    other
+                    for session in new_sessions
+                    for other in self.conflict_index.find(
+                        (session["day"],), base.start_min, base.end_min, repeat=session.get("repeat")
+                    )
+                ])
             if conflicts:
                 conflict_msg = "Time conflicts detected:\n\n" + "\n".join(conflicts)
                 conflict_msg += "\n\nDo you want to add anyway?"
                 if not messagebox.askyesno("Conflict Warning", conflict_msg):
                     return
 
-            previous_sessions = list(self.sessions)
-
-            # Create sessions for each selected day
-            for target_day in days_to_create:
-                try:
-                    new_session = self._normalize_session({
-                        "subject": subject,
-                        "day": target_day,
-                        "start": start,
-                        "end": end,
-                        "color": colour,
-                        "notes": notes,
-                        "id": str(uuid.uuid4())
-                    })
-                    self.sessions.append(new_session)
-                except ValueError as exc:
-                    self.sessions = previous_sessions
-                    messagebox.showerror("Invalid Session", str(exc))
-                    return
-
-            # Save session to disk
-            if not self._safe_save_sessions(show_error=True):
-                self.sessions = previous_sessions
+            if not self._add_sessions(new_sessions):
                 return
 
-            # Update calendar immediately
-            self.render_sessions()
             messagebox.showinfo("Saved", "Study session added successfully.")
             popup.destroy()
 
@@ -905,6 +1130,7 @@ class StudyPlannerApp:
         subject_entry.focus()
    
   
+    @traced("render_sessions")
     def render_sessions(self):
         # Clear all widgets except the internal time labels
         for row in self.slot_frames:
@@ -914,88 +1140,138 @@ class StudyPlannerApp:
                         continue
                     child.destroy()
 
-        # Filter sessions if filter is active
-        sessions_to_render = self.sessions
-        if self.current_filter:
-            sessions_to_render = [s for s in self.sessions if s.get("subject") == self.current_filter]
-
-        # Place each valid session onto the calendar
-        for session in sessions_to_render:
-            try:
-                normalized_session = self._normalize_session(session)
-                day_index = self.days.index(str(normalized_session["day"]))
-                start_minutes = self._parse_time_to_minutes(str(normalized_session["start"]))
-                end_minutes = self._parse_time_to_minutes(str(normalized_session["end"]))
-            except (ValueError, TypeError):
-                continue
-
-            # Check session-slot overlap and render
-            for slot_index, (slot_start, slot_end) in enumerate(self.time_slots):
-                if start_minutes < slot_end and end_minutes > slot_start:
-                    parent_cell = self.slot_frames[slot_index][day_index]
-                    colour = normalized_session.get("color", "#AED6F1")
-
-                    # Create event frame with rounded appearance
-                    event_frame = tk.Frame(
-                        parent_cell, 
-                        bg=colour,
-                        highlightbackground=self._darken_color(colour),
-                        highlightthickness=2
-                    )
-                    event_frame.place(relx=0.02, rely=0.18, relwidth=0.96, relheight=0.80)
+        # Use the layout prepared in the background if there is one
+        monday = self._displayed_monday()
+        placed = self.prefetcher.take(self._layout_key(monday))
+        if placed is None:
+            placed = layout_week(self._week_sessions(), self.time_slots, self._visible_ids())
+        self._refresh_search(placed)
+
+        # Place each session onto the calendar; the store only holds validated sessions
+        for session, day_index, slot_indexes in placed:
+            for slot_index in slot_indexes:
+                parent_cell = self.slot_frames[slot_index][day_index]
+                colour = session["color"]
+                matched = session["id"] in self.search_matches
+                border = 4 if matched else 2
+
+                # Create event frame with rounded appearance
+                event_frame = tk.Frame(
+                    parent_cell, 
+                    bg=colour,
+                    highlightbackground="#f1c40f" if matched else self._darken_color(colour),
+                    highlightthickness=border
+                )
+                event_frame.place(relx=0.02, rely=0.18, relwidth=0.96, relheight=0.80)
+
+                subject_label = tk.Label(
+                    event_frame,
+                    text=session["subject"],
+                    bg=colour,
+                    fg=self._get_contrast_color(colour),
+                    font=("Segoe UI", 10, "bold"),
+                    wraplength=120
+                )
+                subject_label.pack(expand=True, fill="both", padx=5, pady=2)
+                # Attach metadata for callbacks
+                session_id = session["id"]
+                setattr(event_frame, "session_id", session_id)
+                setattr(event_frame, "slot_index", slot_index)
+
+                # Bind right-click to menu and double-click to edit directly
+                def make_edit_handler(sid):
+                    return lambda e: self.edit_session_popup(sid)
+                
+                def make_menu_handler(sid, sidx):
+                    return lambda e: self._show_delete_popup(sid, sidx)
 
-                    subject_label = tk.Label(
+                event_frame.bind("<Button-3>", make_menu_handler(session_id, slot_index))
+                event_frame.bind("<Double-Button-1>", make_edit_handler(session_id))
+                subject_label.bind("<Button-3>", make_menu_handler(session_id, slot_index))
+                subject_label.bind("<Double-Button-1>", make_edit_handler(session_id))
+                
+                # Add hover effect
+                def on_hover_enter(e, frame=event_frame, border=border):
+                    frame.config(highlightthickness=border + 1)
+                def on_hover_leave(e, frame=event_frame, border=border):
+                    frame.config(highlightthickness=border)
+                event_frame.bind("<Enter>", on_hover_enter)
+                event_frame.bind("<Leave>", on_hover_leave)
+                subject_label.bind("<Enter>", on_hover_enter)
+                subject_label.bind("<Leave>", on_hover_leave)
+
+                # Add a small visible options/delete button in the corner
+                try:
+                    del_btn = tk.Button(
                         event_frame,
-                        text=normalized_session.get("subject", ""),
+                        text="⋮",
                         bg=colour,
                         fg=self._get_contrast_color(colour),
+                        bd=0,
                         font=("Segoe UI", 10, "bold"),
-                        wraplength=120
+                        activebackground=self._darken_color(colour),
+                        cursor="hand2",
+                        command=lambda sid=session_id, sidx=slot_index: self._show_delete_popup(sid, sidx)
                     )
-                    subject_label.pack(expand=True, fill="both", padx=5, pady=2)
-                    # Attach metadata for callbacks
-                    session_id = str(normalized_session["id"])
-                    setattr(event_frame, "session_id", session_id)
-                    setattr(event_frame, "slot_index", slot_index)
-
-                    # Bind right-click to menu and double-click to edit directly
-                    def make_edit_handler(sid):
-                        return lambda e: self.edit_session_popup(sid)
-                    
-                    def make_menu_handler(sid, sidx):
-                        return lambda e: self._show_delete_popup(sid, sidx)
-
-                    event_frame.bind("<Button-3>", make_menu_handler(session_id, slot_index))
-                    event_frame.bind("<Double-Button-1>", make_edit_handler(session_id))
-                    subject_label.bind("<Button-3>", make_menu_handler(session_id, slot_index))
-                    subject_label.bind("<Double-Button-1>", make_edit_handler(session_id))
-                    
-                    # Add hover effect
-                    def on_hover_enter(e, frame=event_frame):
-                        frame.config(highlightthickness=3)
-                    def on_hover_leave(e, frame=event_frame):
-                        frame.config(highlightthickness=2)
-                    event_frame.bind("<Enter>", on_hover_enter)
-                    event_frame.bind("<Leave>", on_hover_leave)
-                    subject_label.bind("<Enter>", on_hover_enter)
-                    subject_label.bind("<Leave>", on_hover_leave)
-
-                    # Add a small visible options/delete button in the corner
-                    try:
-                        del_btn = tk.Button(
-                            event_frame,
-                            text="⋮",
-                            bg=colour,
-                            fg=self._get_contrast_color(colour),
-                            bd=0,
-                            font=("Segoe UI", 10, "bold"),
-                            activebackground=self._darken_color(colour),
-                            cursor="hand2",
-                            command=lambda sid=session_id, sidx=slot_index: self._show_delete_popup(sid, sidx)
-                        )
-                        del_btn.place(relx=0.85, rely=0.02, relwidth=0.13, relheight=0.20)
-                    except tk.TclError as exc:
-                        self._log_exception("Failed to create session options button", exc)
+                    del_btn.place(relx=0.85, rely=0.02, relwidth=0.13, relheight=0.20)
+                except tk.TclError as exc:
+                    self._log_exception("Failed to create session options button", exc)
+
+        self._prefetch_adjacent_weeks(monday)
+
+    def _schedule_search(self):
+        # Wait for a pause in typing instead of searching on every key
+        if self._search_job is not None:
+            self.root.after_cancel(self._search_job)
+        self._search_job = self.root.after(150, self._run_search)
+
+    def _run_search(self):
+        self._search_job = None
+        self.render_sessions()
+
+    def _clear_search(self):
+        self.search_var.set("")
+        self._run_search()
+
+    def _refresh_search(self, placed):
+        # Re-run the query on every render so edits show up in the matches
+        query = self.search_var.get().strip()
+        if not query:
+            self.search_matches = set()
+            self.search_label.config(text="")
+            return
+        self.search_matches = {session_id for session_id, _ in self.search_index.search(query)}
+        this_week = {session["id"] for session, _, _ in placed} & self.search_matches
+        self.search_label.config(text=f"{len(self.search_matches)} match(es), {len(this_week)} this week")
+
+    def _displayed_monday(self):
+        return week_start(offset=self.current_week_offset)
+
+    def _layout_key(self, monday):
+        return (self.store.version, monday, self.current_filter)
+
+    def _prefetch_adjacent_weeks(self, monday):
+        # Lay out the previous and next weeks on the worker thread so that
+        # flipping weeks only pays for drawing.
+        snapshot = self.store.sessions()
+        visible_ids = self._visible_ids()
+        for offset in range(-self.prefetch_radius, self.prefetch_radius + 1):
+            if offset == 0:
+                continue
+            neighbour = monday + timedelta(weeks=offset)
+            self.prefetcher.request(
+                self._layout_key(neighbour), snapshot, neighbour, self.time_slots, visible_ids
+            )
+
+    def _visible_ids(self):
+        # None means no filter; otherwise a frozenset that is safe to share with the prefetch thread
+        if self.current_filter is None:
+            return None
+        return self.filter_engine.matching_ids(self.current_filter)
+
+    def _week_sessions(self):
+        # Expanded weeks are memoized, so flipping back and forth is a cache hit.
+        return self.occurrence_cache.week(self.store, self._displayed_monday())
 
     def _darken_color(self, hex_color: str, factor: float = 0.7) -> str:
         try:
@@ -1015,16 +1291,17 @@ class StudyPlannerApp:
         except (AttributeError, ValueError):
             return "#000000"
 
+    @traced("dialog.show_delete_popup")
     def _show_delete_popup(self, session_id: str, slot_index: int):
         # Find the session object
-        session = next((s for s in self.sessions if s.get("id") == session_id), None)
+        session = self.store.get(session_id)
         if session is None:
             messagebox.showerror("Not found", "Session not found (it may have been deleted).")
             return
 
         popup = tk.Toplevel(self.root)
         popup.title("Session Options")
-        popup.geometry("340x270")
+        popup.geometry("340x370")
         popup.transient(self.root)
         popup.grab_set()
 
@@ -1041,11 +1318,21 @@ class StudyPlannerApp:
             popup.destroy()
             self._manage_session_tasks(session_id)
 
+        # Save as a template with all of the session's fields
+        def save_template():
+            popup.destroy()
+            self._save_session_as_template(session_id)
+
         # Remove this block only
         def remove_block():
             self._remove_block_from_session(session_id, slot_index)
             popup.destroy()
 
+        # Skip a single occurrence of a repeating session
+        def skip_week():
+            popup.destroy()
+            self._skip_occurrence(session_id)
+
         # Remove full session
         def remove_all():
             if messagebox.askyesno("Confirm Delete", "Delete this entire session?"):
@@ -1056,32 +1343,41 @@ class StudyPlannerApp:
                  bg=self.colors["button_bg"], fg="#ffffff", width=25, pady=8).pack(pady=3)
         tk.Button(popup, text="📝 Manage Tasks", command=manage_tasks, font=("Segoe UI", 10, "bold"),
                  bg="#27ae60", fg="#ffffff", width=25, pady=8).pack(pady=3)
+        tk.Button(popup, text="💾 Save as template", command=save_template, font=("Segoe UI", 10),
+                 width=25, pady=8).pack(pady=3)
         tk.Button(popup, text="🗑️ Remove this block", command=remove_block, font=("Segoe UI", 10),
                  width=25, pady=8).pack(pady=3)
+        if not is_one_off(session):
+            tk.Button(popup, text="⏭️ Skip this week only", command=skip_week, font=("Segoe UI", 10),
+                     width=25, pady=8).pack(pady=3)
         tk.Button(popup, text="❌ Remove entire session", command=remove_all, font=("Segoe UI", 10),
                  bg="#e74c3c", fg="#ffffff", width=25, pady=8).pack(pady=3)
         tk.Button(popup, text="Cancel", command=popup.destroy, font=("Segoe UI", 10),
                  width=25, pady=8).pack(pady=3)
 
     def _remove_session(self, session_id: str):
-        previous_sessions = list(self.sessions)
-        self.sessions = [s for s in self.sessions if s.get("id") != session_id]
-        if not self._safe_save_sessions(show_error=True):
-            self.sessions = previous_sessions
+        if session_id not in self.store:
             return
-        self.render_sessions()
+        self._apply_command(RemoveSessions([session_id]))
 
-    def _remove_block_from_session(self, session_id: str, slot_index: int):
-        session = next((s for s in self.sessions if s.get("id") == session_id), None)
+    def _skip_occurrence(self, session_id: str):
+        # Add the displayed week's date to the session's repeat exceptions.
+        session = self.store.get(session_id)
         if session is None:
             return
 
-        try:
-            s_min = self._parse_time_to_minutes(session.get("start", "00:00"))
-            e_min = self._parse_time_to_minutes(session.get("end", "00:00"))
-        except ValueError:
+        skipped_date = session_date(session, self._displayed_monday())
+        rule = dict(session.get("repeat") or {"start": skipped_date.isoformat(), "interval": 1})
+        rule["except"] = list(rule.get("except", [])) + [skipped_date.isoformat()]
+
+        self._apply_command(UpdateSession(session, dict(session, repeat=rule), label="skip week"))
+
+    def _remove_block_from_session(self, session_id: str, slot_index: int):
+        session = self.store.get(session_id)
+        if session is None:
             return
 
+        s_min, e_min = session.start_min, session.end_min
         block_start, block_end = self.time_slots[slot_index]
 
         # If the session is entirely within the block (or exactly equal) -> remove session
@@ -1112,49 +1408,20 @@ class StudyPlannerApp:
                 "color": session.get("color")
             })
 
-        # Replace original session with new parts (if any)
-        previous_sessions = list(self.sessions)
-        self.sessions = [s for s in self.sessions if s.get("id") != session_id]
-        self.sessions.extend(new_sessions)
-
-        if not self._safe_save_sessions(show_error=True):
-            self.sessions = previous_sessions
-            return
+        # Remainders keep the original repeat rule
+        if session.get("repeat"):
+            for part in new_sessions:
+                part["repeat"] = session["repeat"]
 
-        self.render_sessions()
+        # Replace original session with new parts (if any)
+        self._apply_command(SplitSession(session_id, new_sessions))
 
+    @traced("check_reminders")
     def _check_reminders(self):
         # Check for upcoming sessions and send reminders at 1 hour, 30 min, and start time.
         try:
-            now = datetime.now()
-            current_day = now.strftime("%A")
-            current_time_minutes = now.hour * 60 + now.minute
-
-            for session in self.sessions:
-                try:
-                    normalized_session = self._normalize_session(session)
-                except ValueError:
-                    continue
-
-                session_id = normalized_session.get("id")
-                if normalized_session.get("day") != current_day:
-                    continue
-
-                session_start_minutes = self._parse_time_to_minutes(normalized_session.get("start", "00:00"))
-                time_until = session_start_minutes - current_time_minutes
-
-                if session_id not in self.sent_reminders:
-                    self.sent_reminders[session_id] = set()
-
-                if 59 <= time_until <= 61 and '60min' not in self.sent_reminders[session_id]:
-                    self._send_reminder(normalized_session, "1 hour")
-                    self.sent_reminders[session_id].add('60min')
-                elif 29 <= time_until <= 31 and '30min' not in self.sent_reminders[session_id]:
-                    self._send_reminder(normalized_session, "30 minutes")
-                    self.sent_reminders[session_id].add('30min')
-                elif 0 <= time_until <= 1 and '0min' not in self.sent_reminders[session_id]:
-                    self._send_reminder(normalized_session, "now")
-                    self.sent_reminders[session_id].add('0min')
+            for session, time_label in self.reminders.due(self.store, datetime.now()):
+                self._send_reminder(session, time_label)
         except Exception as exc:
             self._log_exception("Reminder check failed", exc)
         finally:
@@ -1178,9 +1445,10 @@ class StudyPlannerApp:
         except tk.TclError as exc:
             self._log_exception("Reminder dialog failed", exc)
     
+    @traced("dialog.edit_session_popup")
     def edit_session_popup(self, session_id: str):
         # Open popup to edit an existing session.
-        session = next((s for s in self.sessions if s.get("id") == session_id), None)
+        session = self.store.get(session_id)
         if session is None:
             messagebox.showerror("Error", "Session not found.")
             return
@@ -1288,24 +1556,20 @@ class StudyPlannerApp:
                 return
 
             try:
-                normalized = self._normalize_session(candidate)
+                normalized = edit_session(session, candidate, self.days)
             except ValueError as exc:
                 messagebox.showerror("Invalid Session", str(exc))
                 return
 
-            previous_session = dict(session)
-            session.clear()
-            session.update(normalized)
+            current = self.store.get(session_id)
+            if current is None:
+                messagebox.showerror("Error", "This session no longer exists.")
+                popup.destroy()
+                return
 
-            try:
-                storage.save_sessions(self.sessions)
-                self.render_sessions()
+            if self._apply_command(UpdateSession(current, normalized)):
                 messagebox.showinfo("Saved", "Session updated successfully.")
                 popup.destroy()
-            except Exception as exc:
-                session.clear()
-                session.update(previous_session)
-                self._show_user_error("Save Error", "Could not save your changes.", exc)
 
         # Footer
         footer = tk.Frame(popup, bg="#ecf0f1", highlightthickness=1, highlightbackground="#dfe6e9")
@@ -1323,63 +1587,82 @@ class StudyPlannerApp:
                               bg="#95a5a6", fg="#ffffff", bd=0, padx=30, pady=12, cursor="hand2")
         cancel_btn.grid(row=0, column=1, sticky="ew", padx=(6, 0))
     
-    def _check_time_conflicts(self, days, start_str, end_str, exclude_id=None):
-        try:
-            new_start = self._parse_time_to_minutes(start_str)
-            new_end = self._parse_time_to_minutes(end_str)
-        except ValueError:
-            return []
-        
-        conflicts = []
-        for session in self.sessions:
-            if exclude_id and session.get("id") == exclude_id:
-                continue
-            if session.get("day") not in days:
-                continue
-            
-            try:
-                existing_start = self._parse_time_to_minutes(session.get("start", "00:00"))
-                existing_end = self._parse_time_to_minutes(session.get("end", "00:00"))
-            except ValueError:
-                continue
-            
-            # Check overlap
-            if new_start < existing_end and new_end > existing_start:
-                conflicts.append(
-                    f"{session.get('day')}: {session.get('subject')} "
-                    f"({session.get('start')}-{session.get('end')})"
-                )
-        
-        return conflicts
+    def _describe_conflicts(self, sessions):
+        return [
+            f"{session.get('day')}: {session.get('subject')} ({session.get('start')}-{session.get('end')})"
+            for session in sessions
+        ]
     
+    @traced("dialog.show_filter_dialog")
     def _show_filter_dialog(self):
-        # Show dialog to filter sessions by subject.
-        subjects = sorted(set(s.get("subject", "") for s in self.sessions if s.get("subject")))
+        # Show dialog to filter sessions by subject, day, colour and open tasks.
+        subjects = self.filter_engine.subjects()
         if not subjects:
             messagebox.showinfo("No Subjects", "No sessions to filter.")
             return
+        current = self.current_filter or SessionFilter()
         
         dialog = tk.Toplevel(self.root)
-        dialog.title("Filter by Subject")
-        dialog.geometry("300x400")
+        dialog.title("Filter Sessions")
+        dialog.geometry("520x520")
         dialog.transient(self.root)
         dialog.grab_set()
         
-        tk.Label(dialog, text="Select a subject to filter:", font=("Segoe UI", 11, "bold")).pack(pady=10)
+        tk.Label(dialog, text="Show sessions matching:", font=("Segoe UI", 11, "bold")).pack(pady=10)
+        
+        lists_frame = tk.Frame(dialog)
+        lists_frame.pack(fill="both", expand=True, padx=20)
+        
+        def make_list(column, title, values, selected):
+            tk.Label(lists_frame, text=title, font=("Segoe UI", 10, "bold")).grid(row=0, column=column, sticky="w")
+            listbox = tk.Listbox(lists_frame, font=("Segoe UI", 10), height=12, selectmode="multiple", exportselection=False)
+            listbox.grid(row=1, column=column, sticky="nsew", padx=4)
+            lists_frame.columnconfigure(column, weight=1)
+            for index, value in enumerate(values):
+                listbox.insert(tk.END, value)
+                if value in selected:
+                    listbox.selection_set(index)
+            return listbox
+        
+        colors = self.filter_engine.colors()
+        subject_list = make_list(0, "Subjects", subjects, current.subjects)
+        day_list = make_list(1, "Days", self.days, current.days)
+        color_list = make_list(2, "Colours", colors, current.colors)
+        for index, color in enumerate(colors):
+            try:
+                color_list.itemconfig(index, background=color, foreground=self._get_contrast_color(color))
+            except tk.TclError:
+                pass
+        
+        open_tasks_var = tk.BooleanVar(value=current.open_tasks)
+        tk.Checkbutton(dialog, text="Only sessions with open tasks", variable=open_tasks_var,
+                       font=("Segoe UI", 10)).pack(anchor="w", padx=20, pady=(10, 0))
         
-        listbox = tk.Listbox(dialog, font=("Segoe UI", 10), height=15)
-        listbox.pack(fill="both", expand=True, padx=20, pady=10)
+        match_var = tk.StringVar(value="all" if current.match_all else "any")
+        match_frame = tk.Frame(dialog)
+        match_frame.pack(anchor="w", padx=20, pady=5)
+        tk.Label(match_frame, text="Match:", font=("Segoe UI", 10)).pack(side="left")
+        tk.Radiobutton(match_frame, text="all of the above", variable=match_var, value="all").pack(side="left")
+        tk.Radiobutton(match_frame, text="any of the above", variable=match_var, value="any").pack(side="left")
         
-        for subject in subjects:
-            listbox.insert(tk.END, subject)
+        def selected(listbox):
+            return [listbox.get(index) for index in listbox.curselection()]
         
         def apply_filter():
-            selection = listbox.curselection()
-            if selection:
-                self.current_filter = listbox.get(selection[0])
-                self.filter_label.config(text=f"(Showing: {self.current_filter})")
-                self.render_sessions()
-                dialog.destroy()
+            session_filter = SessionFilter.create(
+                subjects=selected(subject_list),
+                days=selected(day_list),
+                colors=selected(color_list),
+                open_tasks=open_tasks_var.get(),
+                match_all=match_var.get() == "all",
+            )
+            dialog.destroy()
+            if session_filter.is_empty():
+                self._clear_filter()
+                return
+            self.current_filter = session_filter
+            self.filter_label.config(text=f"(Showing: {session_filter.describe()})")
+            self.render_sessions()
         
         tk.Button(dialog, text="Apply Filter", command=apply_filter, font=("Segoe UI", 10, "bold"),
                  bg=self.colors["button_bg"], fg="#ffffff", padx=20, pady=8).pack(pady=5)
@@ -1387,11 +1670,12 @@ class StudyPlannerApp:
                  font=("Segoe UI", 10)).pack(pady=5)
     
     def _clear_filter(self):
-        # Clear the current subject filter.
+        # Clear the current filter.
         self.current_filter = None
         self.filter_label.config(text="(All subjects)")
         self.render_sessions()
     
+    @traced("dialog.show_statistics")
     def _show_statistics(self):
         # Display statistics about study sessions.
         stats_window = tk.Toplevel(self.root)
@@ -1409,26 +1693,11 @@ class StudyPlannerApp:
         content = tk.Frame(stats_window, bg="#f5f5f5")
         content.pack(fill="both", expand=True, padx=20, pady=20)
         
-        # Calculate statistics
-        total_sessions = len(self.sessions)
-        subjects_count = len(set(s.get("subject") for s in self.sessions))
-        
-        # Total hours
-        total_minutes = 0
-        subject_minutes = defaultdict(int)
-        day_minutes = defaultdict(int)
-        
-        for session in self.sessions:
-            try:
-                start_minutes = self._parse_time_to_minutes(session.get("start", "00:00"))
-                end_minutes = self._parse_time_to_minutes(session.get("end", "00:00"))
-                duration = end_minutes - start_minutes
-                if duration > 0:
-                    total_minutes += duration
-                    subject_minutes[session.get("subject", "Unknown")] += duration
-                    day_minutes[session.get("day", "Unknown")] += duration
-            except ValueError:
-                continue
+        # Statistics are kept up to date by the aggregator on every change
+        total_sessions = self.stats.count
+        subjects_count = self.stats.subject_count
+        total_minutes = self.stats.total_minutes
+        subject_minutes = self.stats.subject_minutes
         
         total_hours = total_minutes / 60
         
@@ -1465,6 +1734,26 @@ class StudyPlannerApp:
         tk.Label(goal_frame, text=f"{progress:.0f}% Complete ({total_hours:.1f} / {goal_hours} hours)",
                 font=("Segoe UI", 10, "bold"), bg="#ffffff").pack()
         
+        # Insights from the analytics engine
+        analytics = self._analytics()
+        if len(analytics):
+            insights_frame = tk.LabelFrame(content, text="Insights", font=("Segoe UI", 12, "bold"),
+                                          bg="#ffffff", fg="#2c3e50", padx=20, pady=15)
+            insights_frame.pack(fill="x", pady=10)
+
+            lengths = analytics.percentiles((50, 90))
+            heat = analytics.heatmap()
+            busiest_day, busiest_hour = max(
+                ((day, hour) for day in range(7) for hour in range(24)),
+                key=lambda cell: heat[cell[0]][cell[1]]
+            )
+            tk.Label(insights_frame, text=f"Session Length: median {lengths[50]:.0f} min, 90th percentile {lengths[90]:.0f} min",
+                    font=("Segoe UI", 11), bg="#ffffff", anchor="w").pack(fill="x", pady=3)
+            tk.Label(insights_frame, text=f"Busiest Hour: {self.days[busiest_day]} {format_min(busiest_hour * 60)}",
+                    font=("Segoe UI", 11), bg="#ffffff", anchor="w").pack(fill="x", pady=3)
+            tk.Label(insights_frame, text=f"Longest Streak (next 8 weeks): {self._upcoming_streak()} day(s) in a row",
+                    font=("Segoe UI", 11), bg="#ffffff", anchor="w").pack(fill="x", pady=3)
+        
         # By subject
         subject_frame = tk.LabelFrame(content, text="Time by Subject", font=("Segoe UI", 12, "bold"),
                                      bg="#ffffff", fg="#2c3e50", padx=20, pady=15)
@@ -1483,6 +1772,22 @@ class StudyPlannerApp:
                  font=("Segoe UI", 11, "bold"), bg="#95a5a6", fg="#ffffff",
                  padx=30, pady=10).pack(pady=10)
     
+    def _analytics(self):
+        # Rebuild the columnar analytics view only when the schedule has changed.
+        if self._analytics_cache is None or self._analytics_cache[0] != self.store.version:
+            self._analytics_cache = (self.store.version, AnalyticsEngine.from_sessions(self.store))
+        return self._analytics_cache[1]
+
+    def _upcoming_streak(self) -> int:
+        # Streaks only make sense over real dates, so they are counted on the
+        # dates of the coming weeks and kept until the schedule or the date changes.
+        today = datetime.now().date()
+        key = (self.store.version, today)
+        if self._streak_cache is None or self._streak_cache[0] != key:
+            dates = occupied_dates(self.store, today, today + timedelta(weeks=8, days=-1))
+            self._streak_cache = (key, longest_streak(dates))
+        return self._streak_cache[1]
+    
     def _toggle_dark_mode(self):
         # Toggle between light and dark color schemes.
         self.dark_mode = not self.dark_mode
@@ -1525,39 +1830,52 @@ class StudyPlannerApp:
             self.current_week_offset += offset
         
         # Update week label
+        monday = self._displayed_monday()
+        date_range = f"{monday:%b %d} - {monday + timedelta(days=6):%b %d}"
         if self.current_week_offset == 0:
-            self.week_label.config(text="Current Week")
+            self.week_label.config(text=f"Current Week ({date_range})")
         elif self.current_week_offset > 0:
-            self.week_label.config(text=f"+{self.current_week_offset} Week{'s' if self.current_week_offset > 1 else ''}")
+            self.week_label.config(text=f"+{self.current_week_offset} Week{'s' if self.current_week_offset > 1 else ''} ({date_range})")
         else:
-            self.week_label.config(text=f"{self.current_week_offset} Week{'s' if self.current_week_offset < -1 else ''}")
+            self.week_label.config(text=f"{self.current_week_offset} Week{'s' if self.current_week_offset < -1 else ''} ({date_range})")
         
         self.render_sessions()
     
-    def _load_templates(self):
-        # Load session templates from file.
-        template_file = Path(__file__).parent / "session_templates.json"
+    def _templates(self):
         try:
-            with open(template_file, "r", encoding="utf-8") as f:
-                loaded = json.load(f)
-            if isinstance(loaded, list):
-                return [item for item in loaded if isinstance(item, dict)]
-            return []
-        except FileNotFoundError:
-            return []
+            return self.template_store.templates()
         except Exception as exc:
             self._log_exception("Template load failed", exc)
             return []
     
-    def _save_templates(self):
-        # Save session templates to file.
-        template_file = Path(__file__).parent / "session_templates.json"
+    def _save_template(self, template) -> bool:
         try:
-            with open(template_file, "w", encoding="utf-8") as f:
-                json.dump(self.session_templates, f, indent=2)
-        except Exception as e:
-            self._show_user_error("Template Error", "Could not save templates.", e)
+            self.template_store.save(template)
+            return True
+        except ValueError as exc:
+            messagebox.showerror("Template Error", str(exc))
+        except Exception as exc:
+            self._show_user_error("Template Error", "Could not save templates.", exc)
+        return False
     
+    def _save_session_as_template(self, session_id: str):
+        session = self.store.get(session_id)
+        if session is None:
+            return
+        name = simpledialog.askstring("Template Name", "Enter a name for this template:",
+                                      initialvalue=session["subject"])
+        if not name:
+            return
+        interval = 1
+        if is_one_off(session):
+            interval = 0
+        elif session.get("repeat"):
+            interval = session["repeat"].get("interval", 1)
+        template = {field: session[field] for field in ("subject", "day", "start", "end", "color", "notes", "tasks") if field in session}
+        if self._save_template(dict(template, name=name, interval=interval)):
+            messagebox.showinfo("Saved", f"Saved template \"{name}\".")
+    
+    @traced("dialog.manage_templates")
     def _manage_templates(self):
         # Dialog for managing session templates.
         dialog = tk.Toplevel(self.root)
@@ -1571,29 +1889,41 @@ class StudyPlannerApp:
         listbox = tk.Listbox(dialog, font=("Segoe UI", 10), height=10)
         listbox.pack(fill="both", expand=True, padx=20, pady=10)
         
-        for template in self.session_templates:
-            listbox.insert(tk.END, f"{template.get('name')} - {template.get('subject')}")
+        templates = []
+        
+        def refresh():
+            templates[:] = self._templates()
+            listbox.delete(0, tk.END)
+            for template in templates:
+                when = f" ({template['day']} {template['start']}-{template['end']})" if template.get("day") and template.get("start") else ""
+                listbox.insert(tk.END, f"{template.get('name')} - {template.get('subject', '')}{when}")
         
         def use_template():
             selection = listbox.curselection()
             if selection:
-                template = self.session_templates[selection[0]]
-                self.add_session_popup(template)
+                template = templates[selection[0]]
                 dialog.destroy()
+                self.add_session_popup(template)
         
         def save_new_template():
-            # Simple dialog to save current session as template
+            # Simple dialog to save a basic template; use "Save as template" on a session to keep all of its fields
             name = simpledialog.askstring("Template Name", "Enter a name for this template:", parent=dialog)
-            if name:
-                template = {
-                    "name": name,
-                    "subject": "New Subject",
-                    "duration": "1:30",
-                    "color": "#AED6F1"
-                }
-                self.session_templates.append(template)
-                self._save_templates()
-                listbox.insert(tk.END, f"{name} - New Subject")
+            if not name:
+                return
+            subject = simpledialog.askstring("Template Subject", "Subject for this template:", parent=dialog) or ""
+            if self._save_template({"name": name, "subject": subject, "duration": "1:30"}):
+                refresh()
+        
+        def delete_template():
+            selection = listbox.curselection()
+            if selection and messagebox.askyesno("Delete Template", "Delete this template?", parent=dialog):
+                try:
+                    self.template_store.delete(templates[selection[0]]["name"])
+                except Exception as exc:
+                    self._show_user_error("Template Error", "Could not delete the template.", exc)
+                refresh()
+        
+        refresh()
         
         btn_frame = tk.Frame(dialog)
         btn_frame.pack(pady=10)
@@ -1602,9 +1932,12 @@ class StudyPlannerApp:
                  bg=self.colors["button_bg"], fg="#ffffff", padx=15, pady=5).pack(side="left", padx=5)
         tk.Button(btn_frame, text="Save New", command=save_new_template, font=("Segoe UI", 10),
                  padx=15, pady=5).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="Delete", command=delete_template, font=("Segoe UI", 10),
+                 padx=15, pady=5).pack(side="left", padx=5)
         tk.Button(btn_frame, text="Close", command=dialog.destroy, font=("Segoe UI", 10),
                  padx=15, pady=5).pack(side="left", padx=5)
     
+    @traced("dialog.manage_goals")
     def _manage_goals(self):
         # Dialog for setting study goals.
         dialog = tk.Toplevel(self.root)
@@ -1638,6 +1971,276 @@ class StudyPlannerApp:
         tk.Button(dialog, text="Save Goals", command=save_goals, font=("Segoe UI", 11, "bold"),
                  bg=self.colors["button_bg"], fg="#ffffff", padx=30, pady=10).pack(pady=10)
     
+    @traced("dialog.auto_schedule")
+    def _auto_schedule(self):
+        # Dialog for planning a week of study blocks from per-subject targets.
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Auto-Schedule Week")
+        dialog.geometry("460x640")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        tk.Label(dialog, text="Auto-Schedule Week", font=("Segoe UI", 14, "bold")).pack(pady=(15, 5))
+        tk.Label(dialog, text="Weekly hours per subject, including sessions you already have.",
+                 font=("Segoe UI", 9), fg="#7f8c8d").pack()
+        
+        frame = tk.Frame(dialog)
+        frame.pack(fill="both", expand=True, padx=20, pady=10)
+        
+        subject_hours = self.study_goals.setdefault("subject_hours", {})
+        hour_vars = {}
+        row = 0
+        for row, subject in enumerate(sorted(set(self.filter_engine.subjects()) | set(subject_hours))):
+            tk.Label(frame, text=subject, font=("Segoe UI", 10)).grid(row=row, column=0, sticky="w", pady=2)
+            hour_vars[subject] = tk.StringVar(value=str(subject_hours.get(subject, "")))
+            tk.Entry(frame, textvariable=hour_vars[subject], width=8).grid(row=row, column=1, padx=10, pady=2)
+        
+        new_subject_var = tk.StringVar()
+        new_hours_var = tk.StringVar()
+        tk.Entry(frame, textvariable=new_subject_var, width=18).grid(row=row + 1, column=0, sticky="w", pady=(10, 2))
+        tk.Entry(frame, textvariable=new_hours_var, width=8).grid(row=row + 1, column=1, padx=10, pady=(10, 2))
+        tk.Label(frame, text="(new subject)", font=("Segoe UI", 9), fg="#7f8c8d").grid(row=row + 1, column=2, sticky="w")
+        
+        options = tk.Frame(dialog)
+        options.pack(pady=5)
+        tk.Label(options, text="Block length (min):").grid(row=0, column=0, sticky="e")
+        min_block_var = tk.StringVar(value="30")
+        max_block_var = tk.StringVar(value="90")
+        tk.Entry(options, textvariable=min_block_var, width=5).grid(row=0, column=1, padx=4)
+        tk.Label(options, text="to").grid(row=0, column=2)
+        tk.Entry(options, textvariable=max_block_var, width=5).grid(row=0, column=3, padx=4)
+        one_off_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(options, text="This week only (otherwise every week)", variable=one_off_var).grid(
+            row=1, column=0, columnspan=4, sticky="w", pady=5)
+        
+        def read_targets():
+            targets = {}
+            entries = [(subject, var.get()) for subject, var in hour_vars.items()]
+            if new_subject_var.get().strip():
+                entries.append((new_subject_var.get().strip(), new_hours_var.get()))
+            for subject, value in entries:
+                if not str(value).strip():
+                    continue
+                hours = float(value)
+                if hours < 0:
+                    raise ValueError
+                targets[subject] = hours
+            return targets
+        
+        def plan():
+            try:
+                targets = read_targets()
+                min_block = int(min_block_var.get())
+                max_block = int(max_block_var.get())
+                if min_block <= 0 or max_block < min_block:
+                    raise ValueError
+            except (TypeError, ValueError):
+                messagebox.showerror("Error", "Please enter positive numbers for hours and block lengths.", parent=dialog)
+                return
+            if not any(targets.values()):
+                messagebox.showerror("Error", "Enter weekly hours for at least one subject.", parent=dialog)
+                return
+            
+            # Plan around the sessions that occur in the week on screen
+            monday = self._displayed_monday()
+            load = {}
+            for session in self.occurrence_cache.week(self.store, monday):
+                by_day = load.setdefault(session["subject"], {})
+                by_day[session["day"]] = by_day.get(session["day"], 0) + session.end_min - session.start_min
+            
+            subject_hours.clear()
+            subject_hours.update({subject: hours for subject, hours in targets.items() if hours})
+            result = plan_week(
+                # Sessions already in the calendar count towards the targets
+                {subject: int(hours * 60) - sum(load.get(subject, {}).values())
+                 for subject, hours in targets.items()},
+                {day: self.free_slots.occupied(day, monday) for day in self.days},
+                earliest=self.time_slots[0][0],
+                latest=self.time_slots[-1][1],
+                min_block=min_block,
+                max_block=max_block,
+                load=load,
+            )
+            self._preview_schedule(result, one_off_var.get(), dialog)
+        
+        tk.Button(dialog, text="Plan Week", command=plan, font=("Segoe UI", 11, "bold"),
+                 bg=self.colors["button_bg"], fg="#ffffff", padx=30, pady=10).pack(pady=10)
+    
+    def _preview_schedule(self, plan, one_off, parent):
+        # Show a planned week and add it in one go if accepted.
+        if not plan.blocks:
+            messagebox.showinfo("No Free Time", "There is no free time left in the calendar for these targets.", parent=parent)
+            return
+        
+        preview = tk.Toplevel(parent)
+        preview.title("Planned Sessions")
+        preview.geometry("420x480")
+        preview.transient(parent)
+        preview.grab_set()
+        
+        tk.Label(preview, text=f"{len(plan)} planned session(s)", font=("Segoe UI", 12, "bold")).pack(pady=10)
+        listbox = tk.Listbox(preview, font=("Segoe UI", 10), height=15)
+        listbox.pack(fill="both", expand=True, padx=20)
+        for block in plan.blocks:
+            listbox.insert(tk.END, f"{block.day}  {format_min(block.start)}-{format_min(block.end)}  {block.subject}")
+        
+        if plan.shortfall:
+            missing = ", ".join(f"{subject} ({minutes} min)" for subject, minutes in sorted(plan.shortfall.items()))
+            tk.Label(preview, text=f"Did not fit: {missing}", fg="#e74c3c", wraplength=380,
+                     font=("Segoe UI", 9)).pack(pady=5)
+        
+        def accept():
+            if self._add_planned_sessions(plan, one_off):
+                preview.destroy()
+                parent.destroy()
+        
+        buttons = tk.Frame(preview)
+        buttons.pack(pady=10)
+        tk.Button(buttons, text=f"Add {len(plan)} Sessions", command=accept, font=("Segoe UI", 10, "bold"),
+                 bg=self.colors["button_bg"], fg="#ffffff", padx=15, pady=5).pack(side="left", padx=5)
+        tk.Button(buttons, text="Cancel", command=preview.destroy, font=("Segoe UI", 10),
+                 padx=15, pady=5).pack(side="left", padx=5)
+    
+    def _add_planned_sessions(self, plan, one_off) -> bool:
+        # Repeat rules are anchored on the week currently on screen, as in the add dialog
+        monday = self._displayed_monday()
+        new_sessions = []
+        for block in plan.blocks:
+            first_date = session_date({"day": block.day}, monday)
+            new_sessions.append(self._normalize_session({
+                "id": str(uuid.uuid4()),
+                "subject": block.subject,
+                "day": block.day,
+                "start": format_min(block.start),
+                "end": format_min(block.end),
+                "color": self.subject_trie.color_for(block.subject) or "",
+                "repeat": one_off_rule(first_date) if one_off else {"start": first_date.isoformat(), "interval": 1},
+            }))
+        
+        if not self._add_sessions(new_sessions):
+            return False
+        messagebox.showinfo("Saved", f"Added {len(new_sessions)} planned session(s).")
+        return True
+    
+    def _add_sessions(self, new_sessions) -> bool:
+        # Add a batch of sessions as one undoable change, with one save and one render.
+        # add_many checks the whole batch first, so a bad session adds nothing.
+        return self._apply_command(AddSessions(new_sessions, label="add sessions" if len(new_sessions) > 1 else "add session"))
+    
+    def _apply_command(self, command) -> bool:
+        # Every change to the schedule goes through the history so it can be undone.
+        # If the save fails the command is reverted and dropped.
+        if self._loading:
+            messagebox.showinfo("Loading", "Your schedule is still loading. Please try again in a moment.")
+            return False
+        try:
+            self.history.execute(command)
+        except (KeyError, ValueError) as exc:
+            messagebox.showerror("Invalid Session", str(exc))
+            return False
+        
+        try:
+            if not self._safe_save_sessions(show_error=True):
+                self.history.discard()
+                return False
+        except storage.VersionConflictError:
+            if not self._replay_on_saved_schedule(command):
+                return False
+        
+        self.render_sessions()
+        self._update_undo_menu()
+        return True
+    
+    def _reload_saved_schedule(self):
+        # Replace the schedule with what is on disk; the undo history no longer applies to it.
+        sessions, version = storage.read_schedule()
+        cleaned, errors = sanitize_sessions(sessions)
+        self._report_skipped_sessions(errors, source="saved schedule")
+        self.store.reset(cleaned)
+        self.history.clear()
+        self._file_version = version
+    
+    def _replay_on_saved_schedule(self, command) -> bool:
+        # Another program (a second window, the CLI or the API server) saved in the meantime.
+        # Load its version and apply this change again on top, so that neither change is lost.
+        for _ in range(3):
+            try:
+                self._reload_saved_schedule()
+            except Exception as exc:
+                self._show_user_error("Save Error", "Your changes could not be saved to disk. Please try again.", exc)
+                break
+            try:
+                self.history.execute(command)
+            except (KeyError, ValueError) as exc:
+                self._show_user_error(
+                    "Save Conflict",
+                    "Your schedule was changed by another program at the same time, and this change no longer "
+                    "fits it. The latest saved schedule has been loaded.",
+                    exc,
+                )
+                break
+            try:
+                if self._safe_save_sessions(show_error=True):
+                    return True
+            except storage.VersionConflictError:
+                self.history.discard()
+                continue
+            self.history.discard()
+            break
+        
+        self.render_sessions()
+        self._update_undo_menu()
+        return False
+    
+    def _undo(self):
+        self._step_history(self.history.undo, self.history.redo)
+    
+    def _redo(self):
+        self._step_history(self.history.redo, self.history.undo)
+    
+    def _step_history(self, step, opposite):
+        try:
+            command = step()
+        except (KeyError, ValueError) as exc:
+            # The schedule no longer matches the history, so it cannot be replayed safely
+            self.history.clear()
+            self._update_undo_menu()
+            self._show_user_error("Undo Error", "That change can no longer be undone.", exc)
+            return
+        if command is None:
+            return
+        try:
+            saved = self._safe_save_sessions(show_error=True)
+        except storage.VersionConflictError as exc:
+            try:
+                self._reload_saved_schedule()
+            except Exception:
+                opposite()
+            self._show_user_error(
+                "Undo Error",
+                "Your schedule was changed by another program, so that change can no longer be undone. "
+                "The latest saved schedule has been loaded.",
+                exc,
+            )
+            self.render_sessions()
+            self._update_undo_menu()
+            return
+        if not saved:
+            opposite()
+            return
+        self.render_sessions()
+        self._update_undo_menu()
+    
+    def _update_undo_menu(self):
+        undo_label = self.history.undo_label()
+        redo_label = self.history.redo_label()
+        self.edit_menu.entryconfig(
+            0, label=f"Undo {undo_label}" if undo_label else "Undo", state="normal" if undo_label else "disabled"
+        )
+        self.edit_menu.entryconfig(
+            1, label=f"Redo {redo_label}" if redo_label else "Redo", state="normal" if redo_label else "disabled"
+        )
+    
     def _export_json(self):
         # Export sessions to JSON file.
         try:
@@ -1648,11 +2251,53 @@ class StudyPlannerApp:
             )
             if file_path:
                 with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(self._sanitize_sessions(self.sessions), f, indent=2)
+                    json.dump(self.sessions, f, indent=2)
                 messagebox.showinfo("Export Successful", f"Sessions exported to {file_path}")
         except Exception as exc:
             self._show_user_error("Export Error", "Could not export your schedule.", exc)
     
+    def _export_ics(self):
+        # Export sessions as an iCalendar file for other calendar apps.
+        try:
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".ics",
+                filetypes=[("iCalendar files", "*.ics"), ("All files", "*.*")],
+                title="Export Calendar"
+            )
+            if file_path:
+                events = write_ics(self.store, file_path)
+                messagebox.showinfo("Export Successful", f"{events} session(s) exported to {file_path}")
+        except Exception as exc:
+            self._show_user_error("Export Error", "Could not export your calendar.", exc)
+    
+    def _export_csv(self):
+        # Export sessions as CSV for spreadsheets.
+        try:
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+                title="Export Sessions"
+            )
+            if file_path:
+                count = write_csv(self.store, file_path)
+                messagebox.showinfo("Export Successful", f"{count} session(s) exported to {file_path}")
+        except Exception as exc:
+            self._show_user_error("Export Error", "Could not export your schedule.", exc)
+    
+    def _import_csv(self):
+        # Import sessions from a CSV file (one row per session, header required).
+        try:
+            file_path = filedialog.askopenfilename(
+                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+                title="Import Sessions"
+            )
+            if not file_path:
+                return
+
+            self._run_import(ImportJob(file_path, self._normalize_session, records=iter_csv_records))
+        except Exception as exc:
+            self._show_user_error("Import Error", "Could not import sessions from that file.", exc)
+    
     def _import_json(self):
         # Import sessions from JSON file.
         try:
@@ -1663,32 +2308,90 @@ class StudyPlannerApp:
             if not file_path:
                 return
 
-            with open(file_path, "r", encoding="utf-8") as f:
-                imported = json.load(f)
+            self._run_import(ImportJob(file_path, self._normalize_session))
+        except Exception as exc:
+            self._show_user_error("Import Error", "Could not import sessions from that file.", exc)
 
-            if not isinstance(imported, list):
-                messagebox.showerror("Import Error", "This file does not contain a valid session list.")
-                return
+    def _run_import(self, job):
+        # Parse and validate on a worker thread while a progress dialog stays responsive.
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Importing Sessions")
+        dialog.geometry("400x170")
+        dialog.resizable(False, False)
+        dialog.transient(self.root)
+        dialog.grab_set()
 
-            cleaned_import = self._sanitize_sessions(imported, source="import file")
-            skipped = len(imported) - len(cleaned_import)
-            if not cleaned_import:
-                messagebox.showerror("Import Error", "No valid sessions were found in that file.")
-                return
+        status_label = tk.Label(dialog, text="Reading file...", font=("Segoe UI", 10))
+        status_label.pack(pady=(20, 10))
 
-            previous_sessions = list(self.sessions)
-            self.sessions.extend(cleaned_import)
-            if not self._safe_save_sessions(show_error=True):
-                self.sessions = previous_sessions
+        progress_bar = ttk.Progressbar(dialog, mode="determinate", maximum=100, length=340)
+        progress_bar.pack(padx=20)
+
+        cancel_btn = tk.Button(dialog, text="Cancel", command=job.cancel, font=("Segoe UI", 10),
+                               padx=20, pady=5)
+        cancel_btn.pack(pady=15)
+        dialog.protocol("WM_DELETE_WINDOW", job.cancel)
+
+        def poll():
+            for kind, payload in job.poll():
+                if kind == "progress":
+                    fraction, accepted, skipped = payload
+                    progress_bar["value"] = fraction * 100
+                    status_label.config(text=f"Checked {accepted + skipped} session(s)...")
+                    continue
+
+                dialog.destroy()
+                if kind == "done":
+                    self._commit_import(payload)
+                elif kind == "cancelled":
+                    messagebox.showinfo("Import Cancelled", "The import was cancelled. Nothing was changed.")
+                else:
+                    self._show_user_error("Import Error", "Could not import sessions from that file.", payload)
                 return
+            self.root.after(50, poll)
 
-            self.render_sessions()
-            summary = f"Imported {len(cleaned_import)} session(s)."
-            if skipped:
-                summary += f" Skipped {skipped} invalid session(s)."
-            messagebox.showinfo("Import Successful", summary)
-        except Exception as exc:
-            self._show_user_error("Import Error", "Could not import sessions from that file.", exc)
+        job.start()
+        self.root.after(50, poll)
+
+    def _commit_import(self, result):
+        # Upsert a finished import into the schedule in one step with a single save.
+        for number, message in result.errors:
+            self._log_exception("Invalid session skipped from import file", ValueError(f"entry {number}: {message}"))
+
+        if not result.sessions:
+            details = "\n".join(f"• Entry {number}: {message}" for number, message in result.errors[:5])
+            messagebox.showerror("Import Error", f"No valid sessions were found in that file.\n\n{details}".strip())
+            return
+
+        merge = merge_sessions(self.store, result.sessions, find_near_duplicates=True)
+        if not merge.inserted and not merge.updated:
+            messagebox.showinfo("Nothing to Import", "Every session in that file is already in your schedule.")
+            return
+
+        command = CompositeCommand(
+            [AddSessions(merge.inserted)]
+            + [UpdateSession(self.store.get(session["id"]), session) for session in merge.updated],
+            label="import",
+        )
+        if not self._apply_command(command):
+            return
+
+        summary = (
+            f"Inserted {len(merge.inserted)} new session(s), updated {len(merge.updated)} "
+            f"and skipped {merge.skipped} duplicate(s)."
+        )
+        if result.skipped:
+            summary += f"\nSkipped {result.skipped} invalid session(s):\n"
+            summary += "\n".join(f"• Entry {number}: {message}" for number, message in result.errors[:5])
+            if result.skipped > 5:
+                summary += f"\n• ...and {result.skipped - 5} more (see the error log)"
+        if merge.near_duplicates:
+            examples = "\n".join(
+                f"• {new['subject']} {new['day']} {new['start']}-{new['end']} overlaps {old['start']}-{old['end']}"
+                for new, old in merge.near_duplicates[:5]
+            )
+            summary += f"\n\n{len(merge.near_duplicates)} imported session(s) look like near-duplicates:\n{examples}"
+        messagebox.showinfo("Import Successful", summary)
     
     def _break_reminder_settings(self):
         # Dialog for break reminder configuration.
@@ -1737,9 +2440,12 @@ class StudyPlannerApp:
             ("Ctrl+E", "Export sessions"),
             ("Ctrl+S", "Show statistics"),
             ("Ctrl+D", "Toggle dark mode"),
-            ("Ctrl+F", "Filter by subject"),
+            ("Ctrl+F", "Filter sessions"),
+            ("Ctrl+K", "Search sessions"),
             ("Ctrl+Left", "Previous week"),
             ("Ctrl+Right", "Next week"),
+            ("Ctrl+Z", "Undo"),
+            ("Ctrl+Y", "Redo"),
             ("Delete", "Delete selected session"),
             ("Double-click session", "Edit session"),
             ("Right-click session", "Context menu"),
@@ -1753,6 +2459,30 @@ class StudyPlannerApp:
         tk.Button(dialog, text="Close", command=dialog.destroy, font=("Segoe UI", 11),
                  padx=30, pady=8).pack(pady=10)
     
+    def _toggle_tracing(self):
+        tracer.enabled = bool(self.tracing_var.get())
+    
+    def _export_trace(self):
+        # Save the recorded spans as Chrome trace JSON (open in chrome://tracing or ui.perfetto.dev).
+        if not len(tracer):
+            messagebox.showinfo(
+                "No Trace",
+                "No performance trace has been recorded yet.\n\n"
+                "Turn on Help > Record Performance Trace, use the app, then export again."
+            )
+            return
+        try:
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".json",
+                filetypes=[("Trace files", "*.json"), ("All files", "*.*")],
+                initialfile="study_planner_trace.json",
+            )
+            if file_path:
+                count = tracer.export_chrome(file_path)
+                messagebox.showinfo("Trace Exported", f"Exported {count} span(s) to:\n{file_path}")
+        except Exception as exc:
+            self._show_user_error("Export Error", "Could not export the performance trace.", exc)
+    
     def _show_about(self):
         # Display about dialog.
         messagebox.showinfo(
@@ -1766,23 +2496,24 @@ class StudyPlannerApp:
             "• Dark mode & multi-week view\n"
             "• Session templates & notes\n"
             "• Export/Import capabilities\n\n"
-            "Built with Python & Tkinter"
+            "Built with Python & Tkinter\n\n"
+            f"Startup: {self.startup_timer.report()}"
         )
     
     def _delete_selected_session(self):
         # Delete currently selected/focused session (placeholder for future selection feature).
         messagebox.showinfo("Delete Session", "Right-click or double-click a session on the calendar to delete or edit it.")
     
+    @traced("dialog.manage_session_tasks")
     def _manage_session_tasks(self, session_id: str):
         # Manage tasks/checklist for a specific session.
-        session = next((s for s in self.sessions if s.get("id") == session_id), None)
+        session = self.store.get(session_id)
         if session is None:
             messagebox.showerror("Error", "Session not found.")
             return
         
-        # Initialize tasks if not exists
-        if "tasks" not in session:
-            session["tasks"] = []
+        # Work on a copy; changes go back to the store as a replaced session
+        tasks = [dict(task) for task in session.get("tasks", [])]
         
         dialog = tk.Toplevel(self.root)
         dialog.title(f"Tasks for {session.get('subject', 'Session')}")
@@ -1843,7 +2574,7 @@ class StudyPlannerApp:
             task_vars.clear()
             
             # Add each task
-            for i, task in enumerate(session["tasks"]):
+            for i, task in enumerate(tasks):
                 task_frame = tk.Frame(scrollable_frame, bg="#ffffff", pady=5)
                 task_frame.pack(fill="x", padx=5, pady=2)
                 
@@ -1881,24 +2612,35 @@ class StudyPlannerApp:
                 )
                 del_btn.pack(side="right")
         
+        def save_tasks(new_tasks):
+            # Returns False, after closing the dialog, if the session is gone
+            current = self.store.get(session_id)
+            if current is not None:
+                self._apply_command(UpdateSession(current, dict(current, tasks=new_tasks), label="update tasks"))
+                # Replaying a save that raced another program can remove the session
+                current = self.store.get(session_id)
+            if current is None:
+                messagebox.showerror("Error", "This session no longer exists.", parent=dialog)
+                dialog.destroy()
+                return False
+            tasks[:] = [dict(task) for task in current.get("tasks", [])]
+            return True
+
         def toggle_task(idx, var):
-            session["tasks"][idx]["completed"] = var.get()
-            self._safe_save_sessions(show_error=True)
+            new_tasks = [dict(task) for task in tasks]
+            new_tasks[idx]["completed"] = var.get()
+            save_tasks(new_tasks)
         
         def delete_task(idx):
-            if messagebox.askyesno("Delete Task", "Remove this task?"):
-                session["tasks"].pop(idx)
-                self._safe_save_sessions(show_error=True)
+            if messagebox.askyesno("Delete Task", "Remove this task?") and save_tasks(tasks[:idx] + tasks[idx + 1:]):
                 render_tasks()
         
         def add_task():
             task_text = simpledialog.askstring("New Task", "Enter task description:", parent=dialog)
-            if task_text:
-                session["tasks"].append({
-                    "text": task_text,
-                    "completed": False
-                })
-                self._safe_save_sessions(show_error=True)
+            if task_text and save_tasks(tasks + [{
+                "text": task_text,
+                "completed": False
+            }]):
                 render_tasks()
         
         render_tasks()
@@ -1927,6 +2669,7 @@ class StudyPlannerApp:
             pady=8
         ).pack(pady=5)
     
+    @traced("dialog.show_archive")
     def _show_archive(self):
         # Show archived/past sessions.
         # Filter sessions that are in the past (for simplicity, show all sessions with date/week info)
@@ -1987,13 +2730,8 @@ class StudyPlannerApp:
         
         # Populate with sessions
         for session in sorted(self.sessions, key=lambda s: (s.get("day", ""), s.get("start", ""))):
-            try:
-                start_minutes = self._parse_time_to_minutes(session.get("start", "00:00"))
-                end_minutes = self._parse_time_to_minutes(session.get("end", "00:00"))
-                duration_mins = end_minutes - start_minutes
-                duration_str = f"{duration_mins // 60}h {duration_mins % 60}m"
-            except ValueError:
-                duration_str = "N/A"
+            duration_mins = session.end_min - session.start_min
+            duration_str = f"{duration_mins // 60}h {duration_mins % 60}m"
             
             notes = session.get("notes", "")[:50] + ("..." if len(session.get("notes", "")) > 50 else "")
             
@@ -2006,7 +2744,7 @@ class StudyPlannerApp:
             ))
         
         # Stats
-        stats_text = f"Total sessions: {len(self.sessions)} • Subjects: {len(set(s.get('subject') for s in self.sessions))}"
+        stats_text = f"Total sessions: {self.stats.count} • Subjects: {self.stats.subject_count}"
         tk.Label(
             dialog,
             text=stats_text,
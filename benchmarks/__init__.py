@@ -0,0 +1,5 @@
+"""Timing benchmarks over synthetic schedules.
+
+Run ``python -m study_planner.benchmarks`` to time the hot paths at
+several schedule sizes and optionally compare against a saved baseline.
+"""
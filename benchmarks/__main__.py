@@ -0,0 +1,10 @@
+import sys
+
+try:
+    from .runner import main
+except Exception:
+    from benchmarks.runner import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
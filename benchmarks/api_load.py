@@ -0,0 +1,137 @@
+import asyncio
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .. import storage
+    from ..api_server import ApiServer
+    from .generator import generate_sessions
+except Exception:
+    import storage
+    from api_server import ApiServer
+    from benchmarks.generator import generate_sessions
+
+
+# (method, path) pairs the clients pick from; most traffic is reads, as with real widgets and dashboards
+READS = (
+    "/health",
+    "/sessions?day=Monday",
+    "/stats",
+    "/free-slots?length=60&limit=5",
+    "/conflicts?day=Tuesday&start=16:00&end=17:00",
+)
+
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str,
+                   method: str, path: str, body: Optional[Dict] = None) -> Tuple[int, bytes]:
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length) if length else b""
+
+
+async def _client(host: str, port: int, requests: int, write_ratio: float, rng: random.Random,
+                  latencies: List[float], errors: List[int]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    address = f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+    try:
+        for _ in range(requests):
+            if rng.random() < write_ratio:
+                start = rng.randrange(6 * 60, 22 * 60, 15)
+                method, path = "POST", "/sessions?force=1"
+                body = {"subject": "Load test", "day": rng.choice(("Saturday", "Sunday")),
+                        "start": f"{start // 60:02d}:{start % 60:02d}", "end": f"{start // 60 + 1:02d}:{start % 60:02d}"}
+            else:
+                method, path, body = "GET", rng.choice(READS), None
+            started = time.perf_counter()
+            status, _ = await _request(reader, writer, address, method, path, body)
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, clients: int = 16, requests: int = 200,
+                   write_ratio: float = 0.0, seed: int = 0) -> Dict:
+    """Send ``requests`` requests from each of ``clients`` keep-alive connections and summarize the timings."""
+    latencies: List[float] = []
+    errors: List[int] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, requests, write_ratio, random.Random(seed + number), latencies, errors)
+        for number in range(clients)
+    ))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def percentile(q: float) -> float:
+        return latencies[min(len(latencies) - 1, int(q / 100 * len(latencies)))] * 1000 if latencies else 0.0
+
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(50),
+        "p99_ms": percentile(99),
+    }
+
+
+async def run_local(sessions: int = 10_000, clients: int = 16, requests: int = 200,
+                    write_ratio: float = 0.0, seed: int = 0) -> Dict:
+    """Serve a synthetic schedule from a temporary file and load test it in-process."""
+    with tempfile.TemporaryDirectory(prefix="study_planner_api_") as directory:
+        path = Path(directory) / "sessions.json"
+        storage.save_sessions(generate_sessions(sessions, seed=seed), path)
+        server = ApiServer(path)
+        port = await server.start("127.0.0.1", 0)
+        try:
+            result = await run_load("127.0.0.1", port, clients, requests, write_ratio, seed)
+        finally:
+            await server.close()
+        result["cache_hits"] = server.cache_hits
+        return result
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m study_planner.benchmarks.api_load",
+                                     description="Measure API server throughput with concurrent keep-alive clients.")
+    parser.add_argument("--url", help="host:port of a running server (default: start one on a synthetic schedule)")
+    parser.add_argument("--sessions", type=int, default=10_000, help="size of the synthetic schedule")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--write-ratio", type=float, default=0.0, help="fraction of requests that add a session")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.url:
+        host, _, port = args.url.rpartition(":")
+        result = asyncio.run(run_load(host or "127.0.0.1", int(port), args.clients, args.requests,
+                                      args.write_ratio, args.seed))
+    else:
+        result = asyncio.run(run_local(args.sessions, args.clients, args.requests, args.write_ratio, args.seed))
+    print(json.dumps(result, indent=2))
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
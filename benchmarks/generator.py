@@ -0,0 +1,74 @@
+import random
+from typing import Dict, List, Optional
+
+try:
+    from ..time_utils import DAYS, format_min
+except Exception:
+    from time_utils import DAYS, format_min
+
+
+PALETTE = ("#AED6F1", "#F5B7B1", "#A9DFBF", "#F9E79F", "#D7BDE2", "#FAD7A0", "#A3E4D7", "#D5DBDB")
+WORDS = (
+    "read", "chapter", "revise", "notes", "past", "paper", "questions", "essay", "draft",
+    "lab", "report", "flashcards", "summary", "problem", "set", "review", "quiz", "outline",
+)
+
+# Sessions start between 06:00 and 22:00 on a 15 minute grid
+EARLIEST = 6 * 60
+LATEST = 22 * 60
+
+
+def subject_name(index: int) -> str:
+    return f"Subject {index:03d}"
+
+
+def generate_sessions(count: int, seed: int = 0, subjects: int = 12, overlap: float = 0.1,
+                      notes_words: int = 8, tasks: int = 2, task_words: int = 4,
+                      min_length: int = 30, max_length: int = 120,
+                      rng: Optional[random.Random] = None) -> List[Dict]:
+    """Return ``count`` raw session dicts in the saved-file format.
+
+    The same arguments always give the same schedule. ``overlap`` is the
+    chance that a session is placed on top of the one before it rather
+    than at a random day and time; ``notes_words``, ``tasks`` and
+    ``task_words`` set the size of the free-text fields.
+    """
+    if count < 0:
+        raise ValueError("Session count cannot be negative.")
+    if subjects < 1:
+        raise ValueError("At least one subject is required.")
+    if not 0 <= overlap <= 1:
+        raise ValueError("Overlap must be between 0 and 1.")
+
+    rng = rng or random.Random(seed)
+    lengths = range(min_length, max_length + 1, 15)
+    sessions = []
+    previous = None
+    for _ in range(count):
+        length = rng.choice(lengths)
+        if previous is not None and rng.random() < overlap:
+            day = previous[0]
+            start = rng.randrange(previous[1], previous[2], 15)
+        else:
+            day = rng.choice(DAYS)
+            start = rng.randrange(EARLIEST, LATEST - length + 1, 15)
+        end = min(start + length, 24 * 60 - 1)
+        previous = (day, start, end)
+
+        subject = rng.randrange(subjects)
+        session = {
+            "id": f"{rng.getrandbits(128):032x}",
+            "subject": subject_name(subject),
+            "day": day,
+            "start": format_min(start),
+            "end": format_min(end),
+            "color": PALETTE[subject % len(PALETTE)],
+            "notes": " ".join(rng.choices(WORDS, k=notes_words)),
+        }
+        if tasks:
+            session["tasks"] = [
+                {"text": " ".join(rng.choices(WORDS, k=task_words)), "completed": rng.random() < 0.5}
+                for _ in range(tasks)
+            ]
+        sessions.append(session)
+    return sessions
@@ -0,0 +1,198 @@
+import gc
+import os
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    from ..conflicts import ConflictIndex
+    from ..filter_engine import FilterEngine
+    from ..free_slots import FreeSlotFinder
+    from ..layout import layout_week
+    from ..reminders import ReminderTracker
+    from ..search_index import SearchIndex
+    from ..session_stats import StatsAggregator
+    from ..session_store import SessionStore
+    from ..storage import load_sessions
+    from ..subject_trie import SubjectTrie
+    from ..validation import sanitize_sessions
+    from .runner import Fixture
+except Exception:
+    from conflicts import ConflictIndex
+    from filter_engine import FilterEngine
+    from free_slots import FreeSlotFinder
+    from layout import layout_week
+    from reminders import ReminderTracker
+    from search_index import SearchIndex
+    from session_stats import StatsAggregator
+    from session_store import SessionStore
+    from storage import load_sessions
+    from subject_trie import SubjectTrie
+    from validation import sanitize_sessions
+    from benchmarks.runner import Fixture
+
+
+# Allocations made by the profiler itself or by imports are not counted
+IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+# Retained bytes per session each subsystem may use before check_budgets complains.
+# Sessions are shared, so the indexes only pay for their own structures.
+BUDGETS = {
+    "load_sessions": 2_000,
+    "validated_sessions": 1_400,
+    "session_store": 64,
+    "search_index": 2_500,
+    "filter_engine": 450,
+    "subject_trie": 32,
+    "free_slots": 250,
+    "conflict_index": 150,
+    "stats": 16,
+    "layout_week": 120,
+    "reminders": 16,
+}
+
+
+class MemoryReport(NamedTuple):
+    name: str
+    sessions: int
+    # Bytes allocated at the high-water mark while the workload ran
+    peak: int
+    # Bytes still held by whatever the workload returned
+    retained: int
+    # (file:line, bytes, blocks) for the sites holding the most retained memory
+    top: List[Tuple[str, int, int]]
+
+    @property
+    def per_session(self) -> float:
+        return self.retained / self.sessions if self.sessions else 0.0
+
+
+def _listener(listener_class) -> Callable[[Fixture], object]:
+    def build(fixture: Fixture):
+        listener = listener_class()
+        listener.sessions_reset(fixture.sessions)
+        return listener
+    return build
+
+
+def _remind_for_a_week(fixture: Fixture) -> ReminderTracker:
+    # One reminder check every 15 minutes (the session grid) over a whole week
+    tracker = ReminderTracker()
+    now = datetime(2026, 9, 7)
+    for _ in range(7 * 24 * 4):
+        tracker.due(fixture.sessions, now)
+        now += timedelta(minutes=15)
+    return tracker
+
+
+# Each workload returns what the subsystem would keep alive in the running app
+WORKLOADS: Dict[str, Callable[[Fixture], object]] = {
+    "load_sessions": lambda fixture: load_sessions(fixture.path),
+    "validated_sessions": lambda fixture: sanitize_sessions(fixture.raw)[0],
+    "session_store": lambda fixture: SessionStore(fixture.sessions),
+    "search_index": _listener(SearchIndex),
+    "filter_engine": _listener(FilterEngine),
+    "subject_trie": _listener(SubjectTrie),
+    "free_slots": _listener(FreeSlotFinder),
+    "conflict_index": _listener(ConflictIndex),
+    "stats": _listener(StatsAggregator),
+    "layout_week": lambda fixture: layout_week(fixture.sessions, fixture.time_slots),
+    "reminders": _remind_for_a_week,
+}
+
+
+def _site(stat: tracemalloc.StatisticDiff) -> str:
+    frame = stat.traceback[0]
+    return f"{os.path.basename(frame.filename)}:{frame.lineno}"
+
+
+def measure(name: str, workload: Callable[[], object], sessions: int, top: int = 5) -> MemoryReport:
+    """Run ``workload`` under tracemalloc and report its peak and retained memory."""
+    if tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc is already tracing.")
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(IGNORED)
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        kept = workload()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(IGNORED)
+    finally:
+        tracemalloc.stop()
+    del kept
+
+    sites = [
+        (_site(stat), stat.size_diff, stat.count_diff)
+        for stat in after.compare_to(before, "lineno")[:top]
+        if stat.size_diff > 0
+    ]
+    return MemoryReport(name, sessions, peak - baseline, max(0, current - baseline), sites)
+
+
+def profile(size: int = 10_000, names: Optional[Sequence[str]] = None, seed: int = 0, top: int = 5,
+            **generator_options) -> List[MemoryReport]:
+    """Measure every workload (or just ``names``) on one synthetic schedule of ``size`` sessions."""
+    selected = list(names) if names else list(WORKLOADS)
+    unknown = [name for name in selected if name not in WORKLOADS]
+    if unknown:
+        raise ValueError(f"Unknown workload(s): {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory(prefix="study_planner_mem_") as directory:
+        fixture = Fixture(size, seed, Path(directory), **generator_options)
+        return [measure(name, lambda: WORKLOADS[name](fixture), size, top) for name in selected]
+
+
+def check_budgets(reports: Sequence[MemoryReport], budgets: Optional[Dict[str, int]] = None) -> List[Tuple[str, float, int]]:
+    """Return (name, bytes per session, budget) for every report over its budget."""
+    budgets = BUDGETS if budgets is None else budgets
+    return [
+        (report.name, report.per_session, budgets[report.name])
+        for report in reports
+        if report.name in budgets and report.per_session > budgets[report.name]
+    ]
+
+
+def format_reports(reports: Sequence[MemoryReport]) -> str:
+    lines = [f"{'subsystem':<20} {'peak':>10} {'retained':>10} {'per session':>12}"]
+    for report in reports:
+        lines.append(
+            f"{report.name:<20} {report.peak / 1024:8.0f}KB {report.retained / 1024:8.0f}KB {report.per_session:10.0f} B"
+        )
+        for site, size, count in report.top:
+            lines.append(f"    {site:<40} {size / 1024:8.0f}KB in {count} block(s)")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m study_planner.benchmarks.memory",
+                                     description="Report the memory each subsystem uses per session.")
+    parser.add_argument("--size", type=int, default=10_000, help="sessions in the synthetic schedule")
+    parser.add_argument("--only", nargs="+", choices=list(WORKLOADS), help="measure only these subsystems")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top", type=int, default=5, help="allocation sites to list per subsystem")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if any budget is exceeded")
+    args = parser.parse_args(argv)
+
+    reports = profile(args.size, args.only, seed=args.seed, top=args.top)
+    print(format_reports(reports))
+    over = check_budgets(reports)
+    for name, per_session, budget in over:
+        print(f"{name} uses {per_session:.0f} B per session, budget is {budget} B")
+    return 1 if args.check and over else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
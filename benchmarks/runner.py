@@ -0,0 +1,243 @@
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from ..analytics import AnalyticsEngine
+    from ..conflicts import ConflictIndex
+    from ..csv_io import iter_csv_records, write_csv
+    from ..importer import ImportJob
+    from ..layout import layout_week
+    from ..session_stats import StatsAggregator
+    from ..storage import load_sessions, save_sessions
+    from ..time_utils import DAYS, generate_time_slots
+    from ..validation import normalize_session, sanitize_sessions
+    from .generator import generate_sessions
+except Exception:
+    from analytics import AnalyticsEngine
+    from conflicts import ConflictIndex
+    from csv_io import iter_csv_records, write_csv
+    from importer import ImportJob
+    from layout import layout_week
+    from session_stats import StatsAggregator
+    from storage import load_sessions, save_sessions
+    from time_utils import DAYS, generate_time_slots
+    from validation import normalize_session, sanitize_sessions
+    from benchmarks.generator import generate_sessions
+
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+RESULTS_FORMAT = 1
+
+# Number of overlap queries timed by the conflict benchmark
+CONFLICT_QUERIES = 1_000
+
+
+class Fixture:
+    """One generated schedule, shared by every benchmark at that size."""
+
+    def __init__(self, size: int, seed: int, directory: Path, **generator_options):
+        self.size = size
+        self.raw = generate_sessions(size, seed=seed, **generator_options)
+        self.sessions, _ = sanitize_sessions(self.raw)
+        self.path = directory / f"sessions_{size}.json"
+        save_sessions(self.raw, self.path)
+        self.csv_path = directory / f"sessions_{size}.csv"
+        write_csv(self.sessions, self.csv_path)
+        rng = random.Random(seed)
+        self.queries = [
+            (rng.choice(DAYS), start, start + rng.choice((30, 60, 90)))
+            for start in (rng.randrange(6 * 60, 22 * 60, 15) for _ in range(CONFLICT_QUERIES))
+        ]
+        self.time_slots = generate_time_slots()
+
+
+def _save(fixture: Fixture) -> None:
+    save_sessions(fixture.raw, fixture.path.with_name("save_target.json"))
+
+
+def _load(fixture: Fixture) -> None:
+    load_sessions(fixture.path)
+
+
+def _write_csv(fixture: Fixture) -> None:
+    write_csv(fixture.sessions, fixture.csv_path.with_name("export_target.csv"))
+
+
+def _import_csv(fixture: Fixture) -> None:
+    ImportJob(fixture.csv_path, normalize_session, records=iter_csv_records).run()
+
+
+def _normalize(fixture: Fixture) -> None:
+    sanitize_sessions(fixture.raw)
+
+
+def _conflicts(fixture: Fixture) -> None:
+    index = ConflictIndex()
+    index.sessions_reset(fixture.sessions)
+    for day, start, end in fixture.queries:
+        index.find((day,), start, end)
+
+
+def _statistics(fixture: Fixture) -> None:
+    StatsAggregator().sessions_reset(fixture.sessions)
+    engine = AnalyticsEngine.from_sessions(fixture.sessions)
+    engine.subject_totals()
+    engine.heatmap()
+
+
+def _layout(fixture: Fixture) -> None:
+    layout_week(fixture.sessions, fixture.time_slots)
+
+
+BENCHMARKS: Dict[str, Callable[[Fixture], None]] = {
+    "storage.save_sessions": _save,
+    "storage.load_sessions": _load,
+    "validation.normalize_session": _normalize,
+    "csv_io.write_csv": _write_csv,
+    "csv_io.import": _import_csv,
+    "conflicts": _conflicts,
+    "statistics": _statistics,
+    "layout_week": _layout,
+}
+
+
+def repeats_for(size: int) -> int:
+    """Run small sizes several times and keep the best; big ones once."""
+    return max(1, min(5, 100_000 // max(size, 1)))
+
+
+def time_call(func: Callable[[], None], repeat: int, clock: Callable[[], float] = time.perf_counter) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = clock()
+        func()
+        best = min(best, clock() - started)
+    return best
+
+
+def run_benchmarks(sizes: Iterable[int] = SIZES, names: Optional[Sequence[str]] = None, seed: int = 0,
+                   repeat: Optional[int] = None, progress: Optional[Callable[[str], None]] = None,
+                   **generator_options) -> Dict:
+    """Time every benchmark at every size and return the results document.
+
+    Each result holds the best of ``repeat`` runs in seconds. The
+    document is plain JSON data, ready for ``write_results`` and
+    ``compare``.
+    """
+    selected = list(names) if names else list(BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(unknown)}")
+
+    results: Dict[str, Dict[str, float]] = {name: {} for name in selected}
+    with tempfile.TemporaryDirectory(prefix="study_planner_bench_") as directory:
+        for size in sizes:
+            fixture = Fixture(size, seed, Path(directory), **generator_options)
+            runs = repeat or repeats_for(size)
+            for name in selected:
+                seconds = time_call(lambda: BENCHMARKS[name](fixture), runs)
+                results[name][str(size)] = seconds
+                if progress:
+                    progress(f"{name:<30} {size:>9,}  {seconds * 1000:10.2f} ms")
+            del fixture
+
+    return {
+        "format": RESULTS_FORMAT,
+        "seed": seed,
+        "generator": generator_options,
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def write_results(document: Dict, path) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(document, fh, indent=2, sort_keys=True)
+
+
+def read_results(path) -> Dict:
+    with open(path, "r", encoding="utf-8") as fh:
+        document = json.load(fh)
+    if not isinstance(document, dict) or document.get("format") != RESULTS_FORMAT:
+        raise ValueError("Not a benchmark results file.")
+    return document
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.25) -> List[Tuple[str, str, float, float]]:
+    """Return (benchmark, size, baseline seconds, current seconds) for every regression.
+
+    A result regresses when it is more than ``tolerance`` (a fraction)
+    slower than the baseline. Benchmarks or sizes missing from either
+    side are ignored.
+    """
+    regressions = []
+    for name, sizes in current["results"].items():
+        for size, seconds in sizes.items():
+            before = baseline["results"].get(name, {}).get(size)
+            if before is not None and seconds > before * (1 + tolerance):
+                regressions.append((name, size, before, seconds))
+    return regressions
+
+
+def format_comparison(current: Dict, baseline: Dict) -> str:
+    lines = [f"{'benchmark':<30} {'size':>9}  {'baseline':>10}  {'current':>10}  change"]
+    for name, sizes in current["results"].items():
+        for size, seconds in sizes.items():
+            before = baseline["results"].get(name, {}).get(size)
+            if before is None:
+                continue
+            change = (seconds - before) / before * 100 if before else 0.0
+            lines.append(
+                f"{name:<30} {int(size):>9,}  {before * 1000:8.2f}ms  {seconds * 1000:8.2f}ms  {change:+6.1f}%"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m study_planner.benchmarks", description="Time the planner hot paths on synthetic schedules.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="schedule sizes to time")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, help="runs per benchmark (default depends on size)")
+    parser.add_argument("--subjects", type=int, default=12, help="number of distinct subjects")
+    parser.add_argument("--overlap", type=float, default=0.1, help="chance a session overlaps the previous one")
+    parser.add_argument("--notes-words", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=2, help="tasks per session")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a results file written earlier")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="fraction slower than the baseline that counts as a regression")
+    args = parser.parse_args(argv)
+
+    document = run_benchmarks(
+        args.sizes, args.only, seed=args.seed, repeat=args.repeat, progress=print,
+        subjects=args.subjects, overlap=args.overlap, notes_words=args.notes_words, tasks=args.tasks,
+    )
+    if args.output:
+        write_results(document, args.output)
+
+    if args.baseline:
+        baseline = read_results(args.baseline)
+        print()
+        print(format_comparison(document, baseline))
+        regressions = compare(document, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.tolerance:.0%}:", file=sys.stderr)
+            for name, size, before, seconds in regressions:
+                print(f"  {name} at {int(size):,}: {before * 1000:.2f} ms -> {seconds * 1000:.2f} ms", file=sys.stderr)
+            return 1
+    return 0
@@ -0,0 +1,322 @@
+"""Command-line interface for scripting the saved schedule without the GUI.
+
+Run ``python -m study_planner.cli --help``. Nothing here imports tkinter,
+and each command imports only the modules it needs, so the CLI starts
+quickly and works on machines without a display.
+"""
+
+import argparse
+import importlib
+import json
+import sys
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+def _module(name: str):
+    # Imported on first use so that e.g. ``list`` never loads the import or export code
+    if __package__:
+        return importlib.import_module(f".{name}", __package__)
+    return importlib.import_module(name)
+
+
+class CommandError(Exception):
+    """A problem to report on stderr; the CLI exits with status 1."""
+
+
+def _describe(session: Dict) -> str:
+    return f"{session['id']}  {session['day']:<9} {session['start']}-{session['end']}  {session['subject']}"
+
+
+def _clean(raw: List[Dict]) -> List[Dict]:
+    sessions, errors = _module("validation").sanitize_sessions(raw)
+    for position, exc in errors:
+        print(f"warning: skipped invalid session {position}: {exc}", file=sys.stderr)
+    return sessions
+
+
+def _load(path) -> List[Dict]:
+    try:
+        return _clean(_module("storage").load_sessions(path))
+    except ValueError as exc:
+        raise CommandError(str(exc)) from exc
+
+
+def _update(path, change: Callable[[List[Dict]], Optional[List[Dict]]]) -> None:
+    # Read, change and save under the file lock, so a concurrent save by the app or
+    # another script is never overwritten; raising from ``change`` saves nothing
+    try:
+        _module("storage").update_sessions(lambda raw: change(_clean(raw)), path)
+    except (TimeoutError, ValueError) as exc:
+        raise CommandError(str(exc)) from exc
+
+
+def _conflict_index(sessions: List[Dict]):
+    index = _module("conflicts").ConflictIndex()
+    index.sessions_reset(sessions)
+    return index
+
+
+def cmd_list(args) -> int:
+    sessions = _load(args.file)
+    if args.day:
+        sessions = [session for session in sessions if session["day"] == args.day]
+    if args.subject:
+        wanted = args.subject.casefold()
+        sessions = [session for session in sessions if session["subject"].casefold() == wanted]
+    days = _module("time_utils").DAYS
+    sessions.sort(key=lambda session: (days.index(session["day"]), session.start_min, session["subject"]))
+
+    if args.json:
+        json.dump(sessions, sys.stdout, indent=2)
+        print()
+    else:
+        for session in sessions:
+            print(_describe(session))
+    return 0
+
+
+def cmd_add(args) -> int:
+    validation = _module("validation")
+    try:
+        base = validation.normalize_session({
+            "subject": args.subject,
+            "day": args.days[0],
+            "start": args.start,
+            "end": args.end,
+            "color": args.color,
+            "notes": args.notes,
+            "tasks": [{"text": text} for text in args.task],
+        })
+        new_sessions = validation.copy_to_days(base, args.days)
+    except ValueError as exc:
+        raise CommandError(str(exc)) from exc
+
+    def add(sessions: List[Dict]) -> List[Dict]:
+        conflicts = _conflict_index(sessions).find(args.days, base.start_min, base.end_min)
+        if conflicts and not args.force:
+            details = "\n".join(f"  {_describe(session)}" for session in conflicts)
+            raise CommandError(f"the new session overlaps:\n{details}\nuse --force to add it anyway")
+        return sessions + new_sessions
+
+    _update(args.file, add)
+    for session in new_sessions:
+        print(session["id"])
+    return 0
+
+
+def cmd_remove(args) -> int:
+    wanted = set(args.ids)
+
+    def remove(sessions: List[Dict]) -> List[Dict]:
+        missing = wanted - {session["id"] for session in sessions}
+        if missing:
+            raise CommandError(f"no session with id {', '.join(sorted(missing))}")
+        return [session for session in sessions if session["id"] not in wanted]
+
+    _update(args.file, remove)
+    print(f"Removed {len(wanted)} session(s).")
+    return 0
+
+
+def cmd_conflicts(args) -> int:
+    sessions = _load(args.file)
+    index = _conflict_index(sessions)
+    pairs = 0
+    for session in sessions:
+        for other in index.find((session["day"],), session.start_min, session.end_min, session["id"],
+                                session.get("repeat")):
+            # Report each overlapping pair once
+            if other["id"] > session["id"]:
+                print(f"{_describe(session)}\n  overlaps {_describe(other)}")
+                pairs += 1
+    print(f"{pairs} conflict(s).")
+    return 1 if pairs and args.check else 0
+
+
+def cmd_stats(args) -> int:
+    aggregator = _module("session_stats").StatsAggregator()
+    aggregator.sessions_reset(_load(args.file))
+    snapshot = aggregator.snapshot()
+    if args.json:
+        json.dump(snapshot, sys.stdout, indent=2)
+        print()
+        return 0
+
+    print(f"Sessions: {snapshot['count']}")
+    print(f"Subjects: {snapshot['subjects']}")
+    print(f"Total:    {snapshot['total_minutes'] / 60:.1f} h per week")
+    print("By subject:")
+    for subject, minutes in sorted(snapshot["subject_minutes"].items(), key=lambda item: -item[1]):
+        print(f"  {subject:<24} {minutes / 60:6.1f} h")
+    print("By day:")
+    for day in _module("time_utils").DAYS:
+        print(f"  {day:<24} {snapshot['day_minutes'].get(day, 0) / 60:6.1f} h")
+    return 0
+
+
+def _file_format(path: str, given: Optional[str]) -> str:
+    if given:
+        return given
+    suffix = path.rsplit(".", 1)[-1].lower() if "." in path else ""
+    if suffix not in ("json", "csv", "ics"):
+        raise CommandError(f"cannot tell the format of {path}; use --format")
+    return suffix
+
+
+def _read_file(path: str, file_format: Optional[str]):
+    # Streams and validates a JSON or CSV file the same way the app's importer does
+    file_format = _file_format(path, file_format)
+    if file_format == "ics":
+        raise CommandError("iCalendar files can only be exported")
+
+    importer = _module("importer")
+    records = _module("csv_io").iter_csv_records if file_format == "csv" else importer.iter_json_array
+    try:
+        return importer.ImportJob(path, _module("validation").normalize_session, records=records).run()
+    except (OSError, ValueError) as exc:
+        raise CommandError(f"could not read {path}: {exc}") from exc
+
+
+def cmd_import(args) -> int:
+    result = _read_file(args.path, args.format)
+    for number, message in result.errors:
+        print(f"warning: skipped entry {number}: {message}", file=sys.stderr)
+
+    merges = []
+
+    def merge_into(sessions: List[Dict]) -> List[Dict]:
+        merge = _module("merge").merge_sessions(sessions, result.sessions)
+        merges.append(merge)
+        if not merge.inserted and not merge.updated:
+            return None
+        updated = {session["id"]: session for session in merge.updated}
+        return [updated.get(session["id"], session) for session in sessions] + merge.inserted
+
+    if args.dry_run:
+        merge_into(_load(args.file))
+    else:
+        _update(args.file, merge_into)
+    merge = merges[-1]
+    print(
+        f"Inserted {len(merge.inserted)} new session(s), updated {len(merge.updated)}, "
+        f"skipped {merge.skipped} duplicate(s) and {result.skipped} invalid."
+    )
+    return 0
+
+
+def cmd_export(args) -> int:
+    file_format = _file_format(args.path, args.format)
+    sessions = _load(args.file)
+    try:
+        if file_format == "csv":
+            count = _module("csv_io").write_csv(sessions, args.path)
+        elif file_format == "ics":
+            count = _module("ics_export").write_ics(sessions, args.path)
+        else:
+            with open(args.path, "w", encoding="utf-8") as fh:
+                json.dump(sessions, fh, indent=2)
+            count = len(sessions)
+    except OSError as exc:
+        raise CommandError(f"could not write {args.path}: {exc}") from exc
+    print(f"Exported {count} session(s) to {args.path}.")
+    return 0
+
+
+def cmd_validate(args) -> int:
+    path = args.path or args.file or str(_module("storage").default_path())
+    result = _read_file(path, args.format)
+    for number, message in result.errors:
+        print(f"entry {number}: {message}")
+    print(f"{len(result.sessions)} valid, {result.skipped} invalid.")
+    return 1 if result.skipped else 0
+
+
+def cmd_serve(args) -> int:
+    import asyncio
+
+    api_server = _module("api_server")
+
+    def ready(port: int) -> None:
+        print(f"Serving {args.file or _module('storage').default_path()} on http://{args.host}:{port} (Ctrl+C to stop)")
+
+    try:
+        asyncio.run(api_server.serve(args.file, args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    except OSError as exc:
+        raise CommandError(f"could not listen on {args.host}:{args.port}: {exc}") from exc
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m study_planner.cli",
+        description="Manage the study planner schedule from the command line.",
+    )
+    parser.add_argument("--file", help="schedule file (default: ~/.study_planner/sessions.json)")
+    commands = parser.add_subparsers(dest="command", metavar="command", required=True)
+
+    list_parser = commands.add_parser("list", help="list sessions in weekly order")
+    list_parser.add_argument("--day", help="only sessions on this day")
+    list_parser.add_argument("--subject", help="only sessions for this subject")
+    list_parser.add_argument("--json", action="store_true", help="print the sessions as JSON")
+    list_parser.set_defaults(handler=cmd_list)
+
+    add_parser = commands.add_parser("add", help="add a session on one or more days")
+    add_parser.add_argument("--subject", required=True)
+    add_parser.add_argument("--day", dest="days", action="append", required=True,
+                            help="day of the week; repeat to add the session on several days")
+    add_parser.add_argument("--start", required=True, help="HH:MM")
+    add_parser.add_argument("--end", required=True, help="HH:MM")
+    add_parser.add_argument("--color", default="")
+    add_parser.add_argument("--notes", default="")
+    add_parser.add_argument("--task", action="append", default=[], help="task text; repeat for several tasks")
+    add_parser.add_argument("--force", action="store_true", help="add the session even if it overlaps another")
+    add_parser.set_defaults(handler=cmd_add)
+
+    remove_parser = commands.add_parser("remove", help="remove sessions by id")
+    remove_parser.add_argument("ids", nargs="+")
+    remove_parser.set_defaults(handler=cmd_remove)
+
+    conflicts_parser = commands.add_parser("conflicts", help="list overlapping sessions")
+    conflicts_parser.add_argument("--check", action="store_true", help="exit with status 1 if any are found")
+    conflicts_parser.set_defaults(handler=cmd_conflicts)
+
+    stats_parser = commands.add_parser("stats", help="show weekly study time")
+    stats_parser.add_argument("--json", action="store_true")
+    stats_parser.set_defaults(handler=cmd_stats)
+
+    import_parser = commands.add_parser("import", help="merge sessions from a JSON or CSV file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=("json", "csv"))
+    import_parser.add_argument("--dry-run", action="store_true", help="report what would change without saving")
+    import_parser.set_defaults(handler=cmd_import)
+
+    export_parser = commands.add_parser("export", help="write the schedule as JSON, CSV or iCalendar")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--format", choices=("json", "csv", "ics"))
+    export_parser.set_defaults(handler=cmd_export)
+
+    validate_parser = commands.add_parser("validate", help="check every session in a schedule file")
+    validate_parser.add_argument("path", nargs="?", help="JSON or CSV file to check (default: the schedule file)")
+    validate_parser.add_argument("--format", choices=("json", "csv"))
+    validate_parser.set_defaults(handler=cmd_validate)
+
+    serve_parser = commands.add_parser("serve", help="serve the schedule as a local HTTP/JSON API")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.set_defaults(handler=cmd_serve)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except CommandError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .recurrence import rules_meet
+    from .session_store import SessionListener
+    from .validation import session_minutes
+except Exception:
+    from recurrence import rules_meet
+    from session_store import SessionListener
+    from validation import session_minutes
+
+
+class ConflictIndex(SessionListener):
+    """Sessions of each weekday sorted by start time, for overlap queries.
+
+    An overlap query bisects the day's list instead of scanning every
+    session: only sessions starting between ``start - longest`` and
+    ``end`` can overlap, where ``longest`` is the day's longest session.
+    Sessions whose repeat rules never fall on the same date, such as
+    one-offs in different weeks, are not reported.
+    """
+
+    def __init__(self):
+        self._by_day: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._longest: Dict[str, int] = {}
+        self._sessions: Dict[str, Dict] = {}
+
+    def session_added(self, session: Dict) -> None:
+        try:
+            start, end = session_minutes(session)
+        except ValueError:
+            return
+        day = session.get("day")
+        insort(self._by_day.setdefault(day, []), (start, end, session["id"]))
+        self._longest[day] = max(self._longest.get(day, 0), end - start)
+        self._sessions[session["id"]] = session
+
+    def session_removed(self, session: Dict) -> None:
+        if self._sessions.pop(session["id"], None) is None:
+            return
+        start, end = session_minutes(session)
+        day = session.get("day")
+        intervals = self._by_day[day]
+        del intervals[bisect_left(intervals, (start, end, session["id"]))]
+        if end - start == self._longest[day]:
+            self._longest[day] = max((e - s for s, e, _ in intervals), default=0)
+
+    def sessions_reset(self, sessions: List[Dict]) -> None:
+        self.__init__()
+        for session in sessions:
+            self.session_added(session)
+
+    def find(self, days: Iterable[str], start: int, end: int, exclude_id: Optional[str] = None,
+             repeat: Optional[Dict] = None) -> List[Dict]:
+        """Return the sessions on any of ``days`` that overlap ``start``-``end``, in day order.
+
+        ``repeat`` is the repeat rule of the time being checked; without one
+        it is taken to occur every week.
+        """
+        conflicts = []
+        for day in days:
+            intervals = self._by_day.get(day)
+            if not intervals:
+                continue
+            first = bisect_left(intervals, (start - self._longest[day],))
+            last = bisect_right(intervals, (end,))
+            for other_start, other_end, session_id in intervals[first:last]:
+                if other_start < end and other_end > start and session_id != exclude_id:
+                    other = self._sessions[session_id]
+                    if rules_meet(day, repeat, other.get("repeat")):
+                        conflicts.append(other)
+        return conflicts
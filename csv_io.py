@@ -0,0 +1,115 @@
+import csv
+from typing import Dict, Iterable, Iterator, List
+
+CSV_FIELDS = [
+    "id", "subject", "day", "start", "end", "color", "notes",
+    "repeat_start", "repeat_until", "repeat_interval", "repeat_except", "tasks",
+]
+REQUIRED_FIELDS = ("subject", "day", "start", "end")
+
+# Tasks share one cell: "[x] done item | open item", with "\|" for a "|"
+# inside a task and "\\" for a backslash
+TASK_SEPARATOR = "|"
+ESCAPE = "\\"
+DONE_MARK = "[x]"
+
+
+def _escape_task(text: str) -> str:
+    return text.replace(ESCAPE, ESCAPE * 2).replace(TASK_SEPARATOR, ESCAPE + TASK_SEPARATOR)
+
+
+def _split_tasks(cell: str) -> List[str]:
+    if ESCAPE not in cell:
+        return cell.split(TASK_SEPARATOR)
+    items, current = [], []
+    chars = iter(cell)
+    for char in chars:
+        if char == ESCAPE:
+            following = next(chars, "")
+            # Other backslashes are kept as they are, as in files edited by hand
+            current.append(following if following in (ESCAPE, TASK_SEPARATOR) else char + following)
+        elif char == TASK_SEPARATOR:
+            items.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    items.append("".join(current))
+    return items
+
+
+def session_to_row(session: Dict) -> Dict[str, str]:
+    rule = session.get("repeat") or {}
+    tasks = f" {TASK_SEPARATOR} ".join(
+        (f"{DONE_MARK} " if task.get("completed") else "") + _escape_task(task.get("text", ""))
+        for task in session.get("tasks", [])
+    )
+    return {
+        "id": session.get("id", ""),
+        "subject": session.get("subject", ""),
+        "day": session.get("day", ""),
+        "start": session.get("start", ""),
+        "end": session.get("end", ""),
+        "color": session.get("color", ""),
+        "notes": session.get("notes", ""),
+        "repeat_start": rule.get("start", ""),
+        "repeat_until": rule.get("until", ""),
+        "repeat_interval": rule.get("interval", "") if rule else "",
+        "repeat_except": ";".join(rule.get("except", [])),
+        "tasks": tasks,
+    }
+
+
+def row_to_session(row: Dict[str, str]) -> Dict:
+    """Turn a CSV row back into a raw session dict, ready for normalize_session."""
+    session = {
+        field: (row.get(field) or "").strip()
+        for field in ("id", "subject", "day", "start", "end", "color", "notes")
+    }
+    # Spreadsheets often change "Monday" to "monday"
+    session["day"] = session["day"].capitalize()
+
+    if (row.get("repeat_start") or "").strip():
+        session["repeat"] = {
+            "start": row["repeat_start"].strip(),
+            "until": (row.get("repeat_until") or "").strip() or None,
+            "interval": (row.get("repeat_interval") or "").strip() or 1,
+            "except": [value for value in (row.get("repeat_except") or "").split(";") if value.strip()],
+        }
+
+    tasks = []
+    for item in _split_tasks(row.get("tasks") or ""):
+        item = item.strip()
+        completed = item.lower().startswith(DONE_MARK)
+        if completed:
+            item = item[len(DONE_MARK):].strip()
+        if item:
+            tasks.append({"text": item, "completed": completed})
+    if tasks:
+        session["tasks"] = tasks
+    return session
+
+
+def iter_csv_records(fh) -> Iterator[Dict]:
+    """Yield raw session dicts from a CSV file with a header row.
+
+    Rows are read one at a time, so large files never sit in memory as a
+    whole. Only the subject, day, start and end columns are required.
+    """
+    reader = csv.DictReader(fh)
+    missing = [field for field in REQUIRED_FIELDS if field not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"The CSV file is missing the column(s): {', '.join(missing)}.")
+    for row in reader:
+        yield row_to_session(row)
+
+
+def write_csv(sessions: Iterable[Dict], path) -> int:
+    """Stream sessions to a CSV file row by row and return the number written."""
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for session in sessions:
+            writer.writerow(session_to_row(session))
+            count += 1
+    return count
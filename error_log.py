@@ -0,0 +1,97 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Callable, Dict, Tuple
+
+
+LOG_FORMAT = "[%(asctime)s] %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class DedupeFilter(logging.Filter):
+    """Lets through at most ``burst`` records per message and error type every ``window`` seconds.
+
+    The first record after a quiet window notes how many similar ones
+    were dropped, so a flood of identical errors costs a few lines
+    instead of thousands.
+    """
+
+    def __init__(self, window: float = 60.0, burst: int = 3, clock: Callable[[], float] = time.monotonic):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> [window start, records let through, records dropped]
+        self._seen: Dict[Tuple, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        exc_type = record.exc_info[0].__name__ if record.exc_info and record.exc_info[0] else None
+        key = (record.msg, exc_type)
+        now = self._clock()
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is None or now - entry[0] >= self.window:
+                dropped = entry[2] if entry is not None else 0
+                self._seen[key] = [now, 1, 0]
+                if dropped:
+                    record.msg = f"{record.msg} ({dropped} similar message(s) suppressed)"
+                return True
+            if entry[1] < self.burst:
+                entry[1] += 1
+                return True
+            entry[2] += 1
+            return False
+
+
+class ErrorLog:
+    """Error log written by a background thread, with size-based rotation.
+
+    Callers only format the record and put it on a queue; a
+    ``QueueListener`` thread does the file writes through a
+    ``RotatingFileHandler``, so logging never blocks the Tk thread on
+    disk I/O. Repeated errors are rate limited by ``DedupeFilter``
+    before they are queued.
+    """
+
+    def __init__(self, path, max_bytes: int = 1_000_000, backup_count: int = 3,
+                 window: float = 60.0, burst: int = 3):
+        self.path = path
+        self._queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+        self._file_handler = RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True
+        )
+        self._file_handler.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+        self._listener = QueueListener(self._queue, self._file_handler)
+
+        handler = QueueHandler(self._queue)
+        handler.addFilter(DedupeFilter(window, burst))
+        # A private logger, so several logs (or tests) never share handlers
+        self.logger = logging.Logger("study_planner.errors")
+        self.logger.addHandler(handler)
+        self.logger.propagate = False
+
+        self._closed = False
+        self._listener.start()
+        atexit.register(self.close)
+
+    def exception(self, context: str, exc: BaseException) -> None:
+        self.logger.error(context, exc_info=(type(exc), exc, exc.__traceback__))
+
+    def flush(self) -> None:
+        """Wait until everything logged so far is written."""
+        if self._closed:
+            return
+        self._listener.stop()
+        self._file_handler.flush()
+        self._listener.start()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._listener.stop()
+        self._file_handler.close()
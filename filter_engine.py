@@ -0,0 +1,128 @@
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Set
+
+try:
+    from .session_store import SessionListener
+except Exception:
+    from session_store import SessionListener
+
+
+class SessionFilter(NamedTuple):
+    """What to show in the calendar.
+
+    Values inside one criterion are alternatives (any listed subject
+    matches). ``match_all`` decides whether the criteria that are set
+    must all hold or whether one is enough. Empty criteria are ignored.
+    Filters are hashable, so they can be part of cache keys.
+    """
+
+    subjects: FrozenSet[str] = frozenset()
+    days: FrozenSet[str] = frozenset()
+    colors: FrozenSet[str] = frozenset()
+    open_tasks: bool = False
+    match_all: bool = True
+
+    @classmethod
+    def create(cls, subjects: Iterable[str] = (), days: Iterable[str] = (), colors: Iterable[str] = (),
+               open_tasks: bool = False, match_all: bool = True) -> "SessionFilter":
+        return cls(frozenset(subjects), frozenset(days), frozenset(c.lower() for c in colors),
+                   bool(open_tasks), bool(match_all))
+
+    def is_empty(self) -> bool:
+        return not (self.subjects or self.days or self.colors or self.open_tasks)
+
+    def describe(self) -> str:
+        parts = []
+        if self.subjects:
+            parts.append(", ".join(sorted(self.subjects)))
+        if self.days:
+            parts.append(", ".join(sorted(self.days)))
+        if self.colors:
+            parts.append(f"{len(self.colors)} colour(s)")
+        if self.open_tasks:
+            parts.append("open tasks")
+        return (" and " if self.match_all else " or ").join(parts) or "All subjects"
+
+
+def has_open_tasks(session: Dict) -> bool:
+    return any(not task.get("completed") for task in session.get("tasks", []))
+
+
+class FilterEngine(SessionListener):
+    """Posting sets of session ids by subject, day, colour and open tasks.
+
+    A filter is answered by unions and intersections of these sets rather
+    than a scan over every session. Answers are cached until the next
+    change to the store.
+    """
+
+    def __init__(self):
+        self._all: Set[str] = set()
+        self._by_subject: Dict[str, Set[str]] = {}
+        self._by_day: Dict[str, Set[str]] = {}
+        self._by_color: Dict[str, Set[str]] = {}
+        self._open_tasks: Set[str] = set()
+        self._cache: Dict[SessionFilter, FrozenSet[str]] = {}
+
+    def _postings(self, session: Dict):
+        yield self._by_subject, session.get("subject", "")
+        yield self._by_day, session.get("day", "")
+        yield self._by_color, str(session.get("color", "")).lower()
+
+    def session_added(self, session: Dict) -> None:
+        session_id = session["id"]
+        self._all.add(session_id)
+        for index, key in self._postings(session):
+            index.setdefault(key, set()).add(session_id)
+        if has_open_tasks(session):
+            self._open_tasks.add(session_id)
+        self._cache.clear()
+
+    def session_removed(self, session: Dict) -> None:
+        session_id = session["id"]
+        self._all.discard(session_id)
+        for index, key in self._postings(session):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(session_id)
+                if not ids:
+                    del index[key]
+        self._open_tasks.discard(session_id)
+        self._cache.clear()
+
+    def sessions_reset(self, sessions: List[Dict]) -> None:
+        self.__init__()
+        for session in sessions:
+            self.session_added(session)
+
+    def subjects(self) -> List[str]:
+        return sorted(subject for subject in self._by_subject if subject)
+
+    def colors(self) -> List[str]:
+        return sorted(self._by_color)
+
+    def matching_ids(self, session_filter: SessionFilter) -> FrozenSet[str]:
+        """Return the ids of the sessions that pass ``session_filter``."""
+        cached = self._cache.get(session_filter)
+        if cached is not None:
+            return cached
+
+        groups = []
+        for index, values in (
+            (self._by_subject, session_filter.subjects),
+            (self._by_day, session_filter.days),
+            (self._by_color, session_filter.colors),
+        ):
+            if values:
+                groups.append(set().union(*(index.get(value, ()) for value in values)))
+        if session_filter.open_tasks:
+            groups.append(self._open_tasks)
+
+        if not groups:
+            result = frozenset(self._all)
+        elif session_filter.match_all:
+            groups.sort(key=len)
+            result = frozenset(groups[0].intersection(*groups[1:]))
+        else:
+            result = frozenset(groups[0].union(*groups[1:]))
+        self._cache[session_filter] = result
+        return result
@@ -0,0 +1,166 @@
+from collections import OrderedDict
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .recurrence import occurs_on, week_start
+    from .session_store import SessionListener
+    from .time_utils import DAYS
+    from .validation import session_minutes
+except Exception:
+    from recurrence import occurs_on, week_start
+    from session_store import SessionListener
+    from time_utils import DAYS
+    from validation import session_minutes
+
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def minute_mask(start: int, end: int) -> int:
+    """Bits ``start`` to ``end - 1`` set: one bit per minute of the day."""
+    if end <= start:
+        return 0
+    return ((1 << (end - start)) - 1) << start
+
+
+def _runs_of(free: int, length: int) -> int:
+    """Keep bit i only where bits i .. i + length - 1 are all set.
+
+    Uses repeated shift-AND with doubling steps, so it takes about
+    log2(length) big-int operations instead of ``length``.
+    """
+    covered = 1
+    while covered < length:
+        step = min(covered, length - covered)
+        free &= free >> step
+        covered += step
+    return free
+
+
+@lru_cache(maxsize=256)
+def _aligned_starts(earliest: int, last_start: int, step: int) -> int:
+    """Bits for the minutes from ``earliest`` to ``last_start`` that are multiples of ``step``."""
+    aligned = 0
+    for minute in range(-(-earliest // step) * step, last_start + 1, step):
+        aligned |= 1 << minute
+    return aligned
+
+
+def find_windows(occupied: int, length: int, earliest: int = 0, latest: int = MINUTES_PER_DAY,
+                 limit: int = 5, step: int = 15) -> List[Tuple[int, int]]:
+    """Return up to ``limit`` free (start, end) windows of ``length`` minutes in one day.
+
+    ``occupied`` is the day's bitmap. Windows start on multiples of
+    ``step`` minutes, lie between ``earliest`` and ``latest`` and do not
+    overlap each other.
+    """
+    if length <= 0 or limit <= 0 or earliest + length > latest:
+        return []
+    free = ~occupied & minute_mask(earliest, latest)
+    starts = _runs_of(free, length) & _aligned_starts(earliest, latest - length, step)
+    windows = []
+    while starts and len(windows) < limit:
+        start = (starts & -starts).bit_length() - 1
+        windows.append((start, start + length))
+        starts &= ~minute_mask(0, start + length)
+    return windows
+
+
+class FreeSlotFinder(SessionListener):
+    """Per-day occupancy bitmaps for finding free time.
+
+    Each weekday's bitmap is a 1440-bit int with a bit set for every
+    minute some session covers. Sessions without a repeat rule occur
+    every week, so changing one rebuilds only the bitmap of its day.
+    Sessions with a rule only block the weeks they occur in: every query
+    is for the week starting at ``monday`` (this week by default), and the
+    masks of the ruled sessions that occur in that week are added to the
+    weekly bitmaps. Those week bitmaps are cached until a ruled session
+    changes.
+    """
+
+    def __init__(self, max_weeks: int = 32):
+        self.max_weeks = max_weeks
+        self._masks: Dict[str, Dict[str, int]] = {day: {} for day in DAYS}
+        self._occupied: Dict[str, int] = {day: 0 for day in DAYS}
+        self._ruled: Dict[str, Dict[str, Tuple[Dict, int]]] = {day: {} for day in DAYS}
+        self._weeks: "OrderedDict[date, Dict[str, int]]" = OrderedDict()
+
+    def _rebuild(self, day: str) -> None:
+        occupied = 0
+        for mask in self._masks[day].values():
+            occupied |= mask
+        self._occupied[day] = occupied
+
+    def session_added(self, session: Dict) -> None:
+        day = session.get("day")
+        if day not in self._masks:
+            return
+        try:
+            start, end = session_minutes(session)
+        except ValueError:
+            return
+        mask = minute_mask(start, end)
+        if session.get("repeat"):
+            self._ruled[day][session["id"]] = (session, mask)
+            self._weeks.clear()
+            return
+        self._masks[day][session["id"]] = mask
+        self._occupied[day] |= mask
+
+    def session_removed(self, session: Dict) -> None:
+        day = session.get("day")
+        if self._ruled.get(day, {}).pop(session["id"], None) is not None:
+            self._weeks.clear()
+        elif self._masks.get(day, {}).pop(session["id"], None) is not None:
+            self._rebuild(day)
+
+    def sessions_reset(self, sessions: List[Dict]) -> None:
+        self.__init__(self.max_weeks)
+        for session in sessions:
+            self.session_added(session)
+
+    def _week(self, monday: Optional[date]) -> Dict[str, int]:
+        # Minutes blocked by ruled sessions in the week starting at ``monday``
+        monday = monday or week_start()
+        cached = self._weeks.get(monday)
+        if cached is not None:
+            self._weeks.move_to_end(monday)
+            return cached
+
+        cached = {}
+        for offset, day in enumerate(DAYS):
+            on = monday + timedelta(days=offset)
+            busy = 0
+            for session, mask in self._ruled[day].values():
+                if occurs_on(session, on):
+                    busy |= mask
+            cached[day] = busy
+        self._weeks[monday] = cached
+        if len(self._weeks) > self.max_weeks:
+            self._weeks.popitem(last=False)
+        return cached
+
+    def occupied(self, day: str, monday: Optional[date] = None) -> int:
+        return self._occupied[day] | self._week(monday)[day]
+
+    def is_free(self, day: str, start: int, end: int, monday: Optional[date] = None) -> bool:
+        return not self.occupied(day, monday) & minute_mask(start, end)
+
+    def free_windows(self, length: int, days: Sequence[str] = DAYS, earliest: int = 0,
+                     latest: int = MINUTES_PER_DAY, limit: int = 5, step: int = 15,
+                     monday: Optional[date] = None) -> List[Tuple[str, int, int]]:
+        """Return up to ``limit`` free (day, start, end) windows of ``length`` minutes.
+
+        Days are searched in the order given, earliest windows first, in
+        the week starting at ``monday``; see ``find_windows`` for the rest.
+        """
+        windows = []
+        for day in days:
+            for start, end in find_windows(self.occupied(day, monday), length, earliest, latest, limit - len(windows), step):
+                windows.append((day, start, end))
+            if len(windows) >= limit:
+                break
+        return windows
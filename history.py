@@ -0,0 +1,179 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+_MISSING = object()
+
+
+class Command:
+    """A reversible change to a SessionStore.
+
+    Commands only keep the sessions or fields they touch. Stored sessions
+    are never edited in place, so a command can hold on to them without
+    copying and its memory cost does not grow with the schedule.
+    """
+
+    label = "change"
+
+    def apply(self, store) -> None:
+        raise NotImplementedError
+
+    def revert(self, store) -> None:
+        raise NotImplementedError
+
+
+class AddSessions(Command):
+    def __init__(self, sessions: Sequence[Dict], label: str = "add session"):
+        self.sessions = list(sessions)
+        self.label = label
+
+    def apply(self, store) -> None:
+        # Keep what the store validated so that redo does not validate again
+        self.sessions = store.add_many(self.sessions)
+
+    def revert(self, store) -> None:
+        store.remove_many([session["id"] for session in self.sessions])
+
+
+class RemoveSessions(Command):
+    def __init__(self, session_ids: Iterable[str], label: str = "delete session"):
+        self.session_ids = list(session_ids)
+        self.removed: List[Dict] = []
+        self.label = label
+
+    def apply(self, store) -> None:
+        self.removed = store.remove_many(self.session_ids)
+
+    def revert(self, store) -> None:
+        store.add_many(self.removed)
+
+
+class UpdateSession(Command):
+    """Replace a session, remembering only the fields that changed."""
+
+    def __init__(self, old: Dict, new: Dict, label: str = "edit session"):
+        if old["id"] != new["id"]:
+            raise ValueError("Updated session must keep its id.")
+        self.session_id = old["id"]
+        self.changes = {
+            field: (old.get(field, _MISSING), new.get(field, _MISSING))
+            for field in set(old) | set(new)
+            if old.get(field, _MISSING) != new.get(field, _MISSING)
+        }
+        self.label = label
+
+    def _patch(self, store, side: int) -> None:
+        current = store.get(self.session_id)
+        if current is None:
+            raise KeyError(f"Session {self.session_id} no longer exists.")
+        session = dict(current)
+        for field, values in self.changes.items():
+            if values[side] is _MISSING:
+                session.pop(field, None)
+            else:
+                session[field] = values[side]
+        store.update(self.session_id, session)
+
+    def apply(self, store) -> None:
+        self._patch(store, 1)
+
+    def revert(self, store) -> None:
+        self._patch(store, 0)
+
+
+class SplitSession(Command):
+    """Replace one session with the pieces left after cutting a block out of it."""
+
+    def __init__(self, session_id: str, pieces: Sequence[Dict], label: str = "remove time block"):
+        self.remove = RemoveSessions([session_id])
+        self.add = AddSessions(pieces)
+        self.label = label
+
+    def apply(self, store) -> None:
+        self.remove.apply(store)
+        try:
+            self.add.apply(store)
+        except ValueError:
+            self.remove.revert(store)
+            raise
+
+    def revert(self, store) -> None:
+        self.add.revert(store)
+        self.remove.revert(store)
+
+
+class CompositeCommand(Command):
+    """Several commands applied and undone as one step."""
+
+    def __init__(self, commands: Sequence[Command], label: str = "change"):
+        self.commands = list(commands)
+        self.label = label
+
+    def apply(self, store) -> None:
+        done = []
+        try:
+            for command in self.commands:
+                command.apply(store)
+                done.append(command)
+        except ValueError:
+            for command in reversed(done):
+                command.revert(store)
+            raise
+
+    def revert(self, store) -> None:
+        for command in reversed(self.commands):
+            command.revert(store)
+
+
+class History:
+    """Undo and redo stacks of commands applied to one store.
+
+    Only the last ``limit`` commands can be undone. Every change to the
+    store should go through ``execute`` so that the stacks stay valid.
+    """
+
+    def __init__(self, store, limit: int = 100):
+        self.store = store
+        self._undo = deque(maxlen=limit)
+        self._redo: List[Command] = []
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo_label(self) -> Optional[str]:
+        return self._undo[-1].label if self._undo else None
+
+    def redo_label(self) -> Optional[str]:
+        return self._redo[-1].label if self._redo else None
+
+    def execute(self, command: Command) -> None:
+        command.apply(self.store)
+        self._undo.append(command)
+        self._redo.clear()
+
+    def discard(self) -> None:
+        """Revert the last command and forget it, e.g. because saving it failed."""
+        self._undo.pop().revert(self.store)
+
+    def undo(self) -> Optional[Command]:
+        if not self._undo:
+            return None
+        command = self._undo.pop()
+        command.revert(self.store)
+        self._redo.append(command)
+        return command
+
+    def redo(self) -> Optional[Command]:
+        if not self._redo:
+            return None
+        command = self._redo.pop()
+        command.apply(self.store)
+        self._undo.append(command)
+        return command
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
@@ -0,0 +1,119 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, Optional
+
+try:
+    from .recurrence import is_one_off, parse_date, session_date, week_start
+    from .time_utils import DAYS
+except Exception:
+    from recurrence import is_one_off, parse_date, session_date, week_start
+    from time_utils import DAYS
+
+
+BYDAY = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+
+def _escape(text: str) -> str:
+    return (
+        str(text)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets as RFC 5545 requires."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Never split inside a multi-byte UTF-8 character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _local_time(day: date, hhmm: str) -> str:
+    hours, minutes = hhmm.split(":")
+    return f"{day:%Y%m%d}T{int(hours):02d}{int(minutes):02d}00"
+
+
+def _first_occurrence(session: Dict, rule: Dict, anchor: date) -> date:
+    start = parse_date(rule["start"]) if rule else anchor
+    first = session_date(session, week_start(start))
+    if first < start:
+        first += timedelta(weeks=rule.get("interval", 1))
+    return first
+
+
+def iter_vevents(session: Dict, stamp: str, anchor: date) -> Iterator[str]:
+    """Yield the folded lines of one VEVENT for a session."""
+    rule = session.get("repeat") or {}
+    first = _first_occurrence(session, rule, anchor)
+
+    yield _fold("BEGIN:VEVENT")
+    yield _fold(f"UID:{session['id']}@study-planner")
+    yield _fold(f"DTSTAMP:{stamp}")
+    yield _fold(f"DTSTART:{_local_time(first, session['start'])}")
+    yield _fold(f"DTEND:{_local_time(first, session['end'])}")
+    yield _fold(f"SUMMARY:{_escape(session.get('subject', ''))}")
+    if session.get("notes"):
+        yield _fold(f"DESCRIPTION:{_escape(session['notes'])}")
+
+    if not is_one_off(session):
+        rrule = f"RRULE:FREQ=WEEKLY;INTERVAL={rule.get('interval', 1)};BYDAY={BYDAY[DAYS.index(session['day'])]}"
+        if rule.get("until"):
+            rrule += f";UNTIL={_local_time(parse_date(rule['until']), '23:59')}"
+        yield _fold(rrule)
+        for skipped in rule.get("except", ()):
+            yield _fold(f"EXDATE:{_local_time(parse_date(skipped), session['start'])}")
+
+    yield _fold("END:VEVENT")
+
+
+def iter_ics(sessions: Iterable[Dict], anchor: Optional[date] = None) -> Iterator[str]:
+    """Yield an iCalendar document line by line.
+
+    Sessions without a repeat rule become weekly events starting in the
+    week of ``anchor`` (this week by default). Times are floating local
+    times, which calendar apps show in the user's own time zone.
+    """
+    anchor = anchor or week_start()
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    yield _fold("BEGIN:VCALENDAR")
+    yield _fold("VERSION:2.0")
+    yield _fold("PRODID:-//Study Planner//Weekly Study Planner//EN")
+    yield _fold("CALSCALE:GREGORIAN")
+    for session in sessions:
+        yield from iter_vevents(session, stamp, anchor)
+    yield _fold("END:VCALENDAR")
+
+
+def write_ics(sessions: Iterable[Dict], path, anchor: Optional[date] = None, chunk_lines: int = 512) -> int:
+    """Stream sessions to an .ics file in chunks and return the number of events.
+
+    Only ``chunk_lines`` lines are held in memory at a time, so memory use
+    does not grow with the size of the schedule.
+    """
+    events = 0
+    buffer = []
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        for line in iter_ics(sessions, anchor):
+            buffer.append(line)
+            if line == "END:VEVENT\r\n":
+                events += 1
+            if len(buffer) >= chunk_lines:
+                fh.write("".join(buffer))
+                buffer.clear()
+        fh.write("".join(buffer))
+    return events
@@ -0,0 +1,210 @@
+import json
+import os
+import re
+import queue
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+class ImportResult:
+    def __init__(self):
+        self.sessions: List[Dict] = []
+        self.skipped = 0
+        self.errors: List[Tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+
+class _ProgressFile:
+    """Wraps a text file and counts the characters handed out so far."""
+
+    def __init__(self, fh):
+        self._fh = fh
+        self.consumed = 0
+
+    def read(self, size: int = -1) -> str:
+        data = self._fh.read(size)
+        self.consumed += len(data)
+        return data
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = next(self._fh)
+        self.consumed += len(line)
+        return line
+
+
+# No single session comes close to this; a longer entry means the file is malformed
+MAX_ENTRY_CHARS = 1 << 20
+
+# A schedule saved by storage wraps the list: {"version": N, "sessions": [...]}
+_SAVED_SCHEDULE_PREFIX = re.compile(r'\{\s*"version"\s*:\s*\d+\s*,\s*"sessions"\s*:\s*')
+
+
+def iter_json_array(fh, chunk_size: int = 1 << 16) -> Iterator[object]:
+    """Yield the items of a top-level JSON array without loading the whole file.
+
+    The file is read ``chunk_size`` characters at a time and each element is
+    decoded with ``JSONDecoder.raw_decode`` as soon as it is complete. A
+    schedule file saved by ``storage`` is accepted too, and its session
+    list is read the same way.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def more() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not more():
+                return ""
+
+    wrapped = False
+    if next_char() == "{":
+        while len(buffer) - pos < 256 and more():
+            pass
+        match = _SAVED_SCHEDULE_PREFIX.match(buffer, pos)
+        if match:
+            pos = match.end()
+            wrapped = True
+
+    if next_char() != "[":
+        raise ValueError("This file does not contain a valid session list.")
+    pos += 1
+
+    def finish() -> None:
+        nonlocal pos
+        if wrapped:
+            pos += 1
+            if next_char() != "}":
+                raise ValueError("This file does not contain a valid session list.")
+
+    if next_char() == "]":
+        finish()
+        return
+
+    while True:
+        if not next_char():
+            raise ValueError("The session list ends unexpectedly.")
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as exc:
+                # Only an error at the very end of the buffer, or an unclosed string, can be
+                # caused by cutting an entry in two; anything else is reported straight away
+                truncated = exc.pos >= len(buffer) - 16 or exc.msg.startswith("Unterminated string")
+                if truncated and len(buffer) - pos < MAX_ENTRY_CHARS and more():
+                    continue
+                raise ValueError(f"Invalid JSON in session list: {exc}") from exc
+            # A value that touches the end of the buffer may be a cut-off number
+            if end == len(buffer) and more():
+                continue
+            break
+        pos = end
+        yield item
+
+        separator = next_char()
+        if separator == ",":
+            pos += 1
+        elif separator == "]":
+            finish()
+            return
+        else:
+            raise ValueError("Sessions in the list must be separated by commas.")
+
+
+class ImportJob:
+    """Parses and validates an import file on a worker thread.
+
+    The worker posts ``("progress", (fraction, accepted, skipped))`` after
+    each batch, then exactly one of ``("done", result)``,
+    ``("cancelled", None)`` or ``("error", exc)`` to ``messages``. The Tk thread polls with ``poll`` from ``root.after`` and
+    commits the finished result itself, so nothing touches the schedule
+    until the whole file has been read.
+    """
+
+    def __init__(self, path, normalize: Callable[[Dict], Dict],
+                 records: Callable = iter_json_array, batch_size: int = 500):
+        self.path = path
+        self.normalize = normalize
+        self.records = records
+        self.batch_size = batch_size
+        self.messages: "queue.Queue[Tuple[str, object]]" = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ImportJob":
+        self._thread = threading.Thread(target=self._run, name="session-import", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def poll(self) -> List[Tuple[str, object]]:
+        drained = []
+        while True:
+            try:
+                drained.append(self.messages.get_nowait())
+            except queue.Empty:
+                return drained
+
+    def _run(self) -> None:
+        try:
+            self.messages.put(("done", self.run()))
+        except ImportCancelled:
+            self.messages.put(("cancelled", None))
+        except Exception as exc:
+            self.messages.put(("error", exc))
+
+    def run(self) -> ImportResult:
+        """Do the whole import on the calling thread and return the result."""
+        result = ImportResult()
+        total_size = max(os.path.getsize(self.path), 1)
+
+        with open(self.path, "r", encoding="utf-8", newline="") as raw:
+            fh = _ProgressFile(raw)
+            for number, record in enumerate(self.records(fh), start=1):
+                try:
+                    result.sessions.append(self.normalize(record))
+                except Exception as exc:
+                    result.skipped += 1
+                    result.errors.append((number, str(exc)))
+
+                if number % self.batch_size == 0:
+                    if self._cancel.is_set():
+                        raise ImportCancelled()
+                    fraction = min(fh.consumed / total_size, 1.0)
+                    self.messages.put(("progress", (fraction, len(result.sessions), result.skipped)))
+
+        if self._cancel.is_set():
+            raise ImportCancelled()
+        return result
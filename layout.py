@@ -0,0 +1,36 @@
+from typing import Container, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from .time_utils import DAYS
+    from .validation import session_minutes
+except Exception:
+    from time_utils import DAYS
+    from validation import session_minutes
+
+
+def layout_week(sessions: Iterable[Dict], time_slots: Sequence[Tuple[int, int]],
+                visible_ids: Optional[Container[str]] = None) -> List[Tuple[Dict, int, List[int]]]:
+    """Work out which calendar cells each session covers.
+
+    Returns ``(session, day_index, slot_indexes)`` for every session that
+    is in ``visible_ids`` (every session if None) and overlaps at least one time slot. This is
+    pure data, so it can be prepared away from the Tk thread.
+    """
+    placed = []
+    for session in sessions:
+        if visible_ids is not None and session.get("id") not in visible_ids:
+            continue
+        try:
+            day_index = DAYS.index(str(session["day"]))
+            start_minutes, end_minutes = session_minutes(session)
+        except (KeyError, ValueError, TypeError):
+            continue
+
+        slot_indexes = [
+            slot_index
+            for slot_index, (slot_start, slot_end) in enumerate(time_slots)
+            if start_minutes < slot_end and end_minutes > slot_start
+        ]
+        if slot_indexes:
+            placed.append((session, day_index, slot_indexes))
+    return placed
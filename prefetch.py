@@ -0,0 +1,100 @@
+import queue
+import threading
+import time
+from datetime import date
+from typing import Callable, Container, Dict, Hashable, List, Optional, Sequence, Tuple
+
+try:
+    from .layout import layout_week
+    from .recurrence import expand_week
+except Exception:
+    from layout import layout_week
+    from recurrence import expand_week
+
+
+def prepare_week(sessions: Sequence[Dict], monday: date, time_slots,
+                 visible_ids: Optional[Container[str]] = None):
+    """Expand one week and lay it out; the whole data side of a render."""
+    return layout_week(expand_week(sessions, monday), time_slots, visible_ids)
+
+
+class WeekPrefetcher:
+    """Prepares calendar layouts for neighbouring weeks on a worker thread.
+
+    The Tk thread hands out jobs with ``request`` and collects finished
+    layouts with ``take``. Both directions go through ``queue.Queue`` so
+    no state is shared between threads. Keys should include the store
+    version, which makes layouts from before a change simply never match.
+    """
+
+    def __init__(self, prepare: Callable = prepare_week, max_ready: int = 8):
+        self.prepare = prepare
+        self.max_ready = max_ready
+        self.hits = 0
+        self.misses = 0
+        self._jobs: "queue.Queue[Optional[Tuple]]" = queue.Queue()
+        self._results: "queue.Queue[Tuple[Hashable, List]]" = queue.Queue()
+        self._ready: Dict[Hashable, List] = {}
+        self._pending = set()
+        self._worker = threading.Thread(target=self._run, name="week-prefetch", daemon=True)
+        self._worker.start()
+
+    def request(self, key: Hashable, *args) -> None:
+        """Queue ``prepare(*args)`` for ``key`` unless it is ready or pending."""
+        self._collect()
+        if key in self._ready or key in self._pending:
+            return
+        self._pending.add(key)
+        self._jobs.put((key, args))
+
+    def take(self, key: Hashable, timeout: float = 0.0) -> Optional[List]:
+        """Return and forget the prepared layout for ``key``, or None on a miss.
+
+        A positive ``timeout`` waits that long for a job that is still pending.
+        """
+        self._collect()
+        deadline = time.monotonic() + timeout
+        while key in self._pending and key not in self._ready:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                self._store_result(*self._results.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        layout = self._ready.pop(key, None)
+        if layout is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return layout
+
+    def stop(self) -> None:
+        self._jobs.put(None)
+
+    def _collect(self) -> None:
+        while True:
+            try:
+                self._store_result(*self._results.get_nowait())
+            except queue.Empty:
+                break
+
+    def _store_result(self, key: Hashable, layout: Optional[List]) -> None:
+        self._pending.discard(key)
+        if layout is not None:
+            self._ready[key] = layout
+        while len(self._ready) > self.max_ready:
+            self._ready.pop(next(iter(self._ready)))
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            key, args = job
+            try:
+                layout = self.prepare(*args)
+            except Exception:
+                layout = None
+            self._results.put((key, layout))
@@ -0,0 +1,245 @@
+from collections import OrderedDict
+from datetime import date, timedelta
+from math import lcm
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    from .time_utils import DAYS
+except Exception:
+    from time_utils import DAYS
+
+
+# A session's optional "repeat" rule looks like:
+#   {"start": "2026-09-07", "until": "2026-12-18", "interval": 2, "except": ["2026-10-26"]}
+# "start" and "until" bound the dates the session occurs on (inclusive),
+# "interval" is the number of weeks between occurrences counted from the
+# week of "start", and "except" lists skipped dates. Sessions without a
+# rule are treated as plain weekly sessions that occur in every week.
+
+
+def parse_date(value: str) -> date:
+    try:
+        return date.fromisoformat(str(value).strip())
+    except ValueError as exc:
+        raise ValueError("Dates must be in YYYY-MM-DD format.") from exc
+
+
+def week_start(day: Optional[date] = None, offset: int = 0) -> date:
+    """Return the Monday of the week containing ``day`` shifted by ``offset`` weeks."""
+    day = day or date.today()
+    return day - timedelta(days=day.weekday()) + timedelta(weeks=offset)
+
+
+def session_date(session: Dict, monday: date) -> date:
+    """Return the date a session falls on within the week starting at ``monday``."""
+    return monday + timedelta(days=DAYS.index(session["day"]))
+
+
+def normalize_rule(rule) -> Optional[Dict]:
+    """Validate a repeat rule, returning a clean copy or None for 'every week'."""
+    if rule in (None, {}):
+        return None
+    if not isinstance(rule, dict):
+        raise ValueError("Repeat rule must be an object.")
+
+    start = parse_date(rule.get("start", ""))
+    until = rule.get("until")
+    until = parse_date(until) if until else None
+    if until is not None and until < start:
+        raise ValueError("Repeat end date must not be before its start date.")
+
+    try:
+        interval = int(rule.get("interval", 1))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Repeat interval must be a whole number of weeks.") from exc
+    if interval < 1:
+        raise ValueError("Repeat interval must be at least one week.")
+
+    exceptions = rule.get("except", [])
+    if not isinstance(exceptions, list):
+        raise ValueError("Repeat exceptions must be a list of dates.")
+
+    normalized = {"start": start.isoformat(), "interval": interval}
+    if until is not None:
+        normalized["until"] = until.isoformat()
+    skipped = sorted({parse_date(value).isoformat() for value in exceptions})
+    if skipped:
+        normalized["except"] = skipped
+    return normalized
+
+
+def move_rule(rule: Optional[Dict], old_day: str, new_day: str) -> Optional[Dict]:
+    """Return ``rule`` for a session moved from ``old_day`` to ``new_day``, occurring in the same weeks.
+
+    The rule's dates are only meaningful on the session's weekday, so they
+    are moved along with it; otherwise a one-off moved to another day would
+    match no date at all.
+    """
+    if not rule or old_day == new_day:
+        return rule
+    old_index, new_index = DAYS.index(old_day), DAYS.index(new_day)
+    interval = rule.get("interval", 1)
+
+    start = parse_date(rule["start"])
+    first_week = week_start(start)
+    if start.weekday() > old_index:
+        # The first week's occurrence was already before the start, so the next one is the first
+        first_week += timedelta(weeks=interval)
+    moved = dict(rule, start=(first_week + timedelta(days=new_index)).isoformat())
+
+    if rule.get("until"):
+        until = parse_date(rule["until"])
+        last_week = week_start(until)
+        if until.weekday() < old_index:
+            last_week -= timedelta(weeks=1)
+        moved["until"] = (last_week + timedelta(days=new_index)).isoformat()
+
+    if rule.get("except"):
+        shift = timedelta(days=new_index - old_index)
+        moved["except"] = sorted(
+            (parse_date(value) + shift).isoformat()
+            for value in rule["except"] if parse_date(value).weekday() == old_index
+        )
+        if not moved["except"]:
+            del moved["except"]
+    return moved
+
+
+def one_off_rule(day: date) -> Dict:
+    return {"start": day.isoformat(), "until": day.isoformat(), "interval": 1}
+
+
+def is_one_off(session: Dict) -> bool:
+    rule = session.get("repeat")
+    return bool(rule) and rule.get("start") == rule.get("until")
+
+
+def occurs_on(session: Dict, day: date) -> bool:
+    """Return True if the session has an occurrence on ``day``."""
+    if DAYS.index(session["day"]) != day.weekday():
+        return False
+    rule = session.get("repeat")
+    if not rule:
+        return True
+
+    iso_day = day.isoformat()
+    if iso_day < rule["start"]:
+        return False
+    if rule.get("until") and iso_day > rule["until"]:
+        return False
+    if iso_day in rule.get("except", ()):
+        return False
+
+    weeks_since_start = (week_start(day) - week_start(parse_date(rule["start"]))).days // 7
+    return weeks_since_start % rule.get("interval", 1) == 0
+
+
+def rules_meet(day: str, rule: Optional[Dict], other: Optional[Dict]) -> bool:
+    """Return True if two sessions on ``day`` with these repeat rules ever occur on the same date."""
+    if not rule or not other:
+        # A session without a rule occurs every week
+        return True
+    first = max(parse_date(rule["start"]), parse_date(other["start"]))
+    untils = [parse_date(r["until"]) for r in (rule, other) if r.get("until")]
+    last = min(untils) if untils else None
+    on = first + timedelta(days=(DAYS.index(day) - first.weekday()) % 7)
+
+    # Both rules repeat every ``period`` weeks, and each skipped date can hide
+    # at most one common week, so a longer search cannot find anything new
+    period = lcm(rule.get("interval", 1), other.get("interval", 1))
+    skipped = len(rule.get("except", ())) + len(other.get("except", ()))
+    session, other_session = {"day": day, "repeat": rule}, {"day": day, "repeat": other}
+    for _ in range(period * (skipped + 1)):
+        if last is not None and on > last:
+            return False
+        if occurs_on(session, on) and occurs_on(other_session, on):
+            return True
+        on += timedelta(weeks=1)
+    return False
+
+
+def expand_week(sessions: Iterable[Dict], monday: date) -> Iterator[Dict]:
+    """Lazily yield the sessions that occur in the week starting at ``monday``."""
+    for session in sessions:
+        try:
+            if occurs_on(session, session_date(session, monday)):
+                yield session
+        except (KeyError, ValueError):
+            continue
+
+
+def occupied_dates(sessions: Iterable[Dict], first: date, last: date) -> Set[date]:
+    """Return the dates from ``first`` to ``last`` inclusive that have at least one session.
+
+    A weekday with a plain weekly session is covered without looking at any
+    rules, and each rule is only checked against the dates of its weekday
+    that are not covered yet, so this is much cheaper than expanding every
+    occurrence.
+    """
+    pending: List[Set[date]] = [set() for _ in DAYS]
+    day = first
+    while day <= last:
+        pending[day.weekday()].add(day)
+        day += timedelta(days=1)
+
+    first_iso, last_iso = first.isoformat(), last.isoformat()
+    dates: Set[date] = set()
+    for session in sessions:
+        try:
+            open_days = pending[DAYS.index(session["day"])]
+        except (KeyError, ValueError):
+            continue
+        if not open_days:
+            continue
+        rule = session.get("repeat")
+        if rule:
+            if rule["start"] > last_iso or rule.get("until", last_iso) < first_iso:
+                continue
+            start = parse_date(rule["start"])
+            until = parse_date(rule["until"]) if rule.get("until") else last
+            anchor = week_start(start)
+            interval = rule.get("interval", 1)
+            skipped = rule.get("except", ())
+            found = {
+                day for day in open_days
+                if start <= day <= until and (day - anchor).days // 7 % interval == 0
+                and day.isoformat() not in skipped
+            }
+        else:
+            found = set(open_days)
+        dates |= found
+        open_days -= found
+    return dates
+
+
+class OccurrenceCache:
+    """LRU cache of expanded weeks, discarded whenever the store changes.
+
+    Looking up a week that was already visited costs a dictionary lookup;
+    a new week costs one pass of ``expand_week`` over the store.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+        self._weeks: "OrderedDict[date, Tuple[Dict, ...]]" = OrderedDict()
+
+    def week(self, store, monday: date) -> Tuple[Dict, ...]:
+        if store.version != self._version:
+            self._weeks.clear()
+            self._version = store.version
+
+        cached = self._weeks.get(monday)
+        if cached is not None:
+            self.hits += 1
+            self._weeks.move_to_end(monday)
+            return cached
+
+        self.misses += 1
+        expanded = tuple(expand_week(store, monday))
+        self._weeks[monday] = expanded
+        if len(self._weeks) > self.maxsize:
+            self._weeks.popitem(last=False)
+        return expanded
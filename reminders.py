@@ -0,0 +1,56 @@
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .recurrence import occurs_on
+    from .validation import session_minutes
+except Exception:
+    from recurrence import occurs_on
+    from validation import session_minutes
+
+
+# (earliest, latest minutes before the start, flag, label shown to the user)
+REMINDERS = (
+    (59, 61, 1, "1 hour"),
+    (29, 31, 2, "30 minutes"),
+    (0, 1, 4, "now"),
+)
+
+
+class ReminderTracker:
+    """Works out which reminders are due and remembers the ones already sent.
+
+    Only sessions that actually had a reminder are remembered, as a small
+    int of flags per session id, and the record is dropped when the date
+    changes so weekly sessions are reminded again the next week.
+    """
+
+    def __init__(self):
+        self._date: Optional[date] = None
+        self._sent: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._sent)
+
+    def due(self, sessions: Iterable[Dict], now: datetime) -> List[Tuple[Dict, str]]:
+        """Return (session, label) for every reminder to show at ``now``, marking them sent."""
+        today = now.date()
+        if today != self._date:
+            self._date = today
+            self._sent = {}
+
+        current_day = now.strftime("%A")
+        current_minutes = now.hour * 60 + now.minute
+        due = []
+        for session in sessions:
+            if session.get("day") != current_day or not occurs_on(session, today):
+                continue
+            time_until = session_minutes(session)[0] - current_minutes
+            for earliest, latest, flag, label in REMINDERS:
+                if earliest <= time_until <= latest:
+                    sent = self._sent.get(session["id"], 0)
+                    if not sent & flag:
+                        self._sent[session["id"]] = sent | flag
+                        due.append((session, label))
+                    break
+        return due
@@ -0,0 +1,158 @@
+import random
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+try:
+    from .free_slots import find_windows, minute_mask
+    from .time_utils import DAYS
+except Exception:
+    from free_slots import find_windows, minute_mask
+    from time_utils import DAYS
+
+
+class PlannedBlock(NamedTuple):
+    subject: str
+    day: str
+    start: int
+    end: int
+
+
+class SchedulePlan:
+    def __init__(self, blocks: List[PlannedBlock], shortfall: Dict[str, int], iterations: int):
+        self.blocks = blocks
+        # Minutes of each target that did not fit anywhere
+        self.shortfall = shortfall
+        self.iterations = iterations
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+
+class _Planner:
+    """Working state of one planning run.
+
+    ``occupied`` holds a per-day minute bitmap (see free_slots) that
+    already includes the planned blocks, and ``load`` the minutes each
+    subject has on each day. The cost of a plan is the sum of squared
+    daily loads, which is lowest when every subject is spread evenly
+    over the week.
+    """
+
+    def __init__(self, occupied, load, days, earliest, latest, step, rng):
+        self.occupied = {day: occupied.get(day, 0) for day in days}
+        self.days = list(days)
+        self.earliest = earliest
+        self.latest = latest
+        self.step = step
+        self.rng = rng
+        self.blocks: List[PlannedBlock] = []
+        self.load: Dict[str, Dict[str, int]] = {subject: dict(by_day) for subject, by_day in (load or {}).items()}
+
+    def windows(self, day, length, limit=1):
+        return find_windows(self.occupied[day], length, self.earliest, self.latest, limit, self.step)
+
+    def place(self, block: PlannedBlock) -> None:
+        self.occupied[block.day] |= minute_mask(block.start, block.end)
+        load = self.load.setdefault(block.subject, {})
+        load[block.day] = load.get(block.day, 0) + block.end - block.start
+        self.blocks.append(block)
+
+    def unplace(self, index: int) -> PlannedBlock:
+        block = self.blocks.pop(index)
+        self.occupied[block.day] &= ~minute_mask(block.start, block.end)
+        self.load[block.subject][block.day] -= block.end - block.start
+        return block
+
+    def place_greedily(self, subject: str, length: int, min_block: int) -> int:
+        """Put one block of ``subject`` on its least loaded day that has room.
+
+        Tries ``length`` first and then shorter blocks down to
+        ``min_block``. Returns the minutes placed, 0 if nothing fits.
+        """
+        load = self.load.get(subject, {})
+        days = sorted(self.days, key=lambda day: (load.get(day, 0), self.days.index(day)))
+        while length >= min_block:
+            for day in days:
+                found = self.windows(day, length)
+                if found:
+                    start, end = found[0]
+                    self.place(PlannedBlock(subject, day, start, end))
+                    return length
+            length -= self.step
+        return 0
+
+    def try_move(self) -> bool:
+        """Move a random block to another day if that spreads its subject out more."""
+        index = self.rng.randrange(len(self.blocks))
+        block = self.blocks[index]
+        length = block.end - block.start
+        load = self.load[block.subject]
+        day = self.rng.choice(self.days)
+        if day == block.day:
+            return False
+        # Change in the sum of squares from moving ``length`` minutes between days
+        here, there = load.get(block.day, 0), load.get(day, 0)
+        delta = (there + length) ** 2 - there ** 2 - (here ** 2 - (here - length) ** 2)
+        if delta >= 0:
+            return False
+        found = self.windows(day, length, limit=8)
+        if not found:
+            return False
+        start, end = self.rng.choice(found)
+        self.unplace(index)
+        self.place(PlannedBlock(block.subject, day, start, end))
+        return True
+
+
+def _round_up(minutes: int, step: int) -> int:
+    return -(-minutes // step) * step
+
+
+def plan_week(targets: Dict[str, int], occupied: Dict[str, int], earliest: int, latest: int,
+              min_block: int = 30, max_block: int = 90, step: int = 15, days: Sequence[str] = DAYS,
+              load: Optional[Dict[str, Dict[str, int]]] = None, time_budget: float = 0.5,
+              seed: Optional[int] = None, max_iterations: int = 20000) -> SchedulePlan:
+    """Plan study blocks that meet weekly ``targets`` (minutes per subject).
+
+    Blocks only go into minutes that are free in ``occupied`` (per-day
+    bitmaps), between ``earliest`` and ``latest``, and are between
+    ``min_block`` and ``max_block`` minutes long. ``load`` gives the
+    minutes each subject already has on each day. A greedy pass gives the
+    subject with the most time left its next block on its least loaded
+    day. Local search then moves blocks between days to spread each
+    subject more evenly, until ``time_budget`` seconds have passed.
+    """
+    started = time.perf_counter()
+    planner = _Planner(occupied, load, days, earliest, latest, step, random.Random(seed))
+    min_block = max(step, _round_up(min_block, step))
+    max_block = max(min_block, max_block - max_block % step)
+
+    remaining = {subject: _round_up(minutes, step) for subject, minutes in targets.items() if minutes > 0}
+    shortfall: Dict[str, int] = {}
+    while remaining:
+        subject = max(remaining, key=lambda name: (remaining[name], name))
+        length = min(max_block, max(min_block, remaining[subject]))
+        placed = planner.place_greedily(subject, length, min_block)
+        if not placed:
+            shortfall[subject] = remaining.pop(subject)
+            continue
+        remaining[subject] -= placed
+        if remaining[subject] <= 0:
+            del remaining[subject]
+
+    iterations = 0
+    deadline = started + time_budget
+    while planner.blocks and iterations < max_iterations and time.perf_counter() < deadline:
+        planner.try_move()
+        iterations += 1
+        # Moving blocks can join up gaps, so retry anything that did not fit
+        if shortfall and iterations % 200 == 0:
+            for subject in list(shortfall):
+                placed = planner.place_greedily(subject, min(max_block, max(min_block, shortfall[subject])), min_block)
+                if placed:
+                    shortfall[subject] -= placed
+                    if shortfall[subject] <= 0:
+                        del shortfall[subject]
+
+    blocks = sorted(planner.blocks, key=lambda block: (planner.days.index(block.day), block.start))
+    return SchedulePlan(blocks, shortfall, iterations)
@@ -0,0 +1,116 @@
+import heapq
+import re
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .session_store import SessionListener
+except Exception:
+    from session_store import SessionListener
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# How much a word counts towards a match depending on where it appears
+FIELD_WEIGHTS = {"subject": 3.0, "notes": 1.0, "tasks": 1.0}
+
+# Matching only the start of a word scores less than matching all of it
+PREFIX_FACTOR = 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(str(text).casefold())
+
+
+def session_terms(session: Dict) -> Dict[str, float]:
+    """Return each word of a session's searchable text with its weight."""
+    texts = {
+        "subject": session.get("subject", ""),
+        "notes": session.get("notes", ""),
+        "tasks": " ".join(task.get("text", "") for task in session.get("tasks", [])),
+    }
+    terms: Dict[str, float] = {}
+    for field, text in texts.items():
+        for token in tokenize(text):
+            terms[token] = terms.get(token, 0.0) + FIELD_WEIGHTS[field]
+    return terms
+
+
+class SearchIndex(SessionListener):
+    """Inverted index over subject, notes and task text.
+
+    ``_postings`` maps each word to the sessions containing it and their
+    weight, and ``_vocabulary`` keeps the words sorted so that a prefix is
+    resolved with two binary searches. Mutations only touch the words of
+    the session that changed.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._vocabulary: List[str] = []
+        self._session_terms: Dict[str, Dict[str, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._session_terms)
+
+    def session_added(self, session: Dict) -> None:
+        session_id = session["id"]
+        terms = session_terms(session)
+        self._session_terms[session_id] = terms
+        for token, weight in terms.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                insort(self._vocabulary, token)
+            posting[session_id] = weight
+
+    def session_removed(self, session: Dict) -> None:
+        session_id = session["id"]
+        for token in self._session_terms.pop(session_id, {}):
+            posting = self._postings[token]
+            posting.pop(session_id, None)
+            if not posting:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def sessions_reset(self, sessions: List[Dict]) -> None:
+        self.__init__()
+        for session in sessions:
+            self.session_added(session)
+
+    def _expand(self, term: str) -> List[str]:
+        start = bisect_left(self._vocabulary, term)
+        end = bisect_left(self._vocabulary, term + "\U0010ffff")
+        return self._vocabulary[start:end]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Return (session id, score) pairs matching every word of ``query``, best first.
+
+        Each query word matches whole words and word prefixes, so "alg"
+        finds "algebra".
+        """
+        scores: Optional[Dict[str, float]] = None
+        for term in dict.fromkeys(tokenize(query)):
+            term_scores: Dict[str, float] = {}
+            for token in self._expand(term):
+                factor = 1.0 if token == term else PREFIX_FACTOR
+                for session_id, weight in self._postings[token].items():
+                    term_scores[session_id] = max(term_scores.get(session_id, 0.0), weight * factor)
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    session_id: score + term_scores[session_id]
+                    for session_id, score in scores.items()
+                    if session_id in term_scores
+                }
+            if not scores:
+                return []
+
+        if not scores:
+            return []
+        ranked = scores.items()
+        if limit is not None:
+            return heapq.nlargest(limit, ranked, key=lambda item: item[1])
+        return sorted(ranked, key=lambda item: item[1], reverse=True)
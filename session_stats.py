@@ -0,0 +1,74 @@
+from collections import Counter
+from typing import Dict, List
+
+try:
+    from .session_store import SessionListener
+    from .validation import session_minutes
+except Exception:
+    from session_store import SessionListener
+    from validation import session_minutes
+
+
+def session_duration(session: Dict) -> int:
+    """Return the length of a session in minutes, or 0 if its times are unusable."""
+    try:
+        start, end = session_minutes(session)
+    except ValueError:
+        return 0
+    duration = end - start
+    return duration if duration > 0 else 0
+
+
+class StatsAggregator(SessionListener):
+    """Running totals over a SessionStore, updated in O(1) per mutation."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_minutes = 0
+        self.subject_minutes: Counter = Counter()
+        self.day_minutes: Counter = Counter()
+        self._subject_sessions: Counter = Counter()
+
+    @property
+    def subject_count(self) -> int:
+        return len(self._subject_sessions)
+
+    def session_added(self, session: Dict) -> None:
+        self._apply(session, 1)
+
+    def session_removed(self, session: Dict) -> None:
+        self._apply(session, -1)
+
+    def sessions_reset(self, sessions: List[Dict]) -> None:
+        self.__init__()
+        for session in sessions:
+            self._apply(session, 1)
+
+    def _apply(self, session: Dict, sign: int) -> None:
+        subject = session.get("subject", "Unknown")
+        day = session.get("day", "Unknown")
+        duration = session_duration(session)
+
+        self.count += sign
+        self._bump(self._subject_sessions, subject, sign)
+        if duration:
+            self.total_minutes += sign * duration
+            self._bump(self.subject_minutes, subject, sign * duration)
+            self._bump(self.day_minutes, day, sign * duration)
+
+    @staticmethod
+    def _bump(counter: Counter, key, amount: int) -> None:
+        value = counter[key] + amount
+        if value:
+            counter[key] = value
+        else:
+            del counter[key]
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.count,
+            "subjects": self.subject_count,
+            "total_minutes": self.total_minutes,
+            "subject_minutes": dict(self.subject_minutes),
+            "day_minutes": dict(self.day_minutes),
+        }
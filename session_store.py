@@ -0,0 +1,138 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    from .validation import ensure_session
+except Exception:
+    from validation import ensure_session
+
+
+class SessionListener:
+    """Base class for objects that keep derived data in step with a SessionStore."""
+
+    def session_added(self, session: Dict) -> None:
+        pass
+
+    def session_removed(self, session: Dict) -> None:
+        pass
+
+    def session_updated(self, old: Dict, new: Dict) -> None:
+        self.session_removed(old)
+        self.session_added(new)
+
+    def sessions_reset(self, sessions: List[Dict]) -> None:
+        pass
+
+
+class SessionStore:
+    """Sessions keyed by id, in insertion order, with change notifications.
+
+    Every mutation bumps ``version`` and is forwarded to the subscribed
+    listeners, so indexes and aggregates never need a full rescan.
+    Sessions are replaced rather than edited in place, which keeps any
+    snapshot handed out earlier consistent.
+
+    The store only ever holds validated ``Session`` objects: anything else
+    is normalized on the way in (raising ValueError if it is invalid), so
+    code reading from the store never has to validate again.
+    """
+
+    def __init__(self, sessions: Optional[Iterable[Dict]] = None):
+        self._by_id: Dict[str, Dict] = {}
+        self._listeners: List[SessionListener] = []
+        self.version = 0
+        if sessions is not None:
+            self.reset(sessions)
+
+    def subscribe(self, listener: SessionListener) -> None:
+        self._listeners.append(listener)
+        listener.sessions_reset(self.sessions())
+
+    def unsubscribe(self, listener: SessionListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._by_id.values())
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._by_id
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        return self._by_id.get(session_id)
+
+    def sessions(self) -> List[Dict]:
+        return list(self._by_id.values())
+
+    def add(self, session: Dict) -> None:
+        session = ensure_session(session)
+        session_id = str(session["id"])
+        if session_id in self._by_id:
+            raise ValueError(f"Session {session_id} already exists.")
+        self._by_id[session_id] = session
+        self.version += 1
+        for listener in self._listeners:
+            listener.session_added(session)
+
+    def add_many(self, sessions: Iterable[Dict]) -> List[Dict]:
+        """Add sessions as one change and return them as stored.
+
+        Everything is checked before anything is added, so an invalid or
+        duplicate session leaves the store untouched.
+        """
+        batch: Dict[str, Dict] = {}
+        for session in sessions:
+            session = ensure_session(session)
+            session_id = str(session["id"])
+            if session_id in self._by_id or session_id in batch:
+                raise ValueError(f"Session {session_id} already exists.")
+            batch[session_id] = session
+        if not batch:
+            return []
+        self._by_id.update(batch)
+        self.version += 1
+        for session in batch.values():
+            for listener in self._listeners:
+                listener.session_added(session)
+        return list(batch.values())
+
+    def remove(self, session_id: str) -> Dict:
+        session = self._by_id.pop(session_id)
+        self.version += 1
+        for listener in self._listeners:
+            listener.session_removed(session)
+        return session
+
+    def remove_many(self, session_ids: Iterable[str]) -> List[Dict]:
+        """Remove sessions as one change and return them; unknown ids are ignored."""
+        removed = [self._by_id.pop(session_id) for session_id in session_ids if session_id in self._by_id]
+        if removed:
+            self.version += 1
+        for session in removed:
+            for listener in self._listeners:
+                listener.session_removed(session)
+        return removed
+
+    def update(self, session_id: str, new_session: Dict) -> Dict:
+        old = self._by_id[session_id]
+        new_session = ensure_session(new_session)
+        if str(new_session["id"]) != session_id:
+            raise ValueError("Updated session must keep its id.")
+        self._by_id[session_id] = new_session
+        self.version += 1
+        for listener in self._listeners:
+            listener.session_updated(old, new_session)
+        return old
+
+    def reset(self, sessions: Iterable[Dict]) -> None:
+        by_id = {}
+        for session in sessions:
+            session = ensure_session(session)
+            by_id[str(session["id"])] = session
+        self._by_id = by_id
+        self.version += 1
+        snapshot = self.sessions()
+        for listener in self._listeners:
+            listener.sessions_reset(snapshot)
@@ -0,0 +1,90 @@
+import queue
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+try:
+    from .validation import sanitize_sessions
+except Exception:
+    from validation import sanitize_sessions
+
+
+class PhaseTimer:
+    """Records how long each named phase of startup took."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._started = self._last = clock()
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, name: str) -> float:
+        """End the current phase under ``name`` and return its length in seconds."""
+        now = self._clock()
+        elapsed = now - self._last
+        self.phases.append((name, elapsed))
+        self._last = now
+        return elapsed
+
+    @property
+    def total(self) -> float:
+        return self._last - self._started
+
+    def report(self) -> str:
+        parts = [f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.phases]
+        parts.append(f"total {self.total * 1000:.1f} ms")
+        return ", ".join(parts)
+
+
+class LoadResult:
+    def __init__(self, sessions, errors, valid_format: bool = True, load_error: Optional[Exception] = None):
+        self.sessions = sessions
+        # (position, exception) for every session that failed validation
+        self.errors = errors
+        # False when the file did not hold a list of sessions at all
+        self.valid_format = valid_format
+        self.load_error = load_error
+        self.seconds = 0.0
+
+
+def load_schedule(load: Callable[[], object]) -> LoadResult:
+    """Load and validate the saved schedule; safe to run away from the Tk thread."""
+    started = time.perf_counter()
+    try:
+        loaded = load()
+    except Exception as exc:
+        result = LoadResult([], [], load_error=exc)
+    else:
+        if isinstance(loaded, list):
+            result = LoadResult(*sanitize_sessions(loaded))
+        else:
+            result = LoadResult([], [], valid_format=False)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+class BackgroundLoad:
+    """Runs ``load_schedule`` on a daemon thread; the Tk thread polls for the result."""
+
+    def __init__(self, load: Callable[[], object]):
+        self._load = load
+        self._results: "queue.Queue[LoadResult]" = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._run, name="schedule-load", daemon=True)
+
+    def start(self) -> "BackgroundLoad":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        self._results.put(load_schedule(self._load))
+
+    def poll(self) -> Optional[LoadResult]:
+        try:
+            return self._results.get_nowait()
+        except queue.Empty:
+            return None
+
+    def join(self, timeout: Optional[float] = None) -> Optional[LoadResult]:
+        try:
+            return self._results.get(timeout=timeout)
+        except queue.Empty:
+            return None
@@ -1,7 +1,44 @@
+from contextlib import contextmanager
 from pathlib import Path
 import json
+import os
+import re
+import tempfile
+import time
 import uuid
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+try:
+    from .tracing import traced
+except Exception:
+    from tracing import traced
+
+
+# How long a writer waits for another process to finish saving before giving up
+LOCK_TIMEOUT = 10.0
+
+# The version is written first so it can be read without parsing the whole file
+_VERSION_PATTERN = re.compile(rb'\A\s*\{\s*"version"\s*:\s*(\d+)')
+
+
+class VersionConflictError(Exception):
+    """The file was saved by someone else since ``expected`` was read."""
+
+    def __init__(self, expected: int, actual: int):
+        super().__init__(
+            f"The schedule file was changed by another program (expected version {expected}, found {actual})."
+        )
+        self.expected = expected
+        self.actual = actual
 
 
 def default_path() -> Path:
@@ -10,38 +47,119 @@ def default_path() -> Path:
     return app_data_dir / "sessions.json"
 
 
-def save_sessions(sessions: List[Dict], path: Path | str | None = None) -> None:
-    if path is None:
-        path = default_path()
-    else:
-        path = Path(path)
+def _resolve(path: Path | str | None) -> Path:
+    return default_path() if path is None else Path(path)
 
-    if not isinstance(sessions, list):
-        raise ValueError("Sessions must be a list.")
 
+def _try_lock(fh) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fh) -> None:
+    if fcntl is not None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path: Path | str | None = None, timeout: float = LOCK_TIMEOUT):
+    """Hold an exclusive advisory lock on ``path`` across processes.
+
+    The lock is taken on a ``.lock`` file next to the data file, because
+    the data file itself is replaced on every save. Raises TimeoutError if
+    another process holds the lock for longer than ``timeout`` seconds.
+    """
+    path = _resolve(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    temp_path = path.with_suffix(path.suffix + ".tmp")
+    deadline = time.monotonic() + timeout
+    with open(path.with_name(path.name + ".lock"), "a+b") as fh:
+        while not _try_lock(fh):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"{path} is being saved by another program.")
+            time.sleep(0.01)
+        try:
+            yield
+        finally:
+            _unlock(fh)
 
-    with open(temp_path, "w", encoding="utf-8") as fh:
-        json.dump(sessions, fh, indent=2)
 
-    temp_path.replace(path)
+def file_version(path: Path | str | None = None) -> int:
+    """Return the saved version of the file, 0 if it is missing or in the old list format."""
+    path = _resolve(path)
+    try:
+        with open(path, "rb") as fh:
+            match = _VERSION_PATTERN.match(fh.read(64))
+    except FileNotFoundError:
+        return 0
+    return int(match.group(1)) if match else 0
 
 
-def load_sessions(path: Path | str | None = None) -> List[Dict]:
-    if path is None:
-        path = default_path()
-    else:
-        path = Path(path)
+def _write(sessions: List[Dict], path: Path, version: int) -> None:
+    # A unique temp file per writer, so two processes never write into the same one
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({"version": version, "sessions": sessions}, fh, indent=2)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+
+
+@traced("storage.save_sessions")
+def save_sessions(sessions: List[Dict], path: Path | str | None = None,
+                  expected_version: Optional[int] = None) -> int:
+    """Save the sessions and return the file's new version.
+
+    With ``expected_version`` the save only goes ahead if nobody else has
+    saved since that version was read; otherwise VersionConflictError is
+    raised and the file is left alone.
+    """
+    path = _resolve(path)
+
+    if not isinstance(sessions, list):
+        raise ValueError("Sessions must be a list.")
+
+    with file_lock(path):
+        current = file_version(path)
+        if expected_version is not None and expected_version != current:
+            raise VersionConflictError(expected_version, current)
+        _write(sessions, path, current + 1)
+    return current + 1
+
+
+@traced("storage.load_sessions")
+def read_schedule(path: Path | str | None = None) -> Tuple[List[Dict], int]:
+    """Load the sessions together with the file's version, for a later ``save_sessions``."""
+    path = _resolve(path)
 
     try:
         with open(path, "r", encoding="utf-8") as fh:
             data = json.load(fh)
     except FileNotFoundError:
-        return []
+        return [], 0
     except json.JSONDecodeError as exc:
         raise ValueError(f"Invalid sessions file format: {exc}") from exc
 
+    version = 0
+    if isinstance(data, dict) and isinstance(data.get("version"), int):
+        version = data["version"]
+        data = data.get("sessions")
     if not isinstance(data, list):
         raise ValueError("Sessions file must contain a list of sessions.")
 
@@ -53,4 +171,27 @@ def load_sessions(path: Path | str | None = None) -> List[Dict]:
             session["id"] = str(uuid.uuid4())
         normalized_sessions.append(session)
 
-    return normalized_sessions
+    return normalized_sessions, version
+
+
+def load_sessions(path: Path | str | None = None) -> List[Dict]:
+    return read_schedule(path)[0]
+
+
+def update_sessions(change: Callable[[List[Dict]], Optional[List[Dict]]], path: Path | str | None = None) -> Tuple[List[Dict], int]:
+    """Read, change and save the sessions while holding the lock, so no other writer can slip in between.
+
+    ``change`` gets the saved sessions and returns the sessions to save,
+    or None to leave the file as it is; if it raises, nothing is written.
+    Returns the sessions now saved and the file's version.
+    """
+    path = _resolve(path)
+    with file_lock(path):
+        saved, version = read_schedule(path)
+        sessions = change(saved)
+        if sessions is None:
+            return saved, version
+        if not isinstance(sessions, list):
+            raise ValueError("Sessions must be a list.")
+        _write(sessions, path, version + 1)
+    return sessions, version + 1
@@ -0,0 +1,102 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    from .session_store import SessionListener
+except Exception:
+    from session_store import SessionListener
+
+
+class _Node:
+    __slots__ = ("children", "subjects")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        # Keys of every subject stored at or below this node
+        self.subjects: Set[str] = set()
+
+
+class SubjectTrie(SessionListener):
+    """Prefix trie of the subjects in use, for autocomplete.
+
+    Subjects are matched case-insensitively. Each one remembers how many
+    sessions use it, when it was last used and the colour and spelling it
+    was last saved with. A lookup walks the prefix and ranks only the
+    subjects below it, so the cost depends on the number of distinct
+    subjects rather than the number of sessions.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._info: Dict[str, Dict] = {}
+        self._clock = 0
+
+    def __len__(self) -> int:
+        return len(self._info)
+
+    def _insert(self, key: str) -> None:
+        node = self._root
+        node.subjects.add(key)
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            node.subjects.add(key)
+
+    def _delete(self, key: str) -> None:
+        path = [self._root]
+        for char in key:
+            path.append(path[-1].children[char])
+        for node in path:
+            node.subjects.discard(key)
+        # Drop branches that no longer lead to a subject
+        for parent, char, node in zip(reversed(path[:-1]), reversed(key), reversed(path[1:])):
+            if node.subjects:
+                break
+            del parent.children[char]
+
+    def session_added(self, session: Dict) -> None:
+        name = str(session.get("subject", "")).strip()
+        if not name:
+            return
+        key = name.casefold()
+        info = self._info.get(key)
+        if info is None:
+            info = self._info[key] = {"count": 0}
+            self._insert(key)
+        self._clock += 1
+        info.update(count=info["count"] + 1, name=name, color=session.get("color"), last_used=self._clock)
+
+    def session_removed(self, session: Dict) -> None:
+        key = str(session.get("subject", "")).strip().casefold()
+        info = self._info.get(key)
+        if info is None:
+            return
+        info["count"] -= 1
+        if info["count"] <= 0:
+            del self._info[key]
+            self._delete(key)
+
+    def sessions_reset(self, sessions: List[Dict]) -> None:
+        self.__init__()
+        for session in sessions:
+            self.session_added(session)
+
+    def suggest(self, prefix: str, limit: int = 5) -> List[Tuple[str, Optional[str]]]:
+        """Return up to ``limit`` (subject, colour) pairs starting with ``prefix``.
+
+        The most used subjects come first, and among equally used ones the
+        most recently used.
+        """
+        node = self._root
+        for char in prefix.strip().casefold():
+            node = node.children.get(char)
+            if node is None:
+                return []
+        ranked = sorted(
+            (self._info[key] for key in node.subjects),
+            key=lambda info: (info["count"], info["last_used"]),
+            reverse=True,
+        )
+        return [(info["name"], info["color"]) for info in ranked[:limit]]
+
+    def color_for(self, subject: str) -> Optional[str]:
+        info = self._info.get(subject.strip().casefold())
+        return info["color"] if info else None
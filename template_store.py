@@ -0,0 +1,177 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from .time_utils import DAYS, format_min, parse_time
+    from .validation import is_valid_color
+except Exception:
+    from time_utils import DAYS, format_min, parse_time
+    from validation import is_valid_color
+
+
+# Session fields a template can carry; "interval" is the repeat interval in weeks, 0 for one week only
+TEMPLATE_FIELDS = ("subject", "day", "start", "end", "color", "notes", "interval", "tasks")
+
+# Rewrite the file once it holds this many superseded lines
+COMPACT_AFTER = 64
+
+
+def default_path() -> Path:
+    return Path.home() / ".study_planner" / "session_templates.jsonl"
+
+
+def normalize_template(template: Dict) -> Dict:
+    """Validate a template and return a clean copy; raises ValueError with a user-facing message."""
+    if not isinstance(template, dict):
+        raise ValueError("Template must be an object.")
+    name = str(template.get("name", "")).strip()
+    if not name:
+        raise ValueError("Template name is required.")
+
+    clean = {"name": name}
+    for field in ("subject", "notes"):
+        if str(template.get(field, "")).strip():
+            clean[field] = str(template[field]).strip()
+    if template.get("day") in DAYS:
+        clean["day"] = template["day"]
+    if is_valid_color(template.get("color")):
+        clean["color"] = template["color"].strip()
+
+    start, end = template.get("start"), template.get("end")
+    if start and not end and template.get("duration"):
+        # Older templates stored a length such as "1:30" instead of an end time
+        end = format_min(parse_time(start) + parse_time(template["duration"]))
+    if start and end:
+        start_min, end_min = parse_time(start), parse_time(end)
+        if end_min <= start_min:
+            raise ValueError("End time must be after start time.")
+        clean["start"], clean["end"] = format_min(start_min), format_min(end_min)
+    elif template.get("duration"):
+        clean["duration"] = format_min(parse_time(template["duration"]))
+
+    if template.get("interval") is not None:
+        try:
+            clean["interval"] = max(0, int(template["interval"]))
+        except (TypeError, ValueError) as exc:
+            raise ValueError("Repeat interval must be a whole number of weeks.") from exc
+
+    tasks = [
+        {"text": str(task.get("text", "")).strip(), "completed": False}
+        for task in template.get("tasks", []) or []
+        if isinstance(task, dict) and str(task.get("text", "")).strip()
+    ]
+    if tasks:
+        clean["tasks"] = tasks
+    return clean
+
+
+class TemplateStore:
+    """Session templates in a JSON Lines file under the user's data directory.
+
+    Nothing is read until the templates are first needed; after that
+    they are served from memory. Saving or deleting a template appends a
+    single line (deletions are written as ``{"name": ..., "deleted":
+    true}``), and the file is only rewritten once enough superseded lines
+    pile up. A legacy ``session_templates.json`` list is imported the
+    first time the new file does not exist yet.
+    """
+
+    def __init__(self, path=None, legacy_path=None):
+        self.path = Path(path) if path is not None else default_path()
+        self.legacy_path = Path(legacy_path) if legacy_path is not None else None
+        self._templates: Optional[Dict[str, Dict]] = None
+        self._stale_lines = 0
+        self.skipped = 0
+
+    def templates(self) -> List[Dict]:
+        return list(self._load().values())
+
+    def get(self, name: str) -> Optional[Dict]:
+        return self._load().get(name)
+
+    def save(self, template: Dict) -> Dict:
+        """Add a template, replacing any existing one with the same name."""
+        template = normalize_template(template)
+        templates = self._load()
+        self._append(template)
+        if template["name"] in templates:
+            self._stale_lines += 1
+        templates[template["name"]] = template
+        self._maybe_compact()
+        return template
+
+    def delete(self, name: str) -> None:
+        templates = self._load()
+        if name not in templates:
+            return
+        self._append({"name": name, "deleted": True})
+        del templates[name]
+        self._stale_lines += 2
+        self._maybe_compact()
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._templates is not None:
+            return self._templates
+
+        self._templates = {}
+        if not self.path.exists() and self.legacy_path is not None and self.legacy_path.exists():
+            self._migrate()
+            return self._templates
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        self._apply_line(line)
+        except FileNotFoundError:
+            pass
+        return self._templates
+
+    def _apply_line(self, line: str) -> None:
+        try:
+            record = json.loads(line)
+            if record.get("deleted"):
+                self._templates.pop(record.get("name"), None)
+                self._stale_lines += 2
+                return
+            template = normalize_template(record)
+        except (ValueError, AttributeError):
+            self.skipped += 1
+            self._stale_lines += 1
+            return
+        if template["name"] in self._templates:
+            self._stale_lines += 1
+        self._templates[template["name"]] = template
+
+    def _migrate(self) -> None:
+        with open(self.legacy_path, "r", encoding="utf-8") as fh:
+            loaded = json.load(fh)
+        for record in loaded if isinstance(loaded, list) else []:
+            try:
+                template = normalize_template(record)
+            except ValueError:
+                self.skipped += 1
+                continue
+            self._templates[template["name"]] = template
+        self.compact()
+
+    def _append(self, record: Dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(record) + "\n")
+
+    def _maybe_compact(self) -> None:
+        if self._stale_lines >= COMPACT_AFTER:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the file with one line per current template."""
+        templates = self._load()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as fh:
+            for template in templates.values():
+                fh.write(json.dumps(template) + "\n")
+        temp_path.replace(self.path)
+        self._stale_lines = 0
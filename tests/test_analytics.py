@@ -0,0 +1,51 @@
+from datetime import date
+
+import pytest
+
+from study_planner.analytics import AnalyticsEngine, longest_streak, np
+from study_planner.recurrence import occupied_dates
+
+SESSIONS = [
+    {"subject": "Math", "day": "Monday", "start": "15:30", "end": "17:00"},
+    {"subject": "Physics", "day": "Tuesday", "start": "16:00", "end": "16:45"},
+    {"subject": "Math", "day": "Thursday", "start": "20:00", "end": "21:00"},
+    {"subject": "Math", "day": "Friday", "start": "bad", "end": "21:00"},
+]
+
+BACKENDS = [False] + ([True] if np is not None else [])
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_totals_and_percentiles(use_numpy):
+    engine = AnalyticsEngine.from_sessions(SESSIONS, use_numpy=use_numpy)
+    assert len(engine) == 3
+    assert engine.subject_totals() == {"Math": 150, "Physics": 45}
+    assert engine.day_totals() == {0: 90, 1: 45, 3: 60}
+    assert engine.percentiles((0, 50, 100)) == {0: 45.0, 50: 60.0, 100: 90.0}
+
+
+def test_streak_runs_across_weeks_on_real_dates():
+    weekend = [{"subject": "Math", "day": day, "start": "09:00", "end": "10:00"} for day in ("Saturday", "Sunday")]
+    monday = {"subject": "Art", "day": "Monday", "start": "09:00", "end": "10:00",
+              "repeat": {"start": "2026-09-07", "until": "2026-09-14", "interval": 1}}
+    dates = occupied_dates(weekend + [monday], date(2026, 9, 5), date(2026, 9, 20))
+    # Sat 5, Sun 6, Mon 7, Sat 12, Sun 13, Mon 14, Sat 19, Sun 20 September 2026
+    assert len(dates) == 8
+    assert longest_streak(dates) == 3
+    assert longest_streak(set()) == 0
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_heatmap_splits_sessions_across_hours(use_numpy):
+    heat = AnalyticsEngine.from_sessions(SESSIONS, use_numpy=use_numpy).heatmap()
+    assert len(heat) == 7 and all(len(row) == 24 for row in heat)
+    assert heat[0][15] == 30
+    assert heat[0][16] == 60
+    assert heat[1][16] == 45
+    assert sum(map(sum, heat)) == 195
+
+
+def test_empty_engine():
+    engine = AnalyticsEngine.from_sessions([], use_numpy=False)
+    assert len(engine) == 0
+    assert engine.percentiles((50,)) == {50: 0.0}
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import re
+
+from study_planner.api_server import ApiServer
+from study_planner.benchmarks.api_load import run_load
+from study_planner.storage import load_sessions, save_sessions
+
+MATH = {"id": "m", "subject": "Math", "day": "Monday", "start": "09:00", "end": "10:00"}
+
+
+def call(server, method, target, body=None, etag=None):
+    payload = json.dumps(body).encode() if body is not None else b""
+    status, raw, headers = asyncio.run(server.handle(method, target, payload, etag))
+    return status, json.loads(raw) if raw else None, headers
+
+
+def test_reads_are_cached_until_the_version_changes(tmp_path):
+    path = tmp_path / "sessions.json"
+    save_sessions([MATH], path)
+    server = ApiServer(path)
+
+    status, body, headers = call(server, "GET", "/sessions?day=Monday")
+    assert status == 200 and [s["id"] for s in body["sessions"]] == ["m"]
+    assert call(server, "GET", "/sessions?day=Monday")[0] == 200 and server.cache_hits == 1
+    assert call(server, "GET", "/sessions?day=Monday", etag=headers["ETag"])[0] == 304
+    # A tag is only valid for the URL it came from, and not after a restart
+    assert call(server, "GET", "/sessions?day=Tuesday", etag=headers["ETag"])[0] == 200
+    assert call(server, "GET", "/stats", etag=headers["ETag"])[0] == 200
+    assert call(server, "GET", "/sessions/missing", etag=headers["ETag"])[0] == 404
+    assert call(ApiServer(path), "GET", "/sessions?day=Monday", etag=headers["ETag"])[0] == 200
+
+    assert call(server, "GET", "/free-slots?length=60&days=Monday&earliest=09:00&limit=1")[1] == [
+        {"day": "Monday", "start": "10:00", "end": "11:00"}
+    ]
+    assert call(server, "GET", "/conflicts?day=Monday&start=09:30&end=09:45")[1][0]["id"] == "m"
+    assert call(server, "GET", "/sessions/missing")[0] == 404
+    assert call(server, "PATCH", "/sessions/m")[0] == 405
+    assert call(server, "GET", "/free-slots")[0] == 400
+
+
+def test_writes_are_validated_saved_and_invalidate_the_cache(tmp_path):
+    path = tmp_path / "sessions.json"
+    save_sessions([MATH], path)
+    server = ApiServer(path)
+
+    async def scenario():
+        await server.start("127.0.0.1", 0)
+        try:
+            results = [await server.handle("GET", "/stats")]
+            clash = {"subject": "Art", "day": "Monday", "start": "09:30", "end": "10:30"}
+            results.append(await server.handle("POST", "/sessions", json.dumps(clash).encode()))
+            results.append(await server.handle("POST", "/sessions?force=1", json.dumps(clash).encode()))
+            results.append(await server.handle("POST", "/sessions", b'{"subject": "Art", "day": "Someday"}'))
+            results.append(await server.handle("PUT", "/sessions/m", b'{"end": "11:00"}'))
+            results.append(await server.handle("DELETE", "/sessions/missing"))
+            results.append(await server.handle("GET", "/stats"))
+            return results
+        finally:
+            await server.close()
+
+    results = asyncio.run(scenario())
+    assert [status for status, _, _ in results] == [200, 409, 201, 400, 200, 404, 200]
+    assert json.loads(results[-1][1])["subject_minutes"] == {"Math": 120, "Art": 60}
+    assert sorted(s["subject"] for s in load_sessions(path)) == ["Art", "Math"]
+
+
+def test_reloads_when_another_program_rewrites_the_file(tmp_path):
+    path = tmp_path / "sessions.json"
+    save_sessions([MATH], path)
+    server = ApiServer(path)
+    assert call(server, "GET", "/health")[1]["sessions"] == 1
+    save_sessions([MATH, dict(MATH, id="n", day="Friday")], path)
+    # Make sure the file's modification time differs even on coarse clocks
+    server._mtime = -1
+    assert call(server, "GET", "/health")[1]["sessions"] == 2
+
+
+def test_serves_concurrent_http_clients(tmp_path):
+    path = tmp_path / "sessions.json"
+    save_sessions([MATH], path)
+
+    async def scenario():
+        server = ApiServer(path)
+        port = await server.start("127.0.0.1", 0)
+        try:
+            return await run_load("127.0.0.1", port, clients=4, requests=20, write_ratio=0.1)
+        finally:
+            await server.close()
+
+    result = asyncio.run(scenario())
+    assert result["requests"] == 80 and result["errors"] == 0
+
+
+def test_rejects_foreign_hosts_and_non_json_writes(tmp_path):
+    path = tmp_path / "sessions.json"
+    save_sessions([MATH], path)
+
+    async def send(port, request):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request.encode())
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        writer.close()
+        return status
+
+    async def scenario():
+        server = ApiServer(path)
+        port = await server.start("127.0.0.1", 0)
+        body = json.dumps({"subject": "Art", "day": "Friday", "start": "09:00", "end": "10:00"})
+        try:
+            return [
+                await send(port, f"GET /health HTTP/1.1\r\nHost: localhost:{port}\r\n\r\n"),
+                await send(port, f"GET /health HTTP/1.1\r\nHost: evil.example:{port}\r\n\r\n"),
+                await send(port, "GET /health HTTP/1.1\r\n\r\n"),
+                await send(port, f"POST /sessions HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n"
+                                 f"Content-Type: text/plain\r\nContent-Length: {len(body)}\r\n\r\n{body}"),
+                await send(port, f"POST /sessions HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n"
+                                 f"Content-Type: application/json; charset=utf-8\r\nContent-Length: {len(body)}\r\n\r\n{body}"),
+            ]
+        finally:
+            await server.close()
+
+    assert asyncio.run(scenario()) == [200, 403, 403, 415, 201]
+    assert len(load_sessions(path)) == 2
+
+
+def test_unexpected_errors_are_answered_with_500(tmp_path):
+    path = tmp_path / "sessions.json"
+    save_sessions([MATH], path)
+    server = ApiServer(path)
+
+    def broken(query):
+        raise RuntimeError("boom")
+
+    server._routes.insert(0, ("GET", re.compile(r"/broken"), broken))
+    status, body, _ = call(server, "GET", "/broken")
+    assert status == 500 and body == {"error": "Internal server error."}
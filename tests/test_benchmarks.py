@@ -0,0 +1,27 @@
+from study_planner.benchmarks.generator import generate_sessions
+from study_planner.benchmarks.runner import BENCHMARKS, compare, read_results, run_benchmarks, write_results
+from study_planner.validation import sanitize_sessions
+
+
+def test_generator_is_seeded_and_produces_valid_sessions():
+    sessions = generate_sessions(300, seed=7, subjects=4, overlap=0.5, tasks=1)
+    assert sessions == generate_sessions(300, seed=7, subjects=4, overlap=0.5, tasks=1)
+    assert sessions != generate_sessions(300, seed=8, subjects=4, overlap=0.5, tasks=1)
+    cleaned, errors = sanitize_sessions(sessions)
+    assert errors == [] and len(cleaned) == 300
+    assert len({session["subject"] for session in sessions}) == 4
+    assert len({session["id"] for session in sessions}) == 300
+
+
+def test_results_round_trip_and_compare_against_baseline(tmp_path):
+    document = run_benchmarks([50], seed=1, repeat=1)
+    assert set(document["results"]) == set(BENCHMARKS)
+    assert all(sizes["50"] >= 0 for sizes in document["results"].values())
+
+    path = tmp_path / "baseline.json"
+    write_results(document, path)
+    baseline = read_results(path)
+    assert compare(document, baseline) == []
+
+    baseline["results"]["layout_week"]["50"] = document["results"]["layout_week"]["50"] / 2 - 1e-9
+    assert [(name, size) for name, size, _, _ in compare(document, baseline, tolerance=0.5)] == [("layout_week", "50")]
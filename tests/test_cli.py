@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+
+from study_planner.storage import load_sessions
+
+
+def run_cli(*args, code=None):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    command = ["-c", code] if code else ["-m", "study_planner.cli", *args]
+    return subprocess.run([sys.executable, *command], capture_output=True, text=True, env=env, timeout=60)
+
+
+def test_add_list_conflicts_and_remove(tmp_path):
+    schedule = str(tmp_path / "sessions.json")
+    added = run_cli("--file", schedule, "add", "--subject", "Math", "--day", "Monday", "--day", "Friday",
+                    "--start", "9:00", "--end", "10:00")
+    assert added.returncode == 0, added.stderr
+    math_ids = added.stdout.split()
+    assert len(math_ids) == 2
+
+    clash = run_cli("--file", schedule, "add", "--subject", "Physics", "--day", "Monday", "--start", "09:30", "--end", "10:30")
+    assert clash.returncode == 1 and "overlaps" in clash.stderr
+    assert run_cli("--file", schedule, "add", "--subject", "Physics", "--day", "Monday",
+                   "--start", "09:30", "--end", "10:30", "--force").returncode == 0
+
+    listed = json.loads(run_cli("--file", schedule, "list", "--day", "Monday", "--json").stdout)
+    assert [(s["subject"], s["start"]) for s in listed] == [("Math", "09:00"), ("Physics", "09:30")]
+    assert run_cli("--file", schedule, "conflicts", "--check").returncode == 1
+
+    assert run_cli("--file", schedule, "remove", math_ids[0]).returncode == 0
+    assert run_cli("--file", schedule, "conflicts", "--check").returncode == 0
+    assert run_cli("--file", schedule, "remove", "missing").returncode == 1
+
+
+def test_validate_and_import_the_saved_schedule(tmp_path):
+    schedule, other = str(tmp_path / "sessions.json"), str(tmp_path / "other.json")
+    run_cli("--file", schedule, "add", "--subject", "Math", "--day", "Monday", "--start", "9:00", "--end", "10:00")
+
+    validated = run_cli("--file", schedule, "validate")
+    assert validated.returncode == 0, validated.stdout + validated.stderr
+    assert "1 valid, 0 invalid." in validated.stdout
+    assert run_cli("validate", schedule).returncode == 0
+
+    imported = run_cli("--file", other, "import", schedule)
+    assert imported.returncode == 0, imported.stderr
+    assert [s["subject"] for s in load_sessions(other)] == ["Math"]
+
+
+def test_export_import_and_validate_round_trip(tmp_path):
+    schedule, copy, csv_path = (str(tmp_path / name) for name in ("a.json", "b.json", "out.csv"))
+    run_cli("--file", schedule, "add", "--subject", "Math", "--day", "Tuesday", "--start", "16:00", "--end", "17:00",
+            "--task", "Past paper")
+    assert run_cli("--file", schedule, "export", csv_path).returncode == 0
+    assert run_cli("validate", csv_path).returncode == 0
+
+    imported = run_cli("--file", copy, "import", csv_path)
+    assert "Inserted 1 new session(s)" in imported.stdout
+    original = load_sessions(schedule)
+    assert [(s["id"], s["subject"], s["tasks"]) for s in load_sessions(copy)] == [
+        (original[0]["id"], "Math", [{"text": "Past paper", "completed": False}])
+    ]
+
+    stats = json.loads(run_cli("--file", copy, "stats", "--json").stdout)
+    assert stats["subject_minutes"] == {"Math": 60}
+
+    # A file that repeats an id: the first copy is inserted, the repeat skipped
+    repeated = tmp_path / "repeated.json"
+    repeated.write_text(json.dumps([
+        {"id": "x", "subject": "Art", "day": "Friday", "start": "09:00", "end": "10:00"},
+        {"id": "x", "subject": "Art", "day": "Friday", "start": "11:00", "end": "12:00"},
+    ]))
+    imported = run_cli("--file", copy, "import", str(repeated))
+    assert imported.returncode == 0, imported.stderr
+    assert "Inserted 1 new session(s), updated 0, skipped 1 duplicate(s)" in imported.stdout
+    saved = {s["id"]: s for s in load_sessions(copy)}
+    assert len(saved) == 2 and saved["x"]["start"] == "09:00"
+
+    (tmp_path / "bad.json").write_text('[{"subject": "Art", "day": "Someday", "start": "1:00", "end": "2:00"}]')
+    invalid = run_cli("validate", str(tmp_path / "bad.json"))
+    assert invalid.returncode == 1 and "Session day is invalid." in invalid.stdout
+
+
+def test_cli_never_imports_tkinter(tmp_path):
+    code = (
+        "import sys\n"
+        "from study_planner.cli import main\n"
+        f"main(['--file', {str(tmp_path / 's.json')!r}, 'stats'])\n"
+        "assert 'tkinter' not in sys.modules\n"
+    )
+    result = run_cli(code=code)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,72 @@
+import pytest
+
+from study_planner.conflicts import ConflictIndex
+from study_planner.session_store import SessionStore
+from study_planner.validation import copy_to_days, normalize_session
+
+
+def _session(session_id, day, start, end, subject="Math"):
+    return {"id": session_id, "subject": subject, "day": day, "start": start, "end": end}
+
+
+def test_conflict_index_finds_overlaps_on_each_day():
+    store = SessionStore([
+        _session("long", "Monday", "09:00", "13:00"),
+        _session("short", "Monday", "14:00", "14:30"),
+        _session("tue", "Tuesday", "14:15", "15:00"),
+    ])
+    index = ConflictIndex()
+    store.subscribe(index)
+
+    def ids(days, start, end, exclude_id=None):
+        return [session["id"] for session in index.find(days, start, end, exclude_id)]
+
+    assert ids(["Monday", "Tuesday"], 12 * 60 + 30, 14 * 60 + 20) == ["long", "short", "tue"]
+    assert ids(["Monday"], 13 * 60, 14 * 60) == []
+    assert ids(["Monday"], 10 * 60, 11 * 60, exclude_id="long") == []
+    assert ids(["Sunday"], 0, 24 * 60 - 1) == []
+
+    store.remove("long")
+    store.update("tue", _session("tue", "Monday", "13:30", "14:05"))
+    assert ids(["Monday", "Tuesday"], 12 * 60, 14 * 60 + 20) == ["tue", "short"]
+
+
+def test_add_many_is_all_or_nothing_and_copies_are_independent():
+    store = SessionStore([_session("a", "Monday", "09:00", "10:00")])
+    base = normalize_session(dict(_session("x", "Monday", "16:00", "17:00"), tasks=[{"text": "ch 1"}]))
+    copies = copy_to_days(base, ["Monday", "Wednesday"], lambda day: {"start": "2026-09-07", "interval": 2})
+
+    assert [copy["day"] for copy in copies] == ["Monday", "Wednesday"]
+    assert len({copy["id"] for copy in copies}) == 2
+    assert copies[1].start_min == 16 * 60 and copies[1]["repeat"] == {"start": "2026-09-07", "interval": 2}
+    assert copies[0]["tasks"] is not copies[1]["tasks"]
+
+    version = store.version
+    with pytest.raises(ValueError):
+        store.add_many(copies + [_session("a", "Friday", "09:00", "10:00")])
+    assert len(store) == 1 and store.version == version
+
+    store.add_many(copies)
+    assert len(store) == 3 and store.version == version + 1
+    store.remove_many([copy["id"] for copy in copies] + ["missing"])
+    assert [session["id"] for session in store] == ["a"]
+
+
+def test_sessions_in_different_weeks_do_not_conflict():
+    store = SessionStore([
+        dict(_session("this", "Monday", "09:00", "10:00"), repeat={"start": "2026-09-07", "until": "2026-09-07"}),
+        dict(_session("expired", "Monday", "09:00", "10:00"), repeat={"start": "2026-01-05", "until": "2026-06-29"}),
+        dict(_session("odd", "Tuesday", "09:00", "10:00"), repeat={"start": "2026-09-08", "interval": 2}),
+    ])
+    index = ConflictIndex()
+    store.subscribe(index)
+
+    def ids(day, repeat):
+        return [session["id"] for session in index.find([day], 9 * 60 + 30, 10 * 60 + 30, repeat=repeat)]
+
+    assert ids("Monday", {"start": "2026-09-14", "until": "2026-09-14", "interval": 1}) == []
+    assert ids("Monday", {"start": "2026-09-01", "interval": 1}) == ["this"]
+    assert ids("Monday", None) == ["expired", "this"]
+    assert ids("Tuesday", {"start": "2026-09-15", "interval": 2}) == []
+    assert ids("Tuesday", {"start": "2026-09-15", "interval": 3}) == ["odd"]
+    assert ids("Tuesday", {"start": "2026-09-22", "until": "2026-09-22", "interval": 1, "except": ["2026-09-22"]}) == []
@@ -0,0 +1,61 @@
+from study_planner.csv_io import iter_csv_records, write_csv
+from study_planner.importer import ImportJob
+from study_planner.validation import normalize_session
+
+
+def test_csv_round_trip(tmp_path):
+    session = normalize_session({
+        "subject": "Math, Algebra", "day": "Monday", "start": "15:30", "end": "17:00",
+        "notes": 'Chapter "5"\nexercises',
+        "repeat": {"start": "2026-09-07", "interval": 2, "except": ["2026-09-21"]},
+        "tasks": [{"text": "read", "completed": True}, {"text": "practise", "completed": False}],
+    })
+    path = tmp_path / "sessions.csv"
+    assert write_csv([session], path) == 1
+
+    with open(path, encoding="utf-8", newline="") as fh:
+        loaded = [normalize_session(record) for record in iter_csv_records(fh)]
+    assert loaded == [session]
+
+
+def test_csv_round_trip_keeps_separators_inside_tasks(tmp_path):
+    texts = ["Q1 | Q2 of sheet", "C:\\notes\\", "a \\| b", "plain"]
+    session = normalize_session({
+        "subject": "Math", "day": "Monday", "start": "15:30", "end": "17:00",
+        "tasks": [{"text": text, "completed": index % 2 == 0} for index, text in enumerate(texts)],
+    })
+    path = tmp_path / "sessions.csv"
+    write_csv([session], path)
+
+    with open(path, encoding="utf-8", newline="") as fh:
+        loaded = [normalize_session(record) for record in iter_csv_records(fh)]
+    assert [task["text"] for task in loaded[0]["tasks"]] == texts
+    assert loaded == [session]
+
+
+def test_csv_import_reports_bad_rows(tmp_path):
+    path = tmp_path / "timetable.csv"
+    path.write_text(
+        "subject,day,start,end\n"
+        "Math,monday,9:00,10:00\n"
+        "Physics,Someday,9:00,10:00\n"
+        "Art,Friday,11:00,10:00\n",
+        encoding="utf-8",
+    )
+    result = ImportJob(path, normalize_session, records=iter_csv_records).run()
+    assert [(s["subject"], s["day"], s["start"]) for s in result.sessions] == [("Math", "Monday", "09:00")]
+    assert result.errors == [(2, "Session day is invalid."), (3, "End time must be after start time.")]
+
+
+def test_csv_import_streams_many_rows(tmp_path):
+    path = tmp_path / "big.csv"
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("subject,day,start,end\n")
+        for index in range(20000):
+            fh.write(f"Subject {index % 40},Tuesday,{index % 20:02d}:00,{index % 20:02d}:45\n")
+
+    job = ImportJob(path, normalize_session, records=iter_csv_records, batch_size=5000).start()
+    job.join(60)
+    messages = job.poll()
+    assert [kind for kind, _ in messages] == ["progress"] * 4 + ["done"]
+    assert len(messages[-1][1]) == 20000
@@ -0,0 +1,39 @@
+import logging
+
+from study_planner.error_log import DedupeFilter, ErrorLog
+
+
+def _record(message, exc=ValueError("bad")):
+    return logging.LogRecord("t", logging.ERROR, __file__, 1, message, None, (type(exc), exc, None))
+
+
+def test_dedupe_filter_limits_repeats_per_window():
+    now = [0.0]
+    dedupe = DedupeFilter(window=60.0, burst=2, clock=lambda: now[0])
+
+    passed = [dedupe.filter(_record("Invalid session")) for _ in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert dedupe.filter(_record("Invalid session", KeyError("id")))
+    assert dedupe.filter(_record("Other problem"))
+
+    now[0] = 61.0
+    record = _record("Invalid session")
+    assert dedupe.filter(record)
+    assert record.msg == "Invalid session (3 similar message(s) suppressed)"
+
+
+def test_error_log_writes_in_background_and_rotates(tmp_path):
+    path = tmp_path / "errors.log"
+    log = ErrorLog(path, max_bytes=2000, backup_count=2, burst=1000)
+    for number in range(40):
+        try:
+            raise ValueError(f"problem {number}")
+        except ValueError as exc:
+            log.exception("Save failed", exc)
+    log.close()
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["errors.log", "errors.log.1", "errors.log.2"]
+    assert all(p.stat().st_size <= 2000 for p in tmp_path.iterdir())
+    text = path.read_text(encoding="utf-8")
+    assert "Save failed" in text and "ValueError: problem 39" in text
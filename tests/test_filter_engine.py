@@ -0,0 +1,52 @@
+from study_planner.filter_engine import FilterEngine, SessionFilter
+from study_planner.session_store import SessionStore
+
+
+def _session(session_id, subject, day, color="#3498db", tasks=()):
+    return {
+        "id": session_id,
+        "subject": subject,
+        "day": day,
+        "start": "09:00",
+        "end": "10:00",
+        "color": color,
+        "tasks": [{"text": text, "completed": done} for text, done in tasks],
+    }
+
+
+def _engine():
+    store = SessionStore([
+        _session("a", "Math", "Monday", tasks=[("ch 1", False)]),
+        _session("b", "Math", "Tuesday", color="#E74C3C", tasks=[("ch 2", True)]),
+        _session("c", "Physics", "Monday", color="#e74c3c"),
+    ])
+    engine = FilterEngine()
+    store.subscribe(engine)
+    return store, engine
+
+
+def test_filter_combines_criteria_with_and_or():
+    _, engine = _engine()
+
+    assert engine.matching_ids(SessionFilter.create(subjects=["Math"])) == {"a", "b"}
+    assert engine.matching_ids(SessionFilter.create(subjects=["Math"], days=["Monday"])) == {"a"}
+    assert engine.matching_ids(SessionFilter.create(subjects=["Math"], days=["Monday"], match_all=False)) == {"a", "b", "c"}
+    assert engine.matching_ids(SessionFilter.create(colors=["#E74C3C"])) == {"b", "c"}
+    assert engine.matching_ids(SessionFilter.create(open_tasks=True)) == {"a"}
+    assert engine.matching_ids(SessionFilter.create(subjects=["Biology"])) == set()
+    assert engine.matching_ids(SessionFilter()) == {"a", "b", "c"}
+    assert engine.subjects() == ["Math", "Physics"]
+
+
+def test_filter_results_are_cached_until_the_store_changes():
+    store, engine = _engine()
+    math = SessionFilter.create(subjects=["Math"])
+
+    first = engine.matching_ids(math)
+    assert engine.matching_ids(math) is first
+
+    store.update("c", _session("c", "Math", "Friday"))
+    assert engine.matching_ids(math) == {"a", "b", "c"}
+    store.remove("a")
+    assert engine.matching_ids(math) == {"b", "c"}
+    assert engine.matching_ids(SessionFilter.create(open_tasks=True)) == set()
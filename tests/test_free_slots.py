@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+from study_planner.free_slots import FreeSlotFinder, minute_mask
+from study_planner.session_store import SessionStore
+
+
+def _session(session_id, day, start, end):
+    return {"id": session_id, "subject": "Math", "day": day, "start": start, "end": end}
+
+
+def test_free_windows_skip_busy_time():
+    store = SessionStore([
+        _session("a", "Monday", "16:00", "17:00"),
+        _session("b", "Monday", "16:30", "18:00"),
+    ])
+    finder = FreeSlotFinder()
+    store.subscribe(finder)
+
+    assert finder.occupied("Monday") == minute_mask(16 * 60, 18 * 60)
+    assert finder.free_windows(60, ["Monday"], earliest=15 * 60, latest=20 * 60) == [
+        ("Monday", 15 * 60, 16 * 60),
+        ("Monday", 18 * 60, 19 * 60),
+        ("Monday", 19 * 60, 20 * 60),
+    ]
+    assert finder.free_windows(90, ["Monday", "Tuesday"], earliest=15 * 60 + 10, latest=19 * 60 + 40, limit=2) == [
+        ("Monday", 18 * 60, 19 * 60 + 30),
+        ("Tuesday", 15 * 60 + 15, 16 * 60 + 45),
+    ]
+    assert finder.free_windows(0, ["Monday"]) == []
+
+
+def test_bitmaps_follow_store_changes():
+    store = SessionStore([
+        _session("a", "Monday", "16:00", "17:00"),
+        _session("b", "Monday", "16:30", "18:00"),
+    ])
+    finder = FreeSlotFinder()
+    store.subscribe(finder)
+
+    store.remove("b")
+    assert finder.is_free("Monday", 17 * 60, 18 * 60)
+    assert not finder.is_free("Monday", 16 * 60 + 59, 17 * 60 + 30)
+
+    store.update("a", _session("a", "Friday", "09:00", "10:00"))
+    assert finder.occupied("Monday") == 0
+    assert not finder.is_free("Friday", 9 * 60 + 30, 11 * 60)
+
+
+def test_ruled_sessions_only_block_the_weeks_they_occur_in():
+    monday = date(2026, 9, 7)
+    store = SessionStore([
+        dict(_session("once", "Monday", "09:00", "10:00"), repeat={"start": "2026-09-07", "until": "2026-09-07"}),
+        dict(_session("old", "Monday", "12:00", "13:00"), repeat={"start": "2026-01-05", "until": "2026-06-29"}),
+        dict(_session("fortnightly", "Tuesday", "09:00", "10:00"), repeat={"start": "2026-09-08", "interval": 2}),
+    ])
+    finder = FreeSlotFinder()
+    store.subscribe(finder)
+
+    assert finder.occupied("Monday", monday) == minute_mask(9 * 60, 10 * 60)
+    assert finder.occupied("Monday", monday + timedelta(weeks=1)) == 0
+    assert not finder.is_free("Tuesday", 9 * 60, 10 * 60, monday)
+    assert finder.is_free("Tuesday", 9 * 60, 10 * 60, monday + timedelta(weeks=1))
+    assert finder.free_windows(60, ["Monday"], earliest=9 * 60, latest=11 * 60, monday=monday) == [
+        ("Monday", 10 * 60, 11 * 60)
+    ]
+
+    store.remove("once")
+    assert finder.occupied("Monday", monday) == 0
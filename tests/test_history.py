@@ -0,0 +1,62 @@
+from study_planner.history import (
+    AddSessions, CompositeCommand, History, RemoveSessions, SplitSession, UpdateSession,
+)
+from study_planner.session_store import SessionStore
+
+
+def _session(session_id, start="09:00", end="11:00", **extra):
+    return dict({"id": session_id, "subject": "Math", "day": "Monday", "start": start, "end": end}, **extra)
+
+
+def _state(store):
+    return sorted((s["id"], s["start"], s["end"], s.get("notes")) for s in store)
+
+
+def test_undo_and_redo_every_command_type():
+    store = SessionStore([_session("a")])
+    history = History(store)
+    states = [_state(store)]
+
+    history.execute(AddSessions([_session("b", "12:00", "13:00")]))
+    states.append(_state(store))
+    history.execute(UpdateSession(store.get("a"), dict(store.get("a"), notes="ch 3", start="08:00")))
+    states.append(_state(store))
+    history.execute(SplitSession("a", [_session("a1", "08:00", "09:00"), _session("a2", "09:30", "11:00")]))
+    states.append(_state(store))
+    history.execute(CompositeCommand([RemoveSessions(["b"]), AddSessions([_session("c")])], label="import"))
+    states.append(_state(store))
+
+    assert history.undo_label() == "import"
+    for expected in reversed(states[:-1]):
+        history.undo()
+        assert _state(store) == expected
+    assert history.undo() is None
+
+    for expected in states[1:]:
+        history.redo()
+        assert _state(store) == expected
+    assert not history.can_redo()
+
+
+def test_update_keeps_only_changed_fields_and_history_is_bounded():
+    store = SessionStore([_session("a", notes="old")])
+    history = History(store, limit=2)
+
+    command = UpdateSession(store.get("a"), dict(store.get("a"), notes="new"))
+    assert set(command.changes) == {"notes"}
+
+    for notes in ("one", "two", "three"):
+        history.execute(UpdateSession(store.get("a"), dict(store.get("a"), notes=notes)))
+    history.undo()
+    history.undo()
+    assert not history.can_undo()
+    assert store.get("a")["notes"] == "one"
+
+
+def test_discard_reverts_a_failed_change_without_redo():
+    store = SessionStore([_session("a")])
+    history = History(store)
+    history.execute(RemoveSessions(["a"]))
+    history.discard()
+    assert _state(store) == [("a", "09:00", "11:00", "")]
+    assert not history.can_undo() and not history.can_redo()
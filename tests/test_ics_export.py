@@ -0,0 +1,37 @@
+from datetime import date
+
+from study_planner.ics_export import iter_ics, write_ics
+
+MONDAY = date(2026, 9, 7)
+
+
+def test_weekly_session_gets_rrule_and_exdate():
+    sessions = [{
+        "id": "a", "subject": "Math; Algebra", "day": "Wednesday", "start": "15:30", "end": "17:00",
+        "notes": "Chapter 5\nexercises",
+        "repeat": {"start": "2026-09-10", "until": "2026-12-18", "interval": 2, "except": ["2026-10-07"]},
+    }]
+    lines = [line.rstrip("\r\n") for line in iter_ics(sessions, MONDAY)]
+    assert lines[0] == "BEGIN:VCALENDAR" and lines[-1] == "END:VCALENDAR"
+    assert "DTSTART:20260923T153000" in lines
+    assert "DTEND:20260923T170000" in lines
+    assert "SUMMARY:Math\\; Algebra" in lines
+    assert "DESCRIPTION:Chapter 5\\nexercises" in lines
+    assert "RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=WE;UNTIL=20261218T235900" in lines
+    assert "EXDATE:20261007T153000" in lines
+
+
+def test_one_off_session_has_no_rrule(tmp_path):
+    sessions = [
+        {"id": "a", "subject": "Art", "day": "Monday", "start": "09:00", "end": "10:00",
+         "repeat": {"start": "2026-09-07", "until": "2026-09-07", "interval": 1}},
+        {"id": "b", "subject": "Music " * 30, "day": "Sunday", "start": "09:00", "end": "10:00"},
+    ]
+    path = tmp_path / "schedule.ics"
+    assert write_ics(sessions, path, MONDAY, chunk_lines=2) == 2
+
+    text = path.read_bytes().decode("utf-8")
+    assert text.count("RRULE") == 1
+    assert "DTSTART:20260907T090000" in text
+    assert "DTSTART:20260913T090000" in text
+    assert all(len(line.encode("utf-8")) <= 75 for line in text.split("\r\n"))
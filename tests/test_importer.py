@@ -0,0 +1,80 @@
+import io
+import json
+
+import pytest
+
+from study_planner import storage
+from study_planner.importer import ImportJob, iter_json_array
+
+
+def normalize(record):
+    if not isinstance(record, dict) or not record.get("subject"):
+        raise ValueError("Session subject is required.")
+    return record
+
+
+def test_iter_json_array_handles_tiny_chunks():
+    items = [{"subject": "Math", "n": 12345}, 7, "text, with ] brackets", [1, 2]]
+    text = json.dumps(items, indent=2)
+    assert list(iter_json_array(io.StringIO(text), chunk_size=3)) == items
+    assert list(iter_json_array(io.StringIO(" [ ] "))) == []
+
+
+def test_iter_json_array_rejects_non_lists():
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('{"subject": "Math"}')))
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"subject": "Math"} {"subject": "Art"}]')))
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('{"version": 1, "sessions": [], "extra": 1}')))
+
+
+def test_iter_json_array_reports_errors_without_reading_to_the_end():
+    class Counting(io.StringIO):
+        reads = 0
+
+        def read(self, size=-1):
+            self.reads += 1
+            return super().read(size)
+
+    rest = "," + ",".join(['{"subject": "Math"}'] * 10_000) + "]"
+    for bad in ('[{"subject": "Math" "day": 1}', '[{"subject": "Math}'):
+        fh = Counting(bad + rest)
+        with pytest.raises(ValueError):
+            list(iter_json_array(fh, chunk_size=64))
+        assert fh.reads < 10
+
+
+def test_iter_json_array_reads_a_saved_schedule(tmp_path):
+    path = tmp_path / "sessions.json"
+    storage.save_sessions([{"id": "a", "subject": "Math"}, {"id": "b", "subject": "Art"}], path)
+    with open(path, encoding="utf-8") as fh:
+        assert [s["id"] for s in iter_json_array(fh, chunk_size=5)] == ["a", "b"]
+
+    storage.save_sessions([], path)
+    with open(path, encoding="utf-8") as fh:
+        assert list(iter_json_array(fh)) == []
+
+
+def test_import_job_reports_progress_and_skips_invalid(tmp_path):
+    path = tmp_path / "import.json"
+    path.write_text(json.dumps([{"subject": "Math"}, {"subject": ""}, {"subject": "Art"}]), encoding="utf-8")
+
+    job = ImportJob(path, normalize, batch_size=1).start()
+    job.join(5)
+    messages = job.poll()
+
+    assert [kind for kind, _ in messages] == ["progress"] * 3 + ["done"]
+    result = messages[-1][1]
+    assert [s["subject"] for s in result.sessions] == ["Math", "Art"]
+    assert result.errors == [(2, "Session subject is required.")]
+
+
+def test_import_job_can_be_cancelled(tmp_path):
+    path = tmp_path / "import.json"
+    path.write_text(json.dumps([{"subject": "Math"}] * 10), encoding="utf-8")
+
+    job = ImportJob(path, normalize, batch_size=2)
+    job.cancel()
+    job.start().join(5)
+    assert job.poll() == [("cancelled", None)]
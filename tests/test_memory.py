@@ -0,0 +1,16 @@
+from study_planner.benchmarks.memory import check_budgets, measure, profile
+
+
+def test_measure_reports_retained_memory_and_allocation_sites():
+    report = measure("blocks", lambda: [bytearray(1000) for _ in range(100)], sessions=100)
+    assert report.retained >= 100_000
+    assert report.peak >= report.retained
+    assert 1000 <= report.per_session < 1500
+    assert report.top and report.top[0][0].startswith("test_memory.py:")
+
+
+def test_subsystems_stay_within_their_memory_budgets():
+    reports = profile(1000, top=0)
+    assert check_budgets(reports) == []
+    search_index = next(report for report in reports if report.name == "search_index")
+    assert check_budgets(reports, {"search_index": 1}) == [("search_index", search_index.per_session, 1)]
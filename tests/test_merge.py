@@ -0,0 +1,57 @@
+from study_planner.merge import fingerprint, merge_sessions
+
+
+def make_session(session_id, subject="Math", day="Monday", start="15:30", end="16:30", **extra):
+    return dict(id=session_id, subject=subject, day=day, start=start, end=end, color="#AED6F1", **extra)
+
+
+def test_merge_upserts_by_id_and_skips_duplicates():
+    existing = [make_session("a"), make_session("b", day="Tuesday")]
+    incoming = [
+        make_session("a"),                       # unchanged -> skipped
+        make_session("b", day="Tuesday", end="17:00"),  # changed -> updated
+        make_session("c", subject="math"),       # same content as "a" -> skipped
+        make_session("d", day="Friday"),         # new -> inserted
+        make_session("e", day="Friday"),         # duplicate within the import -> skipped
+    ]
+    result = merge_sessions(existing, incoming)
+    assert [s["id"] for s in result.inserted] == ["d"]
+    assert [s["id"] for s in result.updated] == ["b"]
+    assert result.skipped == 3
+
+
+def test_merge_reports_near_duplicates():
+    result = merge_sessions([make_session("a")], [make_session("b", start="16:00", end="17:00")],
+                            find_near_duplicates=True)
+    assert [s["id"] for s in result.inserted] == ["b"]
+    assert [(new["id"], old["id"]) for new, old in result.near_duplicates] == [("b", "a")]
+
+
+def test_fingerprint_distinguishes_dated_sessions():
+    week_one = make_session("a", repeat={"start": "2026-09-07", "until": "2026-09-07", "interval": 1})
+    week_two = make_session("b", repeat={"start": "2026-09-14", "until": "2026-09-14", "interval": 1})
+    assert fingerprint(week_one) != fingerprint(week_two)
+
+
+def test_merge_repeated_id_within_one_import():
+    incoming = [make_session("x"), make_session("x", start="18:00", end="19:00")]
+    result = merge_sessions([], incoming)
+    assert [(s["id"], s["start"]) for s in result.inserted] == [("x", "15:30")]
+    assert result.updated == [] and result.skipped == 1
+
+    # Two changes to the same stored session: the later one wins
+    result = merge_sessions([make_session("a")], [make_session("a", end="17:00"), make_session("a", end="17:30")])
+    assert [(s["id"], s["end"]) for s in result.updated] == [("a", "17:30")]
+    assert result.inserted == []
+
+
+def test_near_duplicates_are_only_reported_against_existing_sessions():
+    existing = [{"id": "a", "subject": "Math", "day": "Monday", "start": "09:00", "end": "10:00"}]
+    incoming = [
+        {"id": "b", "subject": "Art", "day": "Monday", "start": "09:00", "end": "10:00"},
+        {"id": "c", "subject": "Art", "day": "Monday", "start": "09:30", "end": "10:30"},
+        {"id": "d", "subject": "math", "day": "Monday", "start": "09:45", "end": "11:00"},
+    ]
+    result = merge_sessions(existing, incoming, find_near_duplicates=True)
+    assert [s["id"] for s in result.inserted] == ["b", "c", "d"]
+    assert [(new["id"], old["id"]) for new, old in result.near_duplicates] == [("d", "a")]
@@ -0,0 +1,31 @@
+from datetime import date
+
+from study_planner.layout import layout_week
+from study_planner.prefetch import WeekPrefetcher
+from study_planner.time_utils import generate_time_slots
+
+MONDAY = date(2026, 9, 7)
+SESSIONS = [
+    {"id": "a", "subject": "Math", "day": "Monday", "start": "15:30", "end": "16:45"},
+    {"id": "b", "subject": "Physics", "day": "Sunday", "start": "08:00", "end": "09:00"},
+    {"id": "c", "subject": "Physics", "day": "Friday", "start": "21:30", "end": "22:00"},
+]
+
+
+def test_layout_week_places_sessions_in_overlapping_slots():
+    placed = layout_week(SESSIONS, generate_time_slots())
+    assert [(s["id"], day, slots) for s, day, slots in placed] == [("a", 0, [0, 1, 2]), ("c", 4, [12])]
+    assert [s["id"] for s, _, _ in layout_week(SESSIONS, generate_time_slots(), {"a"})] == ["a"]
+
+
+def test_prefetcher_hands_over_prepared_weeks():
+    prefetcher = WeekPrefetcher()
+    try:
+        key = (1, MONDAY, None)
+        prefetcher.request(key, SESSIONS, MONDAY, generate_time_slots(), None)
+        layout = prefetcher.take(key, timeout=5)
+        assert [s["id"] for s, _, _ in layout] == ["a", "c"]
+        assert prefetcher.take(key) is None
+        assert (prefetcher.hits, prefetcher.misses) == (1, 1)
+    finally:
+        prefetcher.stop()
@@ -0,0 +1,74 @@
+from datetime import date
+
+import pytest
+
+from study_planner.recurrence import OccurrenceCache, expand_week, normalize_rule, occurs_on, week_start
+from study_planner.session_store import SessionStore
+from study_planner.validation import edit_session, normalize_session
+
+MONDAY = date(2026, 9, 7)
+
+
+def test_normalize_rule_validates_and_cleans():
+    assert normalize_rule(None) is None
+    rule = normalize_rule({"start": "2026-09-07", "interval": "2", "except": ["2026-09-21", "2026-09-21"]})
+    assert rule == {"start": "2026-09-07", "interval": 2, "except": ["2026-09-21"]}
+    with pytest.raises(ValueError):
+        normalize_rule({"start": "2026-09-07", "until": "2026-09-01"})
+    with pytest.raises(ValueError):
+        normalize_rule({"start": "2026-09-07", "interval": 0})
+
+
+def test_occurs_on_respects_interval_range_and_exceptions():
+    session = {
+        "day": "Monday",
+        "repeat": {"start": "2026-09-07", "until": "2026-10-31", "interval": 2, "except": ["2026-10-05"]},
+    }
+    assert occurs_on(session, date(2026, 9, 7))
+    assert not occurs_on(session, date(2026, 9, 14))
+    assert occurs_on(session, date(2026, 9, 21))
+    assert not occurs_on(session, date(2026, 10, 5))
+    assert not occurs_on(session, date(2026, 11, 2))
+    assert not occurs_on(session, date(2026, 8, 31))
+    assert not occurs_on(session, date(2026, 9, 8))
+
+
+def test_sessions_without_rule_occur_every_week():
+    assert list(expand_week([{"day": "Friday"}], week_start(MONDAY, offset=40)))
+
+
+def test_occurrence_cache_expands_each_week_once():
+    store = SessionStore([{
+        "id": "a", "subject": "Math", "day": "Tuesday", "start": "15:30", "end": "16:30",
+        "repeat": {"start": "2026-09-08", "interval": 1},
+    }])
+    cache = OccurrenceCache(maxsize=2)
+    assert cache.week(store, MONDAY)[0]["id"] == "a"
+    assert cache.week(store, MONDAY) == cache.week(store, MONDAY)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    assert cache.week(store, week_start(MONDAY, offset=-1)) == ()
+    store.remove("a")
+    assert cache.week(store, MONDAY) == ()
+    assert cache.misses == 3
+
+
+def test_editing_the_day_moves_the_repeat_rule():
+    one_off = normalize_session({"subject": "Math", "day": "Monday", "start": "09:00", "end": "10:00",
+                                 "repeat": {"start": "2026-10-19", "until": "2026-10-19"}})
+    moved = edit_session(one_off, {"day": "Tuesday"})
+    assert moved["repeat"] == {"start": "2026-10-20", "until": "2026-10-20", "interval": 1}
+    assert [list(expand_week([moved], week_start(date(2026, 10, 19), offset))) for offset in (-1, 0, 1)] == [[], [moved], []]
+
+    # Every other Wednesday between Thu 10 Sep and Sun 18 Oct 2026 except 23 Sep: only 7 Oct is left
+    term = normalize_session({"subject": "Art", "day": "Wednesday", "start": "09:00", "end": "10:00",
+                              "repeat": {"start": "2026-09-10", "until": "2026-10-18", "interval": 2,
+                                         "except": ["2026-09-23"]}})
+    moved = edit_session(term, {"day": "Monday"})
+    weeks = [week_start(date(2026, 9, 7), offset) for offset in range(-1, 8)]
+    assert [bool(list(expand_week([term], monday))) for monday in weeks] == \
+           [bool(list(expand_week([moved], monday))) for monday in weeks]
+    assert [monday.isoformat() for monday in weeks if list(expand_week([moved], monday))] == ["2026-10-05"]
+
+    # Changing the rule explicitly leaves it as given
+    assert edit_session(one_off, {"day": "Tuesday", "repeat": None}).get("repeat") is None
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from study_planner.reminders import ReminderTracker
+from study_planner.validation import normalize_session
+
+# 2026-09-07 is a Monday
+SESSION = normalize_session({"id": "a", "subject": "Math", "day": "Monday", "start": "10:00", "end": "11:00"})
+
+
+def test_each_reminder_is_sent_once_per_day():
+    tracker = ReminderTracker()
+    assert tracker.due([SESSION], datetime(2026, 9, 7, 8, 0)) == []
+    assert len(tracker) == 0
+    assert tracker.due([SESSION], datetime(2026, 9, 7, 9, 0)) == [(SESSION, "1 hour")]
+    assert tracker.due([SESSION], datetime(2026, 9, 7, 9, 1)) == []
+    assert tracker.due([SESSION], datetime(2026, 9, 7, 9, 30)) == [(SESSION, "30 minutes")]
+    assert tracker.due([SESSION], datetime(2026, 9, 7, 10, 0)) == [(SESSION, "now")]
+    assert tracker.due([SESSION], datetime(2026, 9, 8, 9, 0)) == []
+    assert len(tracker) == 0
+    assert tracker.due([SESSION], datetime(2026, 9, 14, 9, 0)) == [(SESSION, "1 hour")]
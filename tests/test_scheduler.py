@@ -0,0 +1,44 @@
+import time
+
+from study_planner.free_slots import minute_mask
+from study_planner.scheduler import plan_week
+
+
+def _assert_no_overlaps(blocks, occupied):
+    for day in {block.day for block in blocks}:
+        busy = occupied.get(day, 0)
+        for block in blocks:
+            if block.day == day:
+                mask = minute_mask(block.start, block.end)
+                assert not busy & mask
+                busy |= mask
+
+
+def test_plan_meets_targets_in_free_time_and_spreads_subjects():
+    occupied = {"Monday": minute_mask(16 * 60, 18 * 60)}
+    plan = plan_week({"Math": 240, "Physics": 100}, occupied, 15 * 60 + 30, 22 * 60,
+                     min_block=30, max_block=60, seed=1, time_budget=0.2)
+
+    minutes = {}
+    for block in plan.blocks:
+        assert 30 <= block.end - block.start <= 60
+        assert 15 * 60 + 30 <= block.start and block.end <= 22 * 60
+        minutes[block.subject] = minutes.get(block.subject, 0) + block.end - block.start
+    assert minutes == {"Math": 240, "Physics": 105}
+    assert plan.shortfall == {}
+    assert len({block.day for block in plan.blocks if block.subject == "Math"}) == 4
+    _assert_no_overlaps(plan.blocks, occupied)
+
+
+def test_plan_reports_what_does_not_fit():
+    plan = plan_week({"Math": 600, "Art": 0}, {}, 9 * 60, 10 * 60, days=["Monday"], seed=1, time_budget=0.05)
+    assert [(b.day, b.start, b.end) for b in plan.blocks] == [("Monday", 9 * 60, 10 * 60)]
+    assert plan.shortfall == {"Math": 540}
+
+
+def test_twenty_subject_week_plans_quickly():
+    started = time.perf_counter()
+    plan = plan_week({f"Subject {i}": 180 for i in range(20)}, {}, 8 * 60, 22 * 60, seed=3, time_budget=0.3)
+    assert time.perf_counter() - started < 1.0
+    assert plan.shortfall == {}
+    _assert_no_overlaps(plan.blocks, {})
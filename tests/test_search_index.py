@@ -0,0 +1,46 @@
+from study_planner.search_index import SearchIndex
+from study_planner.session_store import SessionStore
+
+
+def _session(session_id, subject, notes="", tasks=()):
+    return {
+        "id": session_id,
+        "subject": subject,
+        "day": "Monday",
+        "start": "09:00",
+        "end": "10:00",
+        "notes": notes,
+        "tasks": [{"text": text, "completed": False} for text in tasks],
+    }
+
+
+def test_search_matches_prefixes_and_ranks_subject_first():
+    store = SessionStore([
+        _session("a", "Algebra", notes="past papers"),
+        _session("b", "Physics", notes="algebra revision"),
+        _session("c", "Chemistry", tasks=["Read chapter 4"]),
+    ])
+    index = SearchIndex()
+    store.subscribe(index)
+
+    assert [sid for sid, _ in index.search("alg")] == ["a", "b"]
+    assert [sid for sid, _ in index.search("CHAPTER")] == ["c"]
+    assert [sid for sid, _ in index.search("algebra rev")] == ["b"]
+    assert index.search("biology") == []
+    assert index.search("   ") == []
+    assert len(index.search("a", limit=1)) == 1
+
+
+def test_search_index_follows_store_changes():
+    store = SessionStore([_session("a", "Algebra")])
+    index = SearchIndex()
+    store.subscribe(index)
+
+    store.update("a", _session("a", "Geometry", tasks=["proofs"]))
+    assert index.search("algebra") == []
+    assert [sid for sid, _ in index.search("proof")] == ["a"]
+
+    store.remove("a")
+    assert index.search("geometry") == []
+    assert index._vocabulary == []
+    assert len(index) == 0
@@ -0,0 +1,54 @@
+import pytest
+
+from study_planner.session_stats import StatsAggregator
+from study_planner.session_store import SessionStore
+from study_planner.validation import Session
+
+
+def make_session(session_id, subject, day, start, end):
+    return {"id": session_id, "subject": subject, "day": day, "start": start, "end": end, "color": "#AED6F1"}
+
+
+def test_aggregator_tracks_mutations():
+    store = SessionStore([make_session("a", "Math", "Monday", "15:30", "17:00")])
+    stats = StatsAggregator()
+    store.subscribe(stats)
+    assert stats.count == 1
+    assert stats.total_minutes == 90
+
+    store.add(make_session("b", "Physics", "Tuesday", "16:00", "17:00"))
+    assert stats.subject_count == 2
+    assert stats.day_minutes["Tuesday"] == 60
+
+    store.update("b", make_session("b", "Math", "Tuesday", "16:00", "16:30"))
+    assert stats.subject_count == 1
+    assert stats.subject_minutes["Math"] == 120
+
+    store.remove("a")
+    assert stats.snapshot() == {
+        "count": 1,
+        "subjects": 1,
+        "total_minutes": 30,
+        "subject_minutes": {"Math": 30},
+        "day_minutes": {"Tuesday": 30},
+    }
+
+
+def test_aggregator_ignores_unusable_times():
+    stats = StatsAggregator()
+    stats.sessions_reset([make_session("a", "Math", "Monday", "bad", "17:00")])
+    assert stats.count == 1
+    assert stats.total_minutes == 0
+
+
+def test_store_only_holds_validated_sessions():
+    store = SessionStore([make_session("a", "Math", " Monday", "9:00", "10:00")])
+    with pytest.raises(ValueError):
+        SessionStore([make_session("a", "Math", "Monday", "bad", "17:00")])
+    with pytest.raises(ValueError):
+        store.update("a", make_session("a", "", "Monday", "09:00", "10:00"))
+
+    session = store.get("a")
+    assert isinstance(session, Session)
+    assert (session.start_min, session.end_min) == (540, 600)
+    assert store.get("a") is session
@@ -0,0 +1,30 @@
+from study_planner.startup import BackgroundLoad, PhaseTimer, load_schedule
+
+
+def test_background_load_validates_off_the_calling_thread():
+    raw = [
+        {"id": "a", "subject": "Math", "day": "Monday", "start": "09:00", "end": "10:00"},
+        {"id": "b", "subject": "Math", "day": "Someday", "start": "09:00", "end": "10:00"},
+    ]
+    result = BackgroundLoad(lambda: raw).start().join(timeout=5)
+
+    assert [session["id"] for session in result.sessions] == ["a"]
+    assert result.sessions[0].start_min == 9 * 60
+    assert [position for position, _ in result.errors] == [2]
+    assert result.valid_format and result.load_error is None
+
+
+def test_load_schedule_reports_bad_files_instead_of_raising():
+    def broken():
+        raise OSError("disk on fire")
+
+    assert isinstance(load_schedule(broken).load_error, OSError)
+    assert load_schedule(lambda: {"not": "a list"}).valid_format is False
+
+
+def test_phase_timer_reports_each_phase():
+    ticks = iter([0.0, 0.010, 0.025])
+    timer = PhaseTimer(clock=lambda: next(ticks))
+    timer.mark("window")
+    timer.mark("load")
+    assert timer.report() == "window 10.0 ms, load 15.0 ms, total 25.0 ms"
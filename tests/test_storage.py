@@ -1,4 +1,12 @@
-from study_planner.storage import save_sessions, load_sessions
+import os
+import subprocess
+import sys
+
+import pytest
+
+from study_planner.storage import (
+    VersionConflictError, file_version, load_sessions, read_schedule, save_sessions, update_sessions,
+)
 
 
 def test_save_and_load(tmp_path):
@@ -17,3 +25,48 @@ def test_save_and_load(tmp_path):
     s = loaded[0]
     assert s["subject"] == "Math"
     assert "id" in s
+
+
+def test_versions_and_conflicting_writers(tmp_path):
+    f = tmp_path / "sessions.json"
+    # Files from before versioning are a plain list
+    f.write_text('[{"id": "a", "subject": "Math"}]', encoding="utf-8")
+    sessions, version = read_schedule(f)
+    assert [s["id"] for s in sessions] == ["a"] and version == 0
+
+    assert save_sessions(sessions, f, expected_version=0) == 1
+    assert file_version(f) == 1 and load_sessions(f) == sessions
+
+    # A second writer that read version 0 must not overwrite version 1
+    with pytest.raises(VersionConflictError):
+        save_sessions([], f, expected_version=0)
+    assert load_sessions(f) == sessions
+
+    saved, version = update_sessions(lambda current: current + [{"id": "b"}], f)
+    assert [s["id"] for s in saved] == ["a", "b"] and version == 2
+    assert update_sessions(lambda current: None, f)[1] == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["sessions.json", "sessions.json.lock"]
+
+
+WRITER = """
+import sys
+from study_planner.storage import update_sessions
+path, name = sys.argv[1], sys.argv[2]
+for number in range(25):
+    update_sessions(lambda sessions: sessions + [{"id": f"{name}-{number}"}], path)
+"""
+
+
+def test_concurrent_processes_never_lose_writes(tmp_path):
+    f = tmp_path / "sessions.json"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    writers = [
+        subprocess.Popen([sys.executable, "-c", WRITER, str(f), f"w{number}"], env=env)
+        for number in range(4)
+    ]
+    assert [writer.wait(timeout=120) for writer in writers] == [0, 0, 0, 0]
+
+    sessions, version = read_schedule(f)
+    assert len({s["id"] for s in sessions}) == len(sessions) == 100
+    assert version == 100
+    assert not list(tmp_path.glob("*.tmp"))
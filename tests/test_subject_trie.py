@@ -0,0 +1,38 @@
+from study_planner.session_store import SessionStore
+from study_planner.subject_trie import SubjectTrie
+
+
+def _session(session_id, subject, color="#3498db"):
+    return {"id": session_id, "subject": subject, "day": "Monday", "start": "09:00", "end": "10:00", "color": color}
+
+
+def test_suggestions_rank_by_frequency_then_recency():
+    store = SessionStore([
+        _session("a", "Physics"),
+        _session("b", "Philosophy", "#e74c3c"),
+        _session("c", "Philosophy", "#e74c3c"),
+        _session("d", "Photography"),
+    ])
+    trie = SubjectTrie()
+    store.subscribe(trie)
+
+    assert trie.suggest("ph") == [("Philosophy", "#e74c3c"), ("Photography", "#3498db"), ("Physics", "#3498db")]
+    assert trie.suggest("PHY") == [("Physics", "#3498db")]
+    assert trie.suggest("chem") == []
+    assert trie.suggest("", limit=1) == [("Philosophy", "#e74c3c")]
+    assert trie.color_for("philosophy") == "#e74c3c"
+
+
+def test_trie_follows_store_changes():
+    store = SessionStore([_session("a", "Math"), _session("b", "Music")])
+    trie = SubjectTrie()
+    store.subscribe(trie)
+
+    store.update("a", _session("a", "Maths", "#27ae60"))
+    assert trie.suggest("mat") == [("Maths", "#27ae60")]
+
+    store.remove("a")
+    store.remove("b")
+    assert trie.suggest("m") == []
+    assert len(trie) == 0
+    assert trie._root.children == {}
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from study_planner.template_store import TemplateStore, normalize_template
+
+
+def test_templates_load_lazily_and_append_one_line_per_change(tmp_path):
+    path = tmp_path / "data" / "session_templates.jsonl"
+    store = TemplateStore(path)
+    assert not path.exists()
+
+    store.save({"name": "Maths", "subject": "Math", "day": "Monday", "start": "9:00", "end": "10:30",
+                "color": "#e74c3c", "interval": 2, "tasks": [{"text": "past paper", "completed": True}]})
+    store.save({"name": "Maths", "subject": "Math", "start": "16:00", "end": "17:00"})
+    store.save({"name": "Bio", "subject": "Biology"})
+    store.delete("Bio")
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 4
+
+    reloaded = TemplateStore(path)
+    assert reloaded.templates() == [{"name": "Maths", "subject": "Math", "start": "16:00", "end": "17:00"}]
+
+    reloaded.compact()
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_full_session_fields_round_trip(tmp_path):
+    store = TemplateStore(tmp_path / "t.jsonl")
+    saved = store.save({"name": "Lab", "subject": "Chemistry", "day": "Friday", "start": "15:30", "end": "17:00",
+                        "color": "#27ae60", "notes": "goggles", "interval": 0,
+                        "tasks": [{"text": "write up", "completed": True}]})
+    assert TemplateStore(tmp_path / "t.jsonl").get("Lab") == saved
+    assert saved["tasks"] == [{"text": "write up", "completed": False}]
+
+    with pytest.raises(ValueError):
+        normalize_template({"name": "Bad", "start": "10:00", "end": "09:00"})
+    with pytest.raises(ValueError):
+        normalize_template({"subject": "No name"})
+
+
+def test_legacy_package_file_is_migrated(tmp_path):
+    legacy = tmp_path / "session_templates.json"
+    legacy.write_text(json.dumps([
+        {"name": "Revision", "subject": "History", "duration": "1:30", "color": "#AED6F1"},
+        {"subject": "nameless"},
+    ]), encoding="utf-8")
+    path = tmp_path / "home" / "session_templates.jsonl"
+
+    store = TemplateStore(path, legacy_path=legacy)
+    assert store.templates() == [{"name": "Revision", "subject": "History", "color": "#AED6F1", "duration": "01:30"}]
+    assert store.skipped == 1
+    assert path.exists()
+    assert TemplateStore(path, legacy_path=legacy).templates() == store.templates()
@@ -0,0 +1,31 @@
+import json
+import threading
+
+from study_planner.tracing import Tracer
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False)
+    with tracer.span("render"):
+        pass
+    assert len(tracer) == 0
+
+
+def test_spans_export_as_chrome_trace_events(tmp_path):
+    ticks = iter(range(0, 10_000_000, 1_000_000))
+    tracer = Tracer(enabled=True, capacity=2, clock=lambda: next(ticks))
+    with tracer.span("load"):
+        pass
+    worker = threading.Thread(target=lambda: tracer.span("save", count=3).__enter__().__exit__(None, None, None))
+    worker.start()
+    worker.join()
+    with tracer.span("render"):
+        pass
+
+    path = tmp_path / "trace.json"
+    assert tracer.export_chrome(path) == 2
+    events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+    assert [event["name"] for event in events] == ["save", "render"]
+    assert events[0]["args"] == {"count": 3}
+    assert events[1]["ph"] == "X" and events[1]["dur"] == 1000.0 and events[1]["ts"] == 4000.0
+    assert events[0]["tid"] != events[1]["tid"]
@@ -3,12 +3,39 @@
 from typing import List, Tuple
 
 
+DAYS = (
+    "Monday", "Tuesday", "Wednesday", "Thursday",
+    "Friday", "Saturday", "Sunday"
+)
+
+
 def format_min(total_minutes: int) -> str:
     hours = total_minutes // 60
     minutes = total_minutes % 60
     return f"{hours:02d}:{minutes:02d}"
 
 
+def parse_time(time_value: str) -> int:
+    """Convert an HH:MM string into minutes since midnight."""
+    if not isinstance(time_value, str):
+        raise ValueError("Time must be text in HH:MM format.")
+
+    parts = time_value.strip().split(":")
+    if len(parts) != 2:
+        raise ValueError("Time must be in HH:MM format.")
+
+    try:
+        hours = int(parts[0])
+        minutes = int(parts[1])
+    except ValueError as exc:
+        raise ValueError("Time must contain only numbers.") from exc
+
+    if not (0 <= hours <= 23 and 0 <= minutes <= 59):
+        raise ValueError("Time must be between 00:00 and 23:59.")
+
+    return hours * 60 + minutes
+
+
 def generate_time_slots(start_min: int = 15*60 + 30, end_min: int = 22*60, interval_length: int = 30) -> List[Tuple[int, int]]:
     slots = []
     current = start_min
@@ -0,0 +1,111 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+
+ENV_VAR = "STUDY_PLANNER_TRACE"
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = self.tracer._clock()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = self.tracer._clock()
+        self.tracer._spans.append((self.name, self.start, end - self.start, threading.get_ident(), self.args))
+        return False
+
+
+class Tracer:
+    """Records timing spans in a ring buffer and exports them as Chrome trace events.
+
+    While disabled, ``span`` returns a shared no-op context manager, so
+    instrumented code pays for one attribute check. Only the newest
+    ``capacity`` spans are kept.
+    """
+
+    def __init__(self, enabled: bool = False, capacity: int = 10000,
+                 clock: Callable[[], int] = time.perf_counter_ns):
+        self.enabled = enabled
+        self._clock = clock
+        self._spans: deque = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def span(self, name: str, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+    def events(self) -> List[Dict]:
+        """Return the spans as Chrome "complete" events, in microseconds."""
+        pid = os.getpid()
+        return [
+            {
+                "name": name,
+                "cat": "study_planner",
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": thread_id,
+                "args": args,
+            }
+            for name, start, duration, thread_id, args in list(self._spans)
+        ]
+
+    def export_chrome(self, path) -> int:
+        """Write the spans as trace-event JSON for chrome://tracing or Perfetto; return the count."""
+        events = self.events()
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fh)
+        return len(events)
+
+
+# Shared by the whole app; set STUDY_PLANNER_TRACE=1 to trace from startup
+tracer = Tracer(enabled=os.environ.get(ENV_VAR, "") not in ("", "0"))
+
+
+def traced(name: Optional[str] = None):
+    """Decorator that records a span around every call while tracing is enabled."""
+
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
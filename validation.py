@@ -0,0 +1,161 @@
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from .recurrence import move_rule, normalize_rule
+    from .time_utils import DAYS, parse_time
+    from .tracing import traced
+except Exception:
+    from recurrence import move_rule, normalize_rule
+    from time_utils import DAYS, parse_time
+    from tracing import traced
+
+
+DEFAULT_COLOR = "#AED6F1"
+
+
+class Session(dict):
+    """A session dict that has already been through normalize_session.
+
+    Everything held by a SessionStore is a Session, so readers can use the
+    fields as they are. ``start_min`` and ``end_min`` hold the start and
+    end times already converted to minutes.
+    """
+
+    __slots__ = ("start_min", "end_min")
+
+
+def is_valid_color(color_value: str) -> bool:
+    if not isinstance(color_value, str):
+        return False
+    cleaned = color_value.strip()
+    return len(cleaned) == 7 and cleaned.startswith("#") and all(c in "0123456789abcdefABCDEF" for c in cleaned[1:])
+
+
+def normalize_session(session: dict, days: Sequence[str] = DAYS) -> Session:
+    """Validate a session and return a clean copy in the stored format.
+
+    Raises ValueError with a user-facing message when the session cannot
+    be used. Missing ids are generated and bad colours fall back to the
+    default colour.
+    """
+    if not isinstance(session, dict):
+        raise ValueError("Session must be an object.")
+
+    subject = str(session.get("subject", "")).strip()
+    day = str(session.get("day", "")).strip()
+    start = str(session.get("start", "")).strip()
+    end = str(session.get("end", "")).strip()
+
+    if not subject:
+        raise ValueError("Session subject is required.")
+    if day not in days:
+        raise ValueError("Session day is invalid.")
+
+    start_minutes = parse_time(start)
+    end_minutes = parse_time(end)
+    if end_minutes <= start_minutes:
+        raise ValueError("End time must be after start time.")
+
+    color = str(session.get("color", "")).strip()
+    if not is_valid_color(color):
+        color = DEFAULT_COLOR
+
+    normalized = Session({
+        "id": str(session.get("id") or uuid.uuid4()),
+        "subject": subject,
+        "day": day,
+        "start": f"{start_minutes // 60:02d}:{start_minutes % 60:02d}",
+        "end": f"{end_minutes // 60:02d}:{end_minutes % 60:02d}",
+        "color": color,
+        "notes": str(session.get("notes", "")).strip(),
+    })
+    normalized.start_min = start_minutes
+    normalized.end_min = end_minutes
+
+    repeat = normalize_rule(session.get("repeat"))
+    if repeat is not None:
+        normalized["repeat"] = repeat
+
+    tasks = session.get("tasks", [])
+    if isinstance(tasks, list):
+        normalized_tasks = []
+        for task in tasks:
+            if not isinstance(task, dict):
+                continue
+            task_text = str(task.get("text", "")).strip()
+            if not task_text:
+                continue
+            normalized_tasks.append({
+                "text": task_text,
+                "completed": bool(task.get("completed", False)),
+            })
+        if normalized_tasks:
+            normalized["tasks"] = normalized_tasks
+
+    return normalized
+
+
+def copy_to_days(session: Session, days: Iterable[str],
+                 rule_for_day: Optional[Callable[[str], Optional[Dict]]] = None) -> List[Session]:
+    """Copy a validated session onto each of ``days`` with fresh ids.
+
+    The subject, times, colour, notes and tasks were checked when
+    ``session`` was normalized and are reused as they are; only the new
+    day and the repeat rule from ``rule_for_day(day)`` are validated.
+    """
+    copies = []
+    for day in days:
+        if day not in DAYS:
+            raise ValueError("Session day is invalid.")
+        copy = Session(session, id=str(uuid.uuid4()), day=day)
+        copy.start_min = session.start_min
+        copy.end_min = session.end_min
+        if "tasks" in copy:
+            copy["tasks"] = [dict(task) for task in copy["tasks"]]
+        copy.pop("repeat", None)
+        repeat = normalize_rule(rule_for_day(day)) if rule_for_day else session.get("repeat")
+        if repeat is not None:
+            copy["repeat"] = repeat
+        copies.append(copy)
+    return copies
+
+
+def edit_session(old: Dict, changes: Dict, days: Sequence[str] = DAYS) -> Session:
+    """Validate ``old`` with ``changes`` applied, for an edit of a stored session.
+
+    When the day changes and ``changes`` has no repeat rule of its own, the
+    old rule is moved to the new day so the session keeps occurring in the
+    same weeks.
+    """
+    edited = normalize_session({**old, **changes}, days)
+    if edited["day"] != old.get("day") and "repeat" not in changes and edited.get("repeat"):
+        edited = normalize_session(dict(edited, repeat=move_rule(edited["repeat"], old["day"], edited["day"])), days)
+    return edited
+
+
+def ensure_session(session: dict) -> Session:
+    """Return ``session`` unchanged if it is already validated, else normalize it."""
+    if isinstance(session, Session):
+        return session
+    return normalize_session(session)
+
+
+def session_minutes(session: dict) -> Tuple[int, int]:
+    """Return (start, end) in minutes, without re-parsing validated sessions."""
+    if isinstance(session, Session):
+        return session.start_min, session.end_min
+    return parse_time(session.get("start")), parse_time(session.get("end"))
+
+
+@traced("sanitize_sessions")
+def sanitize_sessions(sessions: Iterable) -> Tuple[List[Dict], List[Tuple[int, Exception]]]:
+    """Normalize every session, returning the valid ones and (position, error) pairs for the rest."""
+    cleaned = []
+    errors = []
+    for position, session in enumerate(sessions, start=1):
+        try:
+            cleaned.append(normalize_session(session))
+        except Exception as exc:
+            errors.append((position, exc))
+    return cleaned, errors